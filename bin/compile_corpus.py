@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Python 2.7
+#  Pattern based fact extraction library.
+#    Copyright (C) 2013 University of Tartu
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from pypfe import *
+import sys
+import argparse
+import os
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Program for compiling a C++ text corpus to binary format.')
+    parser.add_argument('corp', type=str, help='Path of the C++ text corpus to read.')
+    parser.add_argument('bincorp', type=str, help='Path of the binary corpus to write.')
+
+    args = parser.parse_args()
+    if not os.path.exists(args.corp):
+        sys.stderr.write('{0} does not exist!\n'.format(args.corp))
+        sys.exit(1)
+
+    sys.stderr.write('Compiling {0} to {1} ...'.format(args.corp, args.bincorp))
+    compileCorpus(args.corp, args.bincorp)
+    sys.stderr.write(' done!\n')
@@ -30,8 +30,16 @@ if __name__ == '__main__':
     parser.add_argument('--threads', type=int,default=1,help='Number of threads to use.')
     parser.add_argument('--limit',type=int,default=2,help='Max number of iterations in Apriori..')
     parser.add_argument('--samplesize',type=int,default=0,help='If given, take random `samplesize` doucuments from corpus.')
+    parser.add_argument('--mincount',type=int,default=0,help='Drop basic rules occurring less than `mincount` times in the corpus.')
+    parser.add_argument('--mindoccount',type=int,default=0,help='Drop basic rules occurring in less than `mindoccount` documents.')
+    parser.add_argument('--cache',action='store_true',help='Cache the basic rule covers and the document index of sampling runs next to the corpus file.')
+    parser.add_argument('--maxmemory',type=int,default=APRIORI_MAX_MEMORY/2**20,help='Megabytes of candidates to keep in memory, the rest is spilled to disk.')
+    parser.add_argument('--quiet',action='store_true',help='Do not print the progress of the miner.')
+    parser.add_argument('--checkpoint',type=str,default='',help='Directory to write the Apriori state to after every level. A restart with the same arguments resumes from the last completed level. Without sampling and pruning the basic rule covers are cached there too.')
 
     args = parser.parse_args()
+    if args.quiet:
+        setMiningVerbose(False)
     if not os.path.exists(args.corp):
         print '{0} does not exist!'.format(args.corp)
         sys.exit(1)
@@ -48,22 +56,87 @@ if __name__ == '__main__':
         print 'number of theads should be at least 1'
         sys.exit(0)
 
-    corpus = readCorpusFromFile(args.corp)
-    sys.stderr.write('Corpus contains {0} documents\n'.format(len(corpus)))
+    if args.maxmemory < 1:
+        print 'maxmemory should be at least 1'
+        sys.exit(0)
+
+    # the sampled documents are stored in the checkpoint directory together
+    # with the sample size, so that a restart mines the same sample
+    samplenames = None
+    if args.checkpoint:
+        if not os.path.isdir(args.checkpoint):
+            os.makedirs(args.checkpoint)
+        samplepath = os.path.join(args.checkpoint, 'sample.txt')
+        if args.samplesize > 0 and os.path.exists(samplepath):
+            with open(samplepath) as f:
+                lines = [line.rstrip('\n') for line in f]
+            if lines and lines[0] == 'samplesize\t{0}'.format(args.samplesize):
+                samplenames = lines[1:]
+            else:
+                sys.stderr.write('Discarding the sample of a different size\n')
 
     if args.samplesize < 0:
         print 'Samplesize must be positive integer'
         sys.exit(0)
-    elif args.samplesize > 0:
-        n = min(len(corpus), args.samplesize)
-        names = sample(corpus.keys(), len(corpus) - n)
-        for name in names:
-            del corpus[name]
+    elif (args.samplesize > 0 and not isBinaryCorpusFile(args.corp) and
+          detectCompression(args.corp) == COMPRESSION_NONE):
+        # read only the sampled documents using the document offset index
+        index = CorpusIndex(args.corp)
+        if args.cache:
+            index.save()
+        sys.stderr.write('Corpus contains {0} documents\n'.format(index.size()))
+        if samplenames is None:
+            names = list(index.names())
+            n = min(len(names), args.samplesize)
+            samplenames = sample(names, n)
+        corpus = corpusSample(index, StringVector(samplenames))
+    else:
+        corpus = readCorpusFromFile(args.corp)
+        sys.stderr.write('Corpus contains {0} documents\n'.format(len(corpus)))
+        if args.samplesize > 0:
+            if samplenames is None:
+                n = min(len(corpus), args.samplesize)
+                samplenames = sample(corpus.keys(), n)
+            keep = set(samplenames)
+            for name in list(corpus.keys()):
+                if name not in keep:
+                    del corpus[name]
 
     sys.stderr.write('Corpus contains {0} documents after sampling\n'.format(len(corpus)))
 
+    if args.checkpoint and args.samplesize > 0:
+        with open(samplepath, 'w') as f:
+            f.write('samplesize\t{0}\n'.format(args.samplesize))
+            for name in samplenames:
+                f.write('{0}\n'.format(name))
+
     fullcover = fullOrderedCoverFromCorpus(corpus)
-    rulecover = basicRuleCovers(corpus, args.radius)
+    pruning = args.mincount > 1 or args.mindoccount > 1
+    # a checkpointed run keeps the basic covers in the checkpoint directory,
+    # so that a restart does not recompute them
+    usecache = ((args.cache or args.checkpoint) and args.samplesize == 0 and
+                not pruning)
+    cachepath = ''
+    if args.checkpoint and not args.cache:
+        cachepath = os.path.join(args.checkpoint,
+                                 'rulecovers.r{0}.rcache'.format(args.radius))
+    if args.type == 'fprate' and not usecache and not pruning:
+        # extract the covers and full conjunctions with a single pass
+        statistics = extractRuleStatistics(corpus, args.radius,
+                                           RULE_COVERS | FULL_CONJUNCTIONS,
+                                           args.threads)
+        rulecover = statistics.covers
+        fullconjunctions = statistics.conjunctions
+    else:
+        if usecache:
+            rulecover = cachedBasicRuleCovers(args.corp, args.radius,
+                                              cachepath, args.threads)
+        else:
+            rulecover = basicRuleCovers(corpus, args.radius, args.threads,
+                                        args.mincount, args.mindoccount)
+        if args.type == 'fprate':
+            fullconjunctions = fullConjunctions(corpus, args.radius,
+                                                args.threads)
     sys.stderr.write('There are {0} basic rules\n'.format(len(rulecover)))
 
     conjunctions = []
@@ -71,7 +144,7 @@ if __name__ == '__main__':
         conjunctions = ConjunctionVector([Conjunction([rule]) for rule in rulecover])
         sys.stderr.write('Have {0} basic conjunctions\n'.format(len(conjunctions)))
     elif args.type =='fprate':
-        conjunctions = ConjunctionVector(fullConjunctions(corpus, args.radius))
+        conjunctions = ConjunctionVector(fullconjunctions)
 
     method = hrApriori
     if args.type == 'fprate':
@@ -80,8 +153,16 @@ if __name__ == '__main__':
     else:
         sys.stderr.write('Mining high recall rules recall=>{0}\n'.format(args.treshold))
 
-    conjunctions = method(conjunctions, rulecover, fullcover,
-                          args.treshold, args.limit, args.threads)
+    maxmemory = args.maxmemory * 2**20
+    if method == hrApriori:
+        conjunctions = method(conjunctions, rulecover, fullcover,
+                              args.treshold, args.limit, args.threads,
+                              APRIORI_CACHE_SIZE, args.checkpoint, None,
+                              maxmemory)
+    else:
+        conjunctions = method(conjunctions, rulecover, fullcover,
+                              args.treshold, args.limit, args.threads,
+                              args.checkpoint, None, maxmemory)
 
     for a in conjunctions:
         for idx, c in enumerate(a):
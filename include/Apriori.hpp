@@ -20,28 +20,294 @@
 #include <PfeLib.hpp>
 #include <Cover.hpp>
 #include <CoverMetrics.hpp>
+#include <MiningMonitor.hpp>
 #include <Rule.hpp>
 
 namespace pfe {
 
+/// Default number of cover elements kept in the conjunction cover cache.
+#define APRIORI_CACHE_SIZE 16777216
+/// Default number of bytes of candidates held in memory.
+#define APRIORI_MAX_MEMORY 1073741824
+
 /// Mine high recall frequent rules.
+/// The covers of frequent conjunctions are cached for the next level, so
+/// that a candidate cover is computed by intersecting a parent cover with a
+/// single basic cover.
+/// @param cacheSize: Maximum number of cover elements kept in the cache.
+/// @param checkpointDir: If given, the state of the miner is written to
+///                       this directory after every level, and a later run
+///                       with the same arguments resumes from the last
+///                       completed level.
+/// @param monitor: If given, receives the statistics of every level.
+/// @param maxMemory: Approximate number of bytes of candidates held in
+///                   memory. The candidates are generated and evaluated in
+///                   batches, and deduplication spills sorted runs to
+///                   temporary files beyond this size.
+std::vector<Conjunction>
+hrApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        long cacheSize=APRIORI_CACHE_SIZE,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hrApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        long cacheSize=APRIORI_CACHE_SIZE,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+/// The cover type of the basic covers and the true cover selects the
+/// representation used for computing the conjunction covers.
 std::vector<Conjunction>
 hrApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        long cacheSize=APRIORI_CACHE_SIZE,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hrApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        long cacheSize=APRIORI_CACHE_SIZE,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<Conjunction>
+hrApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        long cacheSize=APRIORI_CACHE_SIZE,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hrApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        long cacheSize=APRIORI_CACHE_SIZE,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+
+/// Mine high recall frequent rules depth first. The result is the same as
+/// with hrApriori, but only the covers along the current search path are
+/// kept in memory.
+/// @param useDiffsets: In dense branches keep the elements lost compared to
+///                     the parent conjunction instead of the covers.
+std::vector<Conjunction>
+hrEclat(std::vector<Conjunction> const& initial,
         std::map<Rule, OrderedCover> const& basicCovers,
         OrderedCover const& trueCover,
         double treshold,
         long limit=2,
+        long numThreads=2,
+        bool useDiffsets=true)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hrEclat(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        bool useDiffsets=true)
+throw(std::runtime_error);
+std::vector<Conjunction>
+hrEclat(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        bool useDiffsets=true)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hrEclat(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        bool useDiffsets=true)
+throw(std::runtime_error);
+std::vector<Conjunction>
+hrEclat(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        bool useDiffsets=true)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hrEclat(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        bool useDiffsets=true)
+throw(std::runtime_error);
+
+/// Mine the k best conjunctions by metric, which is one of "recall",
+/// "f1score" or "matthews". No treshold is needed: the search is pruned
+/// with an upper bound of the metric over all extensions of a conjunction,
+/// compared to the k-th best value found so far. Ties are broken by
+/// conjunction order. The result is sorted from best to worst.
+std::vector<Conjunction>
+topConjunctions(std::vector<Conjunction> const& initial,
+        std::map<Rule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        long k,
+        std::string const& metric="recall",
+        long limit=2,
+        long numThreads=2)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+topConjunctions(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        long k,
+        std::string const& metric="recall",
+        long limit=2,
+        long numThreads=2)
+throw(std::runtime_error);
+std::vector<Conjunction>
+topConjunctions(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        long k,
+        std::string const& metric="recall",
+        long limit=2,
+        long numThreads=2)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+topConjunctions(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        long k,
+        std::string const& metric="recall",
+        long limit=2,
+        long numThreads=2)
+throw(std::runtime_error);
+std::vector<Conjunction>
+topConjunctions(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        long k,
+        std::string const& metric="recall",
+        long limit=2,
+        long numThreads=2)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+topConjunctions(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        long k,
+        std::string const& metric="recall",
+        long limit=2,
         long numThreads=2)
 throw(std::runtime_error);
 
 /// Mine high precision frequent rules.
+/// @param checkpointDir: See hrApriori.
+/// @param monitor: See hrApriori.
+/// @param maxMemory: See hrApriori.
 std::vector<Conjunction>
 hpApriori(std::vector<Conjunction> const& initial,
         std::map<Rule, OrderedCover> const& basicCovers,
         OrderedCover const& trueCover,
         double treshold,
         long limit=2,
-        long numThreads=2)
+        long numThreads=2,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hpApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<Conjunction>
+hpApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hpApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<Conjunction>
+hpApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
+throw(std::runtime_error);
+std::vector<IdConjunction>
+hpApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit=2,
+        long numThreads=2,
+        std::string const& checkpointDir="",
+        MiningMonitor* monitor=NULL,
+        long maxMemory=APRIORI_MAX_MEMORY)
 throw(std::runtime_error);
 
 } //namespace pfe
@@ -0,0 +1,122 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_APRIORICHECKPOINT_HPP_
+#define _PFE_APRIORICHECKPOINT_HPP_
+
+#include <PfeLib.hpp>
+#include <Rule.hpp>
+
+namespace pfe {
+
+#define APRIORI_CHECKPOINT_MAGIC "PFEAPCKP"
+#define APRIORI_CHECKPOINT_VERSION 2
+#define APRIORI_CHECKPOINT_FILE "apriori.ckpt"
+
+/// Binary Apriori checkpoint format.
+///
+/// The file consists of a header followed by four sections, each aligned
+/// to 8 bytes:
+///     - string offsets: numStrings+1 uint64 offsets into string data.
+///     - string data: concatenated rule attributes, empty for id rules.
+///     - conjunctions: numResult+numFrequent+1 uint64 offsets into rules.
+///       The result conjunctions are followed by the frequent conjunctions
+///       of the level.
+///     - rules: numRules entries.
+/// The header records the fingerprint of the mining arguments the
+/// checkpoint was created with.
+struct AprioriCheckpointHeader {
+    char magic[8];
+    uint32_t version;
+    uint32_t reserved;
+    uint64_t fingerprint;
+    int64_t level;
+    uint64_t numStrings;
+    uint64_t stringDataSize;
+    uint64_t numResult;
+    uint64_t numFrequent;
+    uint64_t numRules;
+};
+
+/// Rule entry of the Apriori checkpoint.
+struct AprioriCheckpointRule {
+    int64_t offset;
+    uint32_t attrId;
+    uint32_t reserved;
+};
+
+/// State of a level-wise miner after a completed level.
+template<class R>
+struct AprioriCheckpoint {
+    /// The last completed level.
+    long level;
+    /// Frequent conjunctions of all completed levels.
+    std::vector<std::vector<R> > result;
+    /// Frequent conjunctions of the last completed level, the candidates
+    /// of the next level are joined from them.
+    std::vector<std::vector<R> > frequent;
+
+    AprioriCheckpoint() : level(0) {}
+};
+
+/// Hash the contents of a cover: the name or id, size and cover elements
+/// of every document.
+uint64_t coverHash(OrderedCover const& cover);
+uint64_t coverHash(RoaringCover const& cover);
+uint64_t coverHash(PostingCover const& cover);
+
+/// Compute the fingerprint of the mining arguments. A checkpoint is only
+/// resumed by a miner with the same fingerprint.
+/// @param miner: Name of the mining method.
+/// @param basicHashes: @see:coverHash of every basic cover.
+/// @param trueHash: @see:coverHash of the true cover.
+uint64_t aprioriFingerprint(std::string const& miner,
+                            std::vector<Conjunction> const& initial,
+                            std::map<Rule, uint64_t> const& basicHashes,
+                            uint64_t const trueHash,
+                            double const treshold);
+uint64_t aprioriFingerprint(std::string const& miner,
+                            std::vector<IdConjunction> const& initial,
+                            std::map<IdRule, uint64_t> const& basicHashes,
+                            uint64_t const trueHash,
+                            double const treshold);
+
+/// Write the checkpoint to directory, replacing the previous one. The
+/// directory is created if it does not exist.
+void writeAprioriCheckpoint(std::string const& directory,
+                            uint64_t const fingerprint,
+                            AprioriCheckpoint<Rule> const& checkpoint)
+throw(std::runtime_error);
+void writeAprioriCheckpoint(std::string const& directory,
+                            uint64_t const fingerprint,
+                            AprioriCheckpoint<IdRule> const& checkpoint)
+throw(std::runtime_error);
+
+/// Read the checkpoint written by @see:writeAprioriCheckpoint. Returns
+/// false if the directory contains no checkpoint or the checkpoint was
+/// created with a different fingerprint.
+bool readAprioriCheckpoint(std::string const& directory,
+                           uint64_t const fingerprint,
+                           AprioriCheckpoint<Rule>& checkpoint)
+throw(std::runtime_error);
+bool readAprioriCheckpoint(std::string const& directory,
+                           uint64_t const fingerprint,
+                           AprioriCheckpoint<IdRule>& checkpoint)
+throw(std::runtime_error);
+
+} // namespace pfe
+
+#endif // _PFE_APRIORICHECKPOINT_HPP_
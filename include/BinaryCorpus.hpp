@@ -0,0 +1,213 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_BINARYCORPUS_HPP_
+#define _PFE_BINARYCORPUS_HPP_
+
+#include <PfeLib.hpp>
+#include <Corpus.hpp>
+#include <MappedFile.hpp>
+#include <Vocabulary.hpp>
+
+#include <boost/noncopyable.hpp>
+
+namespace pfe {
+
+#define BINARY_CORPUS_MAGIC "PFEBCORP"
+#define BINARY_CORPUS_VERSION 1
+
+/// Compiled binary corpus format.
+///
+/// The file consists of a header followed by five sections, each aligned
+/// to 8 bytes:
+///     - string offsets: numStrings+1 uint64 offsets into string data.
+///     - string data: concatenated strings (document names and attributes).
+///     - document directory: numDocs entries sorted by document name.
+///     - token offsets: numTokens+1 uint64 offsets into attribute ids.
+///     - attribute ids: numAttrs uint32 string table identifiers.
+/// Attribute identifiers of the binary corpus are string table indices,
+/// so @see:BinaryCorpus::vocabulary can be used to decode the rules.
+struct BinaryCorpusHeader {
+    char magic[8];
+    uint32_t version;
+    uint32_t reserved;
+    uint64_t numStrings;
+    uint64_t numDocs;
+    uint64_t numTokens;
+    uint64_t numAttrs;
+    uint64_t stringDataSize;
+};
+
+/// Entry of the binary corpus document directory.
+struct BinaryDocEntry {
+    uint32_t nameId;
+    uint32_t reserved;
+    uint64_t firstToken;
+    uint64_t numTokens;
+};
+
+/// Attribute identifiers of a single word of a binary corpus document.
+class AttrRange {
+    AttrId const* _begin;
+    AttrId const* _end;
+public:
+    typedef AttrId value_type;
+    typedef AttrId const* const_iterator;
+    AttrRange(AttrId const* begin, AttrId const* end)
+        : _begin(begin), _end(end) {
+    }
+    const_iterator begin() const {
+        return _begin;
+    }
+    const_iterator end() const {
+        return _end;
+    }
+    size_t size() const {
+        return _end - _begin;
+    }
+};
+
+/// Read-only view of a single binary corpus document. It behaves like an
+/// IdDocument, but does not own or copy any data.
+class BinaryDocument {
+    uint64_t const* _offsets;
+    AttrId const* _attrs;
+    size_t _size;
+public:
+    typedef AttrRange value_type;
+    BinaryDocument() : _offsets(0), _attrs(0), _size(0) { }
+    BinaryDocument(uint64_t const* offsets, AttrId const* attrs, size_t size)
+        : _offsets(offsets), _attrs(attrs), _size(size) {
+    }
+    /// Return the number of words in the document.
+    size_t size() const {
+        return _size;
+    }
+    /// Return the attribute identifiers of idx-th word.
+    AttrRange operator[](size_t const idx) const {
+        return AttrRange(_attrs + _offsets[idx], _attrs + _offsets[idx+1]);
+    }
+    /// Copy the document to an IdDocument.
+    IdDocument idDocument() const;
+};
+
+/// Binary corpus opened with mmap. Opening takes near-constant time as
+/// nothing is parsed or copied, documents are decoded on demand.
+class BinaryCorpus : boost::noncopyable {
+    MappedFile _file;
+    BinaryCorpusHeader const* _header;
+    uint64_t const* _stringOffsets;
+    char const* _stringData;
+    BinaryDocEntry const* _docs;
+    uint64_t const* _tokenOffsets;
+    AttrId const* _attrs;
+public:
+    typedef BinaryDocument mapped_type;
+    /// Iterator over (document name, document) pairs in name order.
+    class const_iterator {
+        BinaryCorpus const* _corpus;
+        size_t _idx;
+        std::pair<std::string, BinaryDocument> _value;
+        void load() {
+            if (_idx < _corpus->size()) {
+                _value.first  = _corpus->name(_idx);
+                _value.second = _corpus->document(_idx);
+            }
+        }
+    public:
+        const_iterator(BinaryCorpus const* corpus, size_t idx)
+            : _corpus(corpus), _idx(idx) {
+            load();
+        }
+        std::pair<std::string, BinaryDocument> const& operator*() const {
+            return _value;
+        }
+        std::pair<std::string, BinaryDocument> const* operator->() const {
+            return &_value;
+        }
+        const_iterator& operator++() {
+            ++_idx;
+            load();
+            return *this;
+        }
+        bool operator==(const_iterator const& other) const {
+            return _idx == other._idx && _corpus == other._corpus;
+        }
+        bool operator!=(const_iterator const& other) const {
+            return !(*this == other);
+        }
+    };
+    /// Open binary corpus file specified by path.
+    BinaryCorpus(std::string const& filename) throw(std::runtime_error);
+    /// Return the number of documents.
+    size_t size() const {
+        return _header->numDocs;
+    }
+    /// Return the number of strings in the string table.
+    size_t numStrings() const {
+        return _header->numStrings;
+    }
+    /// Return the string with given identifier from the string table.
+    std::string string(AttrId const id) const throw(std::range_error);
+    /// Return the name of idx-th document.
+    std::string name(size_t const idx) const throw(std::range_error);
+    /// Return the names of all documents in sorted order.
+    StringVector names() const;
+    /// Return the idx-th document.
+    BinaryDocument document(size_t const idx) const throw(std::range_error);
+    /// Return the document with given name.
+    BinaryDocument document(std::string const& docName) const
+    throw(std::range_error);
+    /// Return a vocabulary, where attribute identifiers match the ones
+    /// used in the binary corpus.
+    Vocabulary vocabulary() const;
+    /// Decode the whole binary corpus to an IdCorpus.
+    IdCorpus idCorpus() const;
+    /// Decode the whole binary corpus to a string based Corpus.
+    Corpus corpus() const;
+    const_iterator begin() const {
+        return const_iterator(this, 0);
+    }
+    const_iterator end() const {
+        return const_iterator(this, size());
+    }
+};
+
+/// Round size up to a multiple of 8 bytes.
+size_t binaryAlign8(size_t const size);
+
+/// Write a section of a binary file and pad it to 8 bytes.
+void writeBinarySection(std::ostream& os, void const* data,
+                        size_t const size);
+
+/// Check if the file specified by filename is a binary corpus.
+bool isBinaryCorpusFile(std::string const& filename);
+
+/// Write a corpus in binary format to file specified by filename.
+/// File can be later opened using @see:BinaryCorpus.
+void writeBinaryCorpus(std::string const& filename, Corpus const& corpus)
+throw(std::runtime_error);
+
+/// Read a text corpus and write it in binary format.
+void compileCorpus(std::string const& textFilename,
+                   std::string const& binaryFilename)
+throw(std::runtime_error);
+
+OrderedCover fullOrderedCoverFromCorpus(BinaryCorpus const& corpus);
+
+} // namespace pfe
+
+#endif // _PFE_BINARYCORPUS_HPP_
@@ -0,0 +1,66 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_COMPRESSION_HPP_
+#define _PFE_COMPRESSION_HPP_
+
+#include <PfeLib.hpp>
+
+#include <boost/iostreams/filtering_stream.hpp>
+#include <boost/version.hpp>
+
+// zstd filter is available since boost 1.67
+#if BOOST_VERSION >= 106700
+#define PFE_HAVE_ZSTD
+#endif
+
+#define COMPRESSION_NONE  "none"
+#define COMPRESSION_GZIP  "gzip"
+#define COMPRESSION_BZIP2 "bzip2"
+#define COMPRESSION_XZ    "xz"
+#define COMPRESSION_ZSTD  "zstd"
+
+namespace pfe {
+
+/// Detect the compression of file specified by path from its first bytes.
+/// Return one of the COMPRESSION_* names, COMPRESSION_NONE for plain files.
+std::string detectCompression(std::string const& filename)
+throw(std::runtime_error);
+
+/// Return the compression implied by the extension of the filename
+/// (.gz, .bz2, .xz or .zst), COMPRESSION_NONE for other extensions.
+std::string compressionFromExtension(std::string const& filename);
+
+/// Open file specified by path for reading, decompressing it if it is
+/// compressed with any of the supported formats.
+/// @param is: The stream to set up.
+/// @param filename: The path of the file.
+void openInputFile(boost::iostreams::filtering_istream& is,
+                   std::string const& filename) throw(std::runtime_error);
+
+/// Open file specified by path for writing with given compression.
+/// @param os: The stream to set up.
+/// @param filename: The path of the file.
+/// @param compression: One of the COMPRESSION_* names. If empty, the
+///                     compression is chosen by file extension.
+void openOutputFile(boost::iostreams::filtering_ostream& os,
+                    std::string const& filename,
+                    std::string const& compression="")
+throw(std::runtime_error);
+
+} // namespace pfe
+
+#endif // _PFE_COMPRESSION_HPP_
@@ -18,7 +18,11 @@
 #define _PFE_CORPUS_HPP_
 
 #include <PfeLib.hpp>
+#include <Compression.hpp>
 #include <Cover.hpp>
+#include <Vocabulary.hpp>
+
+#include <boost/noncopyable.hpp>
 
 namespace pfe {
 
@@ -29,9 +33,29 @@ namespace pfe {
 typedef std::vector<std::vector<std::string> > Document;
 typedef std::map<std::string, Document> Corpus;
 
+/// Document and corpus, where attributes are replaced by their identifiers
+/// in a Vocabulary.
+typedef std::vector<AttrIdVector> IdDocument;
+typedef std::map<std::string, IdDocument> IdCorpus;
+
 
 OrderedDocCover fullOrderedDocCoverFromDoc(Document const& doc);
+OrderedDocCover fullOrderedDocCoverFromDoc(IdDocument const& doc);
 OrderedCover fullOrderedCoverFromCorpus(Corpus const& corpus);
+OrderedCover fullOrderedCoverFromCorpus(IdCorpus const& corpus);
+
+/// Replace the attributes of the document by their identifiers. Attributes
+/// missing from the vocabulary are added to it.
+IdDocument encodeDocument(Document const& doc, Vocabulary& vocabulary);
+/// Replace the attributes of all corpus documents by their identifiers.
+/// Attributes missing from the vocabulary are added to it.
+IdCorpus encodeCorpus(Corpus const& corpus, Vocabulary& vocabulary);
+/// Translate the attribute identifiers of the document back to strings.
+Document decodeDocument(IdDocument const& doc, Vocabulary const& vocabulary)
+throw(std::range_error);
+/// Translate the attribute identifiers of the corpus back to strings.
+Corpus decodeCorpus(IdCorpus const& corpus, Vocabulary const& vocabulary)
+throw(std::range_error);
 
 /// Read a single document from string.
 /// First line of the string should contain the document name.
@@ -51,7 +75,8 @@ OrderedCover fullOrderedCoverFromCorpus(Corpus const& corpus);
 Document readDocFromStr(std::string const& s, std::string& docName);
 
 /// Read a single document from file specified by path.
-/// @see:pfe::readDocFromStr for document format.
+/// @see:pfe::readDocFromStr for document format. Files compressed with
+/// gzip, bzip2, xz or zstd are decompressed on the fly.
 /// @param filename: The path of the file.
 /// @param docName: The string to store the document name.
 Document readDocFromFile(std::string const& filename, std::string& docName)
@@ -65,16 +90,61 @@ Corpus readCorpusFromStr(std::string const& s);
 
 /// Read a corpus from file specified by path.
 /// Documents should be separated by empty lines. See @see:readDocFromStr for
-/// document format.
+/// document format. Binary corpora written by @see:writeBinaryCorpus are
+/// recognized and decoded as well. Files compressed with gzip, bzip2, xz
+/// or zstd are decompressed on the fly.
+/// With more than one thread uncompressed files are memory mapped, split
+/// into chunks at empty lines and the chunks are parsed in parallel. The
+/// result is the same as with a single thread.
 /// @param filename: The path of the file.
-Corpus readCorpusFromFile(std::string const& filename)
+/// @param numThreads: The number of threads used for parsing.
+Corpus readCorpusFromFile(std::string const& filename, long numThreads=1)
 throw (std::runtime_error);
 
 /// Write a corpus to file specified by filename.
 /// File can be later read using @see:readCorpusFromFile.
-void writeCorpusToFile(std::string const& filename, Corpus const& corpus)
+/// @param compression: One of the COMPRESSION_* names. If empty, the
+///                     compression is chosen by the extension of filename.
+void writeCorpusToFile(std::string const& filename, Corpus const& corpus,
+                       std::string const& compression="")
 throw (std::runtime_error);
 
+/// Forward-only reader yielding the documents of a corpus file or stream one
+/// at a time. Only the current document is kept in memory. Unlike
+/// @see:readCorpusFromStream, documents with duplicate names are all
+/// returned.
+///
+/// Example:
+///     CorpusReader reader(filename);
+///     while (reader.next()) {
+///         process(reader.name(), reader.document());
+///     }
+class CorpusReader : boost::noncopyable {
+    /// File stream used, when reader is constructed from file path.
+    boost::iostreams::filtering_istream _fin;
+    /// The stream documents are read from.
+    std::istream& _is;
+    std::string _name;
+    Document _document;
+public:
+    typedef Document mapped_type;
+    /// Construct a reader for file specified by path.
+    CorpusReader(std::string const& filename) throw(std::runtime_error);
+    /// Construct a reader for a stream. The stream must outlive the reader.
+    CorpusReader(std::istream& is) : _is(is) { }
+    /// Advance to the next document. Return false, if there are no more
+    /// documents.
+    bool next();
+    /// Return the name of the current document.
+    std::string const& name() const {
+        return _name;
+    }
+    /// Return the current document.
+    Document const& document() const {
+        return _document;
+    }
+};
+
 /// Given a corpus and a list of document ids, create a subcorpus.
 Corpus
 corpusSample(Corpus const& corpus, std::vector<std::string> const& docIds)
@@ -0,0 +1,102 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_CORPUSINDEX_HPP_
+#define _PFE_CORPUSINDEX_HPP_
+
+#include <PfeLib.hpp>
+#include <Corpus.hpp>
+
+#include <boost/unordered_map.hpp>
+
+namespace pfe {
+
+/// Location of a single document in a text corpus file.
+struct CorpusIndexEntry {
+    std::string name;
+    uint64_t offset;
+    uint64_t length;
+};
+
+/// Index of document offsets in an uncompressed text corpus file. The index
+/// allows reading single documents or samples of the corpus without parsing
+/// the whole file.
+///
+/// The index is stored in a sidecar file, by default the corpus path with
+/// ".idx" suffix. The header line records the size and modification time
+/// of the corpus, the sidecar is rebuilt if either of them has changed. Each
+/// following line contains the byte offset, byte length and name of a
+/// document separated by '\t'.
+class CorpusIndex {
+    /// Path of the indexed corpus.
+    std::string _corpusFilename;
+    /// Path of the sidecar index file.
+    std::string _indexFilename;
+    /// Document locations in file order.
+    std::vector<CorpusIndexEntry> _entries;
+    /// Mapping of document names to positions in _entries.
+    boost::unordered_map<std::string, size_t> _positions;
+
+    void build() throw(std::runtime_error);
+    bool load() throw(std::runtime_error);
+public:
+    /// Open the index of corpus specified by path. If the sidecar index file
+    /// exists and matches the corpus, it is loaded, otherwise the corpus is
+    /// scanned for document boundaries.
+    /// @param corpusFilename: The path of the text corpus.
+    /// @param indexFilename: The path of the sidecar, corpusFilename + ".idx"
+    ///                       if empty.
+    CorpusIndex(std::string const& corpusFilename,
+                std::string const& indexFilename="")
+    throw(std::runtime_error);
+    /// Write the index to the sidecar file.
+    void save() const throw(std::runtime_error);
+    /// Return the path of the indexed corpus.
+    std::string const& corpusFilename() const {
+        return _corpusFilename;
+    }
+    /// Return the path of the sidecar index file.
+    std::string const& indexFilename() const {
+        return _indexFilename;
+    }
+    /// Return the number of indexed documents.
+    size_t size() const {
+        return _entries.size();
+    }
+    /// Check if the index contains a document with given name.
+    bool contains(std::string const& docName) const {
+        return _positions.find(docName) != _positions.end();
+    }
+    /// Return the location of the document with given name.
+    CorpusIndexEntry const& entry(std::string const& docName) const
+    throw(std::runtime_error);
+    /// Return the names of the indexed documents in file order.
+    StringVector names() const;
+};
+
+/// Read a single document with given name using a corpus index.
+Document readDocFromFile(CorpusIndex const& index, std::string const& docName)
+throw(std::runtime_error);
+
+/// Given a corpus index and a list of document ids, read the subcorpus.
+/// Only the requested documents are read from the corpus file.
+Corpus corpusSample(CorpusIndex const& index,
+                    std::vector<std::string> const& docIds)
+throw(std::runtime_error);
+
+} // namespace pfe
+
+#endif // _PFE_CORPUSINDEX_HPP_
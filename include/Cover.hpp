@@ -41,6 +41,10 @@ public:
     Cover(std::map<std::string, T> const& m);
     /// Convert the cover to standard map.
     std::map<std::string, T> map() const;
+    /// Swap the contents of two covers.
+    void swap(Cover<T>& other) {
+        _map.swap(other._map);
+    }
     /// Add a new document to the cover.
     void addDocCover(std::string const& docName, T const& cover)
     throw(std::runtime_error);
@@ -90,6 +94,7 @@ public:
 
 typedef Cover<OrderedDocCover> OrderedCover;
 typedef Cover<BitsetDocCover> BitsetCover;
+typedef Cover<RoaringDocCover> RoaringCover;
 
 template<class T> Cover<T>::Cover(std::map<std::string, T> const& m) {
     for (auto i=m.begin() ; i!=m.end() ; ++i) {
@@ -162,25 +167,28 @@ Cover<T>::metrics (Cover<T> const& trueCover) const throw(std::runtime_error) {
     long fp = 0;
     long tn = 0;
     long fn = 0;
-    for (auto i=_map.begin() ; i!=_map.end() ; ++i) {
-        auto j = trueCover._map.find(i->first);
-        // if second cover is not found, assume it is empty
-        if (j == trueCover._map.end()) {
+    // both maps are ordered by document name, so merge them in one pass
+    auto i = _map.begin();
+    auto j = trueCover._map.begin();
+    while (i != _map.end() || j != trueCover._map.end()) {
+        if (j == trueCover._map.end() ||
+                (i != _map.end() && i->first < j->first)) {
+            // if second cover is not found, assume it is empty
             fp += i->second.size();
-            //throw std::range_error(ERR_DOC_NOT_FOUNT);
+            ++i;
+        } else if (i == _map.end() || j->first < i->first) {
+            // documents that are in second cover but not in first are
+            // false negatives
+            fn += j->second.size();
+            ++j;
         } else {
             CoverMetrics m = i->second.metrics(j->second);
             tp += m.tp();
             fp += m.fp();
             tn += m.tn();
             fn += m.fn();
-        }
-    }
-    // documents that are in second cover but not in first are false negatives
-    for (auto j=trueCover._map.begin() ; j!=trueCover._map.end() ; ++j) {
-        auto i = _map.find(j->first);
-        if (i == _map.end()) {
-            fn += j->second.size();
+            ++i;
+            ++j;
         }
     }
     return CoverMetrics(tp, fp, tn, fn);
@@ -246,22 +254,22 @@ throw(std::runtime_error) {
 
 template<class T> Cover<T> const& Cover<T>::operator|=(Cover<T> const& other)
 throw(std::runtime_error) {
-    for (auto i=_map.begin() ; i!=_map.end() ; ++i) {
-        auto j = other._map.find(i->first);
-        if (j != other._map.end()) {
+    // both maps are ordered by document name, so merge them in one pass
+    auto i = _map.begin();
+    for (auto j=other._map.begin() ; j!=other._map.end() ; ++j) {
+        while (i != _map.end() && i->first < j->first) {
+            ++i;
+        }
+        if (i != _map.end() && i->first == j->first) {
             if (i->second.docSize() != j->second.docSize()) {
                 throw std::runtime_error(ERR_MISMATCHING_DOC_SIZES);
             }
             i->second |= j->second;
+        } else {
+            // document exists in second, but not in first, just add it
+            _map.insert(i, *j);
         }
     }
-    for (auto j=other._map.begin() ; j!=other._map.end() ; ++j) {
-        // document exists in second, but not in first, just add it
-        if (_map.find(j->first) == _map.end()) {
-            _map[j->first] = j->second;
-        }
-    }
-    //_map = m;
     return *this;
 }
 
@@ -354,6 +362,10 @@ std::map<std::string, BitsetDocCover> asBc(StringMapBoolVector const& m);
 Cover<BitsetDocCover> asBitsetCover(Cover<OrderedDocCover> const& c);
 /// Convert a BitsetCover to OrderedCover.
 Cover<OrderedDocCover> asOrderedCover(Cover<BitsetDocCover> const& c);
+/// Convert an OrderedCover to RoaringCover.
+Cover<RoaringDocCover> asRoaringCover(Cover<OrderedDocCover> const& c);
+/// Convert a RoaringCover to OrderedCover.
+Cover<OrderedDocCover> asOrderedCover(Cover<RoaringDocCover> const& c);
 
 /// Given a vector of covers, true cover, return a vector of
 /// max length `limit`, that contains the cover indices in order, which
@@ -144,6 +144,85 @@ public:
     friend class OrderedDocCover;
 };
 
+/// Number of elements above which a roaring container switches from a
+/// sorted array to a bitmap.
+#define ROARING_ARRAY_LIMIT 4096
+
+/// RoaringDocCover splits the document into chunks of 65536 positions and
+/// stores the cover elements of each chunk either as a sorted array of
+/// 16-bit offsets (sparse chunks) or as a bitmap (dense chunks). Empty
+/// chunks are not stored.
+class RoaringDocCover : public DocCover {
+    /// Cover elements sharing the same high bits.
+    struct Container {
+        /// High bits of the elements.
+        long key;
+        /// Number of elements in the container.
+        long cardinality;
+        /// Sorted low bits of the elements, if the container is sparse.
+        std::vector<uint16_t> array;
+        /// Bitmap of the low bits, if the container is dense.
+        std::vector<uint64_t> bitmap;
+
+        bool operator==(Container const& other) const {
+            return key == other.key && array == other.array &&
+                   bitmap == other.bitmap;
+        }
+    };
+    /// Containers in increasing key order.
+    std::vector<Container> _containers;
+
+    static void normalize(Container& c);
+    static long intersectionSize(Container const& a, Container const& b);
+    static Container combine(Container const& a, Container const& b,
+                             int const op);
+    template<class F> void forEachInRange(long const first, long const last,
+                                          F f) const;
+    void combine(RoaringDocCover const& other, int const op);
+public:
+    /// Construct empty RoaringDocCover for zero-length document. This exists
+    /// because we want to create maps to DocCovers, which require the type to
+    /// be default constructable.
+    RoaringDocCover() : DocCover(0) { }
+    /// Construct empty RoaringDocCover for document of given size.
+    RoaringDocCover(long const docSize) : DocCover(docSize) { }
+    /// Copy constructor.
+    RoaringDocCover(RoaringDocCover const& other)
+        : DocCover(other.docSize()), _containers(other._containers) {
+    }
+    /// Initialize RoaringDocCover from given indices.
+    RoaringDocCover(long const docSize, LongVector const& indices)
+    throw(std::runtime_error);
+    /// Construct a RoaringDocCover from OrderedDocCover instance.
+    RoaringDocCover(OrderedDocCover const& other);
+    /// Return the sorted indices of the cover elements.
+    LongVector indices() const;
+    /// Return the sorted indices of the cover elements in range
+    /// [first, last).
+    LongVector indices(long const first, long const last) const;
+    /// Return the number of cover elements in range [first, last).
+    long count(long const first, long const last) const;
+    /// Given a true cover (or other cover), compute the metrics object
+    /// that can be used to get the precision, recall etc.
+    CoverMetrics metrics(RoaringDocCover const& trueCover) const
+    throw(std::runtime_error);
+    /// Return the number of cover elements.
+    long size() const;
+    // overloaded operators.
+    bool operator==(RoaringDocCover const& other) const;
+    bool operator!=(RoaringDocCover const& other) const {
+        return !(*this == other);
+    }
+    RoaringDocCover const& operator&=(RoaringDocCover const& other);
+    RoaringDocCover const& operator|=(RoaringDocCover const& other);
+    RoaringDocCover const& operator-=(RoaringDocCover const& other);
+    RoaringDocCover const& operator^=(RoaringDocCover const& other);
+    RoaringDocCover operator&(RoaringDocCover const& other) const;
+    RoaringDocCover operator|(RoaringDocCover const& other) const;
+    RoaringDocCover operator-(RoaringDocCover const& other) const;
+    RoaringDocCover operator^(RoaringDocCover const& other) const;
+};
+
 } // namespace pfe
 
 #endif // _PFE_DOCCOVER_HPP_
@@ -0,0 +1,171 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_FLATCOVER_HPP_
+#define _PFE_FLATCOVER_HPP_
+
+#include <PfeLib.hpp>
+#include <CoverMetrics.hpp>
+#include <DocCover.hpp>
+#include <Cover.hpp>
+#include <Corpus.hpp>
+#include <BinaryCorpus.hpp>
+
+#include <boost/dynamic_bitset.hpp>
+#include <boost/shared_ptr.hpp>
+#include <boost/unordered_map.hpp>
+
+namespace pfe {
+
+/// Table of document offsets shared by flat covers. Document i occupies
+/// global positions [offset(i), offset(i) + docSize(i)) of the corpus.
+class DocumentOffsets {
+    /// Document names in corpus order.
+    StringVector _names;
+    /// Offsets of the documents, followed by the size of the corpus.
+    LongVector _offsets;
+    /// Mapping of document names to their ids.
+    boost::unordered_map<std::string, long> _ids;
+public:
+    /// Construct an empty table.
+    DocumentOffsets() : _offsets(1, 0) { }
+    /// Construct the table of the documents of a corpus.
+    DocumentOffsets(Corpus const& corpus);
+    DocumentOffsets(IdCorpus const& corpus);
+    DocumentOffsets(BinaryCorpus const& corpus);
+    /// Add a document to the end of the table.
+    void addDocument(std::string const& docName, long const docSize)
+    throw(std::runtime_error);
+    /// Return the number of documents.
+    size_t size() const {
+        return _names.size();
+    }
+    /// Return the total number of words in the documents.
+    long corpusSize() const {
+        return _offsets.back();
+    }
+    /// Return the id of document with given name.
+    long id(std::string const& docName) const throw(std::range_error);
+    /// Return the name of document with given id.
+    std::string const& name(long const id) const {
+        return _names[id];
+    }
+    /// Return the global position of the first word of a document.
+    long offset(long const id) const {
+        return _offsets[id];
+    }
+    /// Return the size of a document.
+    long docSize(long const id) const {
+        return _offsets[id+1] - _offsets[id];
+    }
+    /// Return the names of the documents in table order.
+    StringVector names() const {
+        return _names;
+    }
+    bool operator==(DocumentOffsets const& other) const {
+        return _names == other._names && _offsets == other._offsets;
+    }
+};
+
+typedef boost::shared_ptr<DocumentOffsets const> DocumentOffsetsPtr;
+
+/// Cover of a whole corpus addressing the cover elements by their global
+/// position in the document offset table. The elements of all documents
+/// are kept in a single @see:RoaringDocCover, so the set operations and
+/// metrics are a single linear pass over the corpus instead of a lookup
+/// and allocation per document.
+///
+/// The documents present in the cover are tracked separately, so that the
+/// operators and metrics have the same semantics as in @see:Cover. A
+/// default constructed cover has no offset table and acts as an empty
+/// cover of any table.
+class FlatCover {
+    /// Shared table of document offsets.
+    DocumentOffsetsPtr _offsets;
+    /// Documents present in the cover.
+    boost::dynamic_bitset<> _docs;
+    /// Cover elements at global positions.
+    RoaringDocCover _elements;
+
+    bool sameOffsets(FlatCover const& other) const;
+    void combine(FlatCover const& other, int const op)
+    throw(std::runtime_error);
+public:
+    /// Construct an empty cover without an offset table.
+    FlatCover() { }
+    /// Construct an empty cover of documents in the offset table.
+    FlatCover(DocumentOffsetsPtr const& offsets);
+    /// Construct a flat cover from a cover of the documents in the table.
+    FlatCover(OrderedCover const& cover, DocumentOffsetsPtr const& offsets)
+    throw(std::range_error);
+    /// Return the offset table of the cover.
+    DocumentOffsetsPtr offsets() const {
+        return _offsets;
+    }
+    /// Get the names of the cover documents.
+    StringVector names() const;
+    /// Return the cover of document given by name.
+    OrderedDocCover docCover(std::string const& docName) const
+    throw(std::range_error);
+    /// Convert the flat cover to a cover with document names.
+    OrderedCover orderedCover() const;
+    /// Return the number of cover elements.
+    long size() const {
+        return _elements.size();
+    }
+    /// Return the number of documents in the cover.
+    long numDocs() const {
+        return _docs.count();
+    }
+    /// Given a true cover (or other cover), compute the metrics object
+    /// that can be used to get the precision, recall etc.
+    CoverMetrics metrics(FlatCover const& trueCover) const
+    throw(std::runtime_error);
+    /// Compute the metrics for all individual documents.
+    std::map<std::string, CoverMetrics>
+    documentMetrics(FlatCover const& trueCover) const
+    throw(std::runtime_error);
+    // overloaded operators.
+    bool operator==(FlatCover const& other) const;
+    bool operator!=(FlatCover const& other) const {
+        return !(*this == other);
+    }
+    FlatCover const& operator&=(FlatCover const& other)
+    throw(std::runtime_error);
+    FlatCover const& operator|=(FlatCover const& other)
+    throw(std::runtime_error);
+    FlatCover const& operator-=(FlatCover const& other)
+    throw(std::runtime_error);
+    FlatCover const& operator^=(FlatCover const& other)
+    throw(std::runtime_error);
+    FlatCover operator&(FlatCover const& other) const
+    throw(std::runtime_error);
+    FlatCover operator|(FlatCover const& other) const
+    throw(std::runtime_error);
+    FlatCover operator-(FlatCover const& other) const
+    throw(std::runtime_error);
+    FlatCover operator^(FlatCover const& other) const
+    throw(std::runtime_error);
+};
+
+/// Create a shared document offset table of a corpus.
+DocumentOffsetsPtr corpusOffsets(Corpus const& corpus);
+DocumentOffsetsPtr corpusOffsets(IdCorpus const& corpus);
+DocumentOffsetsPtr corpusOffsets(BinaryCorpus const& corpus);
+
+} // namespace pfe
+
+#endif // _PFE_FLATCOVER_HPP_
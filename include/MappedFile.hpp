@@ -0,0 +1,47 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_MAPPEDFILE_HPP_
+#define _PFE_MAPPEDFILE_HPP_
+
+#include <PfeLib.hpp>
+
+#include <boost/noncopyable.hpp>
+
+namespace pfe {
+
+/// Read-only memory mapping of a whole file. The mapping is released when
+/// the object is destroyed.
+class MappedFile : boost::noncopyable {
+    void* _data;
+    size_t _size;
+public:
+    /// Map the file specified by path into memory.
+    MappedFile(std::string const& filename) throw(std::runtime_error);
+    ~MappedFile();
+    /// Return the beginning of the mapped file, 0 for empty files.
+    char const* data() const {
+        return static_cast<char const*>(_data);
+    }
+    /// Return the size of the mapped file in bytes.
+    size_t size() const {
+        return _size;
+    }
+};
+
+} // namespace pfe
+
+#endif // _PFE_MAPPEDFILE_HPP_
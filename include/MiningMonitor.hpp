@@ -0,0 +1,68 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_MININGMONITOR_HPP_
+#define _PFE_MININGMONITOR_HPP_
+
+#include <PfeLib.hpp>
+
+namespace pfe {
+
+/// Statistics of a single level of a level-wise miner.
+struct LevelStats {
+    /// Level of the conjunctions, starting from 1.
+    long level;
+    /// Number of candidates evaluated on this level.
+    long numCandidates;
+    /// Number of candidates found frequent.
+    long numFrequent;
+    /// Wall-clock seconds spent evaluating the candidates.
+    double evaluateTime;
+    /// Wall-clock seconds spent generating the candidates.
+    double candidateTime;
+    /// Number of sorted candidate runs spilled to disk.
+    long numSpilledRuns;
+    /// Seconds each worker thread spent evaluating candidates. A large
+    /// spread points to a skewed partition of the candidates.
+    std::vector<double> threadBusyTime;
+    /// Peak number of cover elements held in the conjunction cover caches.
+    long peakCacheSize;
+
+    LevelStats();
+};
+
+/// Receives the progress of the level-wise miners.
+///
+/// The default implementation ignores the progress, subclasses (also in
+/// Python) override onLevel.
+class MiningMonitor {
+public:
+    virtual ~MiningMonitor();
+    /// Called after a level is evaluated.
+    virtual void onLevel(LevelStats const& stats);
+};
+
+/// Switch the progress messages of the miners on stderr on or off.
+void setMiningVerbose(bool verbose);
+bool miningVerbose();
+/// Print a printf style progress message on stderr, unless switched off.
+void miningLog(char const* format, ...);
+/// Wall-clock time in seconds.
+double wallTime();
+
+} // namespace pfe
+
+#endif // _PFE_MININGMONITOR_HPP_
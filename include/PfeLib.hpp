@@ -56,6 +56,7 @@ Code style of PFE C++ library:
 #include <map>
 #include <set>
 #include <cmath>
+#include <cstdint>
 
 namespace pfe {
 
@@ -70,6 +71,17 @@ namespace pfe {
 #define ERR_COULD_NOT_WRITE_FILE "008: Could not write file "
 #define ERR_TRESHOLD_INSANE "009: Your treshold is too low or too high to obtain any meaningul results for given data."
 #define ERR_DOCUMENT_NOT_FOUND "010: Document not found"
+#define ERR_ATTRIBUTE_NOT_FOUND "011: Attribute not found in vocabulary."
+#define ERR_INVALID_BINARY_CORPUS "012: Invalid binary corpus file "
+#define ERR_INVALID_CORPUS_INDEX "013: Invalid corpus index file "
+#define ERR_UNKNOWN_COMPRESSION "014: Unknown or unsupported compression "
+#define ERR_COMPRESSED_FILE "015: Operation not supported on compressed file "
+#define ERR_INVALID_RULE_CACHE "016: Invalid rule cover cache file "
+#define ERR_UNORDERED_DOC_ID "017: Document ids must be added in increasing order."
+#define ERR_MISMATCHING_OFFSETS "018: Covers use different document offset tables."
+#define ERR_UNSUPPORTED_METRIC "019: Metric not supported for top-k mining "
+#define ERR_INVALID_APRIORI_CHECKPOINT "020: Invalid Apriori checkpoint file "
+#define ERR_CANDIDATE_SPILL "021: Failed to spill candidates to disk "
 
 typedef std::vector<long> LongVector;
 typedef std::vector<std::string> StringVector;
@@ -0,0 +1,117 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_POSTINGCOVER_HPP_
+#define _PFE_POSTINGCOVER_HPP_
+
+#include <PfeLib.hpp>
+#include <CoverMetrics.hpp>
+#include <Cover.hpp>
+#include <DocCover.hpp>
+#include <Vocabulary.hpp>
+
+namespace pfe {
+
+/// Compact cover of a corpus stored as a compressed posting list.
+///
+/// Documents are identified by integer ids instead of names, usually the
+/// index of the document in the corpus. Each document entry is encoded with
+/// variable length integers as the document id gap, the document size, the
+/// number of cover elements, the byte length of the elements and finally
+/// the gaps between consecutive cover elements. A single cover element
+/// takes one or two bytes on typical documents.
+///
+/// The operators have the same semantics as the operators of @see:Cover and
+/// work on the encoded entries, document by document.
+class PostingCover {
+    /// Encoded document entries in increasing document id order.
+    std::vector<uint8_t> _data;
+    /// Number of document entries.
+    long _numDocs;
+    /// Number of cover elements in all documents.
+    long _size;
+    /// Id of the last document entry, -1 if there are none.
+    long _lastDocId;
+
+    void append(long const docId, long const docSize, long const count,
+                uint8_t const* elems, size_t const numBytes);
+    PostingCover combine(PostingCover const& other, bool const keepFirst,
+                         bool const keepSecond, bool const keepBoth) const
+    throw(std::runtime_error);
+public:
+    /// Construct an empty cover.
+    PostingCover() : _numDocs(0), _size(0), _lastDocId(-1) { }
+    /// Add the cover of a document. Documents must be added in increasing
+    /// document id order.
+    void addDocCover(long const docId, OrderedDocCover const& cover)
+    throw(std::runtime_error);
+    /// Return the ids of the cover documents.
+    LongVector docIds() const;
+    /// Return the cover of document with given id.
+    OrderedDocCover docCover(long const docId) const throw(std::range_error);
+    /// Convert the cover to a map of document ids and their covers.
+    std::map<long, OrderedDocCover> map() const;
+    /// Return the number of cover elements.
+    long size() const {
+        return _size;
+    }
+    /// Return the number of documents in the cover.
+    long numDocs() const {
+        return _numDocs;
+    }
+    /// Return the size of the encoded cover in bytes.
+    size_t byteSize() const {
+        return _data.size();
+    }
+    /// Given a true cover (or other cover), compute the metrics object
+    /// that can be used to get the precision, recall etc.
+    CoverMetrics metrics(PostingCover const& trueCover) const
+    throw(std::runtime_error);
+    // overloaded operators.
+    bool operator==(PostingCover const& other) const;
+    bool operator!=(PostingCover const& other) const {
+        return !(*this == other);
+    }
+    PostingCover const& operator&=(PostingCover const& other)
+    throw(std::runtime_error);
+    PostingCover const& operator|=(PostingCover const& other)
+    throw(std::runtime_error);
+    PostingCover const& operator-=(PostingCover const& other)
+    throw(std::runtime_error);
+    PostingCover const& operator^=(PostingCover const& other)
+    throw(std::runtime_error);
+    PostingCover operator&(PostingCover const& other) const
+    throw(std::runtime_error);
+    PostingCover operator|(PostingCover const& other) const
+    throw(std::runtime_error);
+    PostingCover operator-(PostingCover const& other) const
+    throw(std::runtime_error);
+    PostingCover operator^(PostingCover const& other) const
+    throw(std::runtime_error);
+};
+
+/// Translate a cover to a posting cover. Document names are added to the
+/// vocabulary of documents if missing.
+PostingCover encodeCover(OrderedCover const& cover, Vocabulary& documents);
+
+/// Translate a posting cover back to a cover with document names.
+OrderedCover decodeCover(PostingCover const& cover,
+                         Vocabulary const& documents)
+throw(std::range_error);
+
+} // namespace pfe
+
+#endif // _PFE_POSTINGCOVER_HPP_
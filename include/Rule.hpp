@@ -20,7 +20,11 @@
 #include <PfeLib.hpp>
 #include <DocCover.hpp>
 #include <Cover.hpp>
+#include <PostingCover.hpp>
+#include <FlatCover.hpp>
 #include <Corpus.hpp>
+#include <BinaryCorpus.hpp>
+#include <Vocabulary.hpp>
 
 namespace pfe {
 
@@ -31,44 +35,239 @@ typedef std::vector<Conjunction> Disjunction;
 typedef std::map<Rule, OrderedDocCover> RuleOrderedDocCover;
 typedef std::map<Rule, OrderedCover> RuleOrderedCover;
 
+/// Rules and conjunctions, where the attribute is given by its identifier
+/// in a Vocabulary. These compare, hash and copy much faster than their
+/// string based counterparts and should be preferred on large corpora.
+typedef std::pair<long, AttrId> IdRule;
+typedef std::vector<IdRule> IdConjunction;
+typedef std::vector<IdConjunction> IdDisjunction;
+
+typedef std::map<IdRule, OrderedDocCover> IdRuleOrderedDocCover;
+typedef std::map<IdRule, OrderedCover> IdRuleOrderedCover;
+
+/// Translate a rule to use attribute identifier. Attribute is added to the
+/// vocabulary if it is missing.
+IdRule encodeRule(Rule const& rule, Vocabulary& vocabulary);
+/// Translate a rule back to use attribute string.
+Rule decodeRule(IdRule const& rule, Vocabulary const& vocabulary)
+throw(std::range_error);
+/// Translate conjunctions to use attribute identifiers. Rules inside the
+/// resulting conjunctions are sorted.
+std::vector<IdConjunction>
+encodeConjunctions(std::vector<Conjunction> const& conjunctions,
+                   Vocabulary& vocabulary);
+/// Translate conjunctions back to use attribute strings. Rules inside the
+/// resulting conjunctions are sorted.
+std::vector<Conjunction>
+decodeConjunctions(std::vector<IdConjunction> const& conjunctions,
+                   Vocabulary const& vocabulary)
+throw(std::range_error);
+/// Translate rule covers to use attribute identifiers.
+std::map<IdRule, OrderedCover>
+encodeRuleCovers(std::map<Rule, OrderedCover> const& covers,
+                 Vocabulary& vocabulary);
+/// Translate rule covers back to use attribute strings.
+std::map<Rule, OrderedCover>
+decodeRuleCovers(std::map<IdRule, OrderedCover> const& covers,
+                 Vocabulary const& vocabulary)
+throw(std::range_error);
+
 /// Extract Rules from the document with their covers.
 /// @param document: The document the rules will be extracted from.
 /// @param radius: Context radius to use for creating the rules.
 std::map<Rule, OrderedDocCover>
 docBasicRuleCovers(Document const& document, long const radius=2);
+std::map<IdRule, OrderedDocCover>
+docBasicRuleCovers(IdDocument const& document, long const radius=2);
+std::map<IdRule, OrderedDocCover>
+docBasicRuleCovers(BinaryDocument const& document, long const radius=2);
 
 /// Extract rules from the corpus with their covers.
 /// @param corpus: The corpus of documents the rules will be extracted from.
 /// @param radius: Context radius to use for creating the rules.
+/// @param numThreads: The number of threads. The documents are split into
+///                    shards processed in parallel and the shard results
+///                    are merged pairwise.
+/// @param minCount: If greater than 1, drop the rules occurring less than
+///                  minCount times in the corpus.
+/// @param minDocCount: If greater than 1, drop the rules occurring in less
+///                     than minDocCount documents.
+/// The rules are pruned with a counting pass over the corpus, before any
+/// covers are built for them.
 std::map<Rule, OrderedCover>
-basicRuleCovers(Corpus const& corpus, long const radius=2);
+basicRuleCovers(Corpus const& corpus, long const radius=2,
+                long numThreads=1, long minCount=0, long minDocCount=0);
+/// Extract rules with their covers from the remaining documents of the
+/// reader, one document at a time.
+std::map<Rule, OrderedCover>
+basicRuleCovers(CorpusReader& reader, long const radius=2);
+std::map<IdRule, OrderedCover>
+basicRuleCovers(IdCorpus const& corpus, long const radius=2,
+                long numThreads=1, long minCount=0, long minDocCount=0);
+std::map<IdRule, OrderedCover>
+basicRuleCovers(BinaryCorpus const& corpus, long const radius=2,
+                long numThreads=1, long minCount=0, long minDocCount=0);
+
+/// Extract rules with their covers as compressed posting lists.
+/// @param documents: Vocabulary of document names. The corpus documents are
+///                   added to it in corpus order and their ids are used as
+///                   document ids of the covers. Ids of documents already
+///                   in the vocabulary must increase in corpus order.
+/// Use @see:encodeCover with the same vocabulary to translate the true
+/// cover.
+std::map<Rule, PostingCover>
+basicPostingCovers(Corpus const& corpus, Vocabulary& documents,
+                   long const radius=2);
+std::map<IdRule, PostingCover>
+basicPostingCovers(IdCorpus const& corpus, Vocabulary& documents,
+                   long const radius=2);
+std::map<IdRule, PostingCover>
+basicPostingCovers(BinaryCorpus const& corpus, Vocabulary& documents,
+                   long const radius=2);
 
 /// Extract full specific conjunctions from a single document.
 std::set<Conjunction>
 docFullConjunctions(Document const& document, long const radius);
+std::set<IdConjunction>
+docFullConjunctions(IdDocument const& document, long const radius);
+std::set<IdConjunction>
+docFullConjunctions(BinaryDocument const& document, long const radius);
 
 /// Extract full specific conjunctions from corpus.
+/// @see:basicRuleCovers for the numThreads argument.
 std::vector<Conjunction>
-fullConjunctions(Corpus const& corpus, long const radius=2);
+fullConjunctions(Corpus const& corpus, long const radius=2,
+                 long numThreads=1);
+std::vector<Conjunction>
+fullConjunctions(CorpusReader& reader, long const radius=2);
+std::vector<IdConjunction>
+fullConjunctions(IdCorpus const& corpus, long const radius=2,
+                 long numThreads=1);
+std::vector<IdConjunction>
+fullConjunctions(BinaryCorpus const& corpus, long const radius=2,
+                 long numThreads=1);
 
 /// Count the number of different basic rules in Document.
 std::map<Rule, long>
 docRuleCount(Document const& document, long const radius=2);
+std::map<IdRule, long>
+docRuleCount(IdDocument const& document, long const radius=2);
+std::map<IdRule, long>
+docRuleCount(BinaryDocument const& document, long const radius=2);
 
 /// Count the number of different basic rules in Corpus.
+/// @see:basicRuleCovers for the numThreads argument.
+std::map<Rule, long>
+corpusRuleCount(Corpus const& corpus, long const radius=2,
+                long numThreads=1);
 std::map<Rule, long>
-corpusRuleCount(Corpus const& corpus, long const radius=2);
+corpusRuleCount(CorpusReader& reader, long const radius=2);
+std::map<IdRule, long>
+corpusRuleCount(IdCorpus const& corpus, long const radius=2,
+                long numThreads=1);
+std::map<IdRule, long>
+corpusRuleCount(BinaryCorpus const& corpus, long const radius=2,
+                long numThreads=1);
+
+/// Flags selecting the statistics computed by @see:extractRuleStatistics.
+#define RULE_COVERS       1
+#define RULE_COUNTS       2
+#define FULL_CONJUNCTIONS 4
+#define ALL_RULE_STATISTICS (RULE_COVERS | RULE_COUNTS | FULL_CONJUNCTIONS)
+
+/// Results of @see:extractRuleStatistics. Members that were not requested
+/// are left empty.
+template<class R>
+struct BasicRuleStatistics {
+    /// Rules with their covers, as given by @see:basicRuleCovers.
+    std::map<R, OrderedCover> covers;
+    /// Rule counts, as given by @see:corpusRuleCount.
+    std::map<R, long> counts;
+    /// Full conjunctions, as given by @see:fullConjunctions.
+    std::vector<std::vector<R> > conjunctions;
+};
+
+typedef BasicRuleStatistics<Rule> RuleStatistics;
+typedef BasicRuleStatistics<IdRule> IdRuleStatistics;
+
+/// Compute any combination of rule covers, rule counts and full
+/// conjunctions with a single pass over the corpus.
+/// @param corpus: The corpus of documents the rules will be extracted from.
+/// @param radius: Context radius to use for creating the rules.
+/// @param what: Bitwise or of RULE_COVERS, RULE_COUNTS and
+///              FULL_CONJUNCTIONS.
+/// @param numThreads: @see:basicRuleCovers.
+RuleStatistics extractRuleStatistics(Corpus const& corpus, long const radius=2,
+        long const what=ALL_RULE_STATISTICS, long numThreads=1);
+RuleStatistics extractRuleStatistics(CorpusReader& reader, long const radius=2,
+        long const what=ALL_RULE_STATISTICS);
+IdRuleStatistics extractRuleStatistics(IdCorpus const& corpus,
+        long const radius=2, long const what=ALL_RULE_STATISTICS,
+        long numThreads=1);
+IdRuleStatistics extractRuleStatistics(BinaryCorpus const& corpus,
+        long const radius=2, long const what=ALL_RULE_STATISTICS,
+        long numThreads=1);
 
 /// Create conjunction pairs
 std::vector<Conjunction> conjunctionPairs(std::vector<Conjunction> const& A,
                                           std::vector<Conjunction> const& B);
+std::vector<IdConjunction>
+conjunctionPairs(std::vector<IdConjunction> const& A,
+                 std::vector<IdConjunction> const& B);
 
 /// Unique conjunctions
 std::vector<Conjunction> uniqueConjunctions(std::vector<Conjunction> const& A);
+std::vector<IdConjunction>
+uniqueConjunctions(std::vector<IdConjunction> const& A);
 
-/// Compute the cover of a conjunction.
+/// Compute the cover of a conjunction. The basic covers are intersected
+/// from the smallest upwards.
+/// @param minSize: If the running intersection has less than minSize
+///                 elements, the computation is aborted. Use
+///                 treshold * trueCover.size() to skip conjunctions whose
+///                 recall can not reach the treshold.
+/// If a rule has no basic cover, or minSize is positive and the
+/// conjunction covers less than minSize elements, an empty cover is
+/// returned. Otherwise the documents shared by all rules are kept, also
+/// when no element is covered in them.
 OrderedCover conjunctionCover(Conjunction const& c,
-                            std::map<Rule, OrderedCover> const& basicCovers);
+                            std::map<Rule, OrderedCover> const& basicCovers,
+                            long const minSize=0);
+OrderedCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, OrderedCover> const& basicCovers,
+                            long const minSize=0);
+PostingCover conjunctionCover(Conjunction const& c,
+                            std::map<Rule, PostingCover> const& basicCovers,
+                            long const minSize=0);
+PostingCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, PostingCover> const& basicCovers,
+                            long const minSize=0);
+RoaringCover conjunctionCover(Conjunction const& c,
+                            std::map<Rule, RoaringCover> const& basicCovers,
+                            long const minSize=0);
+RoaringCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, RoaringCover> const& basicCovers,
+                            long const minSize=0);
+FlatCover conjunctionCover(Conjunction const& c,
+                            std::map<Rule, FlatCover> const& basicCovers,
+                            long const minSize=0);
+FlatCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, FlatCover> const& basicCovers,
+                            long const minSize=0);
+
+/// Convert basic rule covers to roaring covers.
+std::map<Rule, RoaringCover>
+asRoaringRuleCovers(std::map<Rule, OrderedCover> const& basicCovers);
+std::map<IdRule, RoaringCover>
+asRoaringRuleCovers(std::map<IdRule, OrderedCover> const& basicCovers);
+
+/// Convert basic rule covers to flat covers sharing the offset table.
+std::map<Rule, FlatCover>
+asFlatRuleCovers(std::map<Rule, OrderedCover> const& basicCovers,
+                 DocumentOffsetsPtr const& offsets);
+std::map<IdRule, FlatCover>
+asFlatRuleCovers(std::map<IdRule, OrderedCover> const& basicCovers,
+                 DocumentOffsetsPtr const& offsets);
 
 
 /// Reorder a list of conjunctions according to recall.
@@ -76,6 +275,10 @@ std::vector<Conjunction>
 reorderRecall(std::vector<Conjunction> const& conjunctions,
               std::map<Rule, OrderedCover> const& basicCovers,
               OrderedCover const& trueCover);
+std::vector<IdConjunction>
+reorderRecall(std::vector<IdConjunction> const& conjunctions,
+              std::map<IdRule, OrderedCover> const& basicCovers,
+              OrderedCover const& trueCover);
 
 } //namespace pfe
 
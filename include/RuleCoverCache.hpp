@@ -0,0 +1,102 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_RULECOVERCACHE_HPP_
+#define _PFE_RULECOVERCACHE_HPP_
+
+#include <PfeLib.hpp>
+#include <Rule.hpp>
+
+namespace pfe {
+
+#define RULE_COVER_CACHE_MAGIC "PFERCOVR"
+#define RULE_COVER_CACHE_VERSION 1
+
+/// Binary rule cover cache format.
+///
+/// The file consists of a header followed by five sections, each aligned
+/// to 8 bytes:
+///     - string offsets: numStrings+1 uint64 offsets into string data.
+///     - string data: concatenated strings (document names and attributes).
+///     - rules: numRules+1 entries, the last one marks the end of documents.
+///     - documents: numDocs+1 entries, the last one marks the end of
+///       indices. Documents of each rule are sorted by name.
+///     - indices: numIndices uint32 cover elements.
+/// The header records the hash of the corpus file and the radius the covers
+/// were extracted with.
+struct RuleCoverCacheHeader {
+    char magic[8];
+    uint32_t version;
+    uint32_t reserved;
+    uint64_t corpusHash;
+    int64_t radius;
+    uint64_t numStrings;
+    uint64_t stringDataSize;
+    uint64_t numRules;
+    uint64_t numDocs;
+    uint64_t numIndices;
+};
+
+/// Rule entry of the rule cover cache.
+struct RuleCoverCacheRule {
+    int64_t offset;
+    uint32_t attrId;
+    uint32_t reserved;
+    uint64_t firstDoc;
+};
+
+/// Document cover entry of the rule cover cache.
+struct RuleCoverCacheDoc {
+    uint32_t nameId;
+    uint32_t docSize;
+    uint64_t firstIndex;
+};
+
+/// Compute the 64-bit FNV-1a hash of the contents of file specified by path.
+uint64_t hashFile(std::string const& filename) throw(std::runtime_error);
+
+/// Write rule covers in binary form to file specified by filename.
+/// @param corpusHash: Hash of the corpus the covers were extracted from.
+/// @param radius: The radius the covers were extracted with.
+void writeRuleCovers(std::string const& filename,
+                     std::map<Rule, OrderedCover> const& covers,
+                     uint64_t const corpusHash=0, long const radius=0)
+throw(std::runtime_error);
+
+/// Read rule covers written by @see:writeRuleCovers.
+std::map<Rule, OrderedCover> readRuleCovers(std::string const& filename)
+throw(std::runtime_error);
+
+/// Return the basic rule covers of corpus specified by path, using a cache
+/// file. If the cache file was created for the same corpus contents and
+/// radius, the covers are loaded from it. Otherwise the corpus is read, the
+/// covers extracted with @see:basicRuleCovers and the cache file rewritten.
+/// Failing to write the cache file is not an error.
+/// @param corpusFilename: The path of the corpus.
+/// @param radius: Context radius to use for creating the rules.
+/// @param cacheFilename: The path of the cache file. If empty,
+///                       corpusFilename + ".r<radius>.rcache" is used.
+/// @param numThreads: The number of threads used for reading the corpus and
+///                    extracting the covers.
+std::map<Rule, OrderedCover>
+cachedBasicRuleCovers(std::string const& corpusFilename, long const radius=2,
+                      std::string const& cacheFilename="",
+                      long numThreads=1)
+throw(std::runtime_error);
+
+} // namespace pfe
+
+#endif // _PFE_RULECOVERCACHE_HPP_
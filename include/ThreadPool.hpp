@@ -0,0 +1,75 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_THREADPOOL_HPP_
+#define _PFE_THREADPOOL_HPP_
+
+#include <PfeLib.hpp>
+#include <MiningMonitor.hpp>
+
+#include <boost/function.hpp>
+#include <boost/noncopyable.hpp>
+#include <boost/thread.hpp>
+#include <boost/thread/condition_variable.hpp>
+#include <boost/thread/mutex.hpp>
+
+namespace pfe {
+
+/// Pool of worker threads that persists across parallel loops.
+///
+/// A loop over [0, n) is split into chunks of chunkSize consecutive
+/// indices, idle workers take the next unprocessed chunk, so threads that
+/// get cheap chunks simply process more of them.
+class ThreadPool : private boost::noncopyable {
+private:
+    boost::thread_group _threads;
+    boost::mutex _mutex;
+    boost::condition_variable _work;
+    boost::condition_variable _done;
+    boost::function<void (long, long)> _f;
+    long _numThreads;
+    long _n;
+    long _chunkSize;
+    long _next;
+    long _busy;
+    unsigned long _generation;
+    bool _stop;
+    std::string _error;
+    std::vector<double> _busyTime;
+
+    void worker(long id);
+    /// Process chunks of the current loop until none are left.
+    void runChunks();
+public:
+    explicit ThreadPool(long numThreads);
+    ~ThreadPool();
+
+    long size() const;
+    /// Seconds each worker spent processing chunks since the last reset.
+    std::vector<double> busyTimes();
+    void resetBusyTimes();
+    /// Call f(first, last) for all chunks of [0, n) and wait until they are
+    /// processed. Chunks are processed in parallel and in no particular
+    /// order. If f throws, the remaining chunks are skipped and the error is
+    /// rethrown as std::runtime_error.
+    void forEachChunk(long n, long chunkSize,
+                      boost::function<void (long, long)> const& f)
+    throw(std::runtime_error);
+};
+
+} // namespace pfe
+
+#endif // _PFE_THREADPOOL_HPP_
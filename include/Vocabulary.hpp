@@ -0,0 +1,69 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+#ifndef _PFE_VOCABULARY_HPP_
+#define _PFE_VOCABULARY_HPP_
+
+#include <PfeLib.hpp>
+
+#include <boost/unordered_map.hpp>
+
+namespace pfe {
+
+/// Integer identifier of an interned attribute string.
+typedef uint32_t AttrId;
+typedef std::vector<AttrId> AttrIdVector;
+
+/// Vocabulary maps attribute strings to dense 32-bit identifiers and back.
+/// Identifiers are assigned in the order the attributes are added, starting
+/// from zero. Working on identifiers instead of strings makes rule
+/// comparisons and rule map lookups considerably cheaper.
+class Vocabulary {
+    /// Attribute strings indexed by their identifiers.
+    StringVector _attributes;
+    /// Mapping of attribute strings to their identifiers.
+    boost::unordered_map<std::string, AttrId> _ids;
+public:
+    /// Construct an empty vocabulary.
+    Vocabulary() { }
+    /// Construct a vocabulary from given attributes. The i-th attribute
+    /// will get identifier i, duplicates are ignored.
+    Vocabulary(StringVector const& attributes);
+    /// Return the identifier of the attribute. If the attribute is not
+    /// present, add it to the vocabulary first.
+    AttrId add(std::string const& attribute);
+    /// Return the identifier of an attribute already in the vocabulary.
+    AttrId id(std::string const& attribute) const throw(std::range_error);
+    /// Return the attribute string of given identifier.
+    std::string const& attribute(AttrId const id) const
+    throw(std::range_error);
+    /// Check if the vocabulary contains given attribute.
+    bool contains(std::string const& attribute) const {
+        return _ids.find(attribute) != _ids.end();
+    }
+    /// Return all attributes ordered by their identifiers.
+    StringVector attributes() const {
+        return _attributes;
+    }
+    /// Return the number of attributes in the vocabulary.
+    size_t size() const {
+        return _attributes.size();
+    }
+};
+
+} // namespace pfe
+
+#endif // _PFE_VOCABULARY_HPP_
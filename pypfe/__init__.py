@@ -27,6 +27,7 @@ nltk
 xlrd
 mlpy
 matplotlib
+futures (only pypfe.background)
 '''
 
 from pfe import *
@@ -18,6 +18,7 @@
 '''Generic multi-core Apriori implementation.'''
 
 import sys
+import heapq
 from copy import copy
 from random import sample
 from multiprocessing import Process, Queue
@@ -163,4 +164,50 @@ class Apriori(object):
         log.debug('Returing {0} most frequent objects.'.format(len(resulting_objects)))
         return resulting_objects
 
+    @staticmethod
+    def mine_top_k(objects, freq_op, join_op, weight_op, k, **kwargs):
+        '''Mine the k objects with the highest weight using Apriori.
+        The k best objects seen so far are kept in a heap and objects that
+        cannot beat the k-th best weight are not joined further.
+        objects, freq_op, join_op - see Apriori.mine.
+        weight_op(obj, **kwargs) - the weight of given object.
+        k - the number of objects to return.
+
+        keyword arguments:
+        num_cores - the number of cores the mining process will use.
+        bound_op  - function returning an upper bound for the weight of given
+                    object and any object joined from it. Defaults to
+                    weight_op, which is correct only if the weight of joined
+                    objects cannot increase (support, recall).
+
+        Returns the objects sorted from the best to the worst.
+        '''
+        bound_op = kwargs.get('bound_op', weight_op)
+        heap = []
+        def keep(obj):
+            return len(heap) < k or bound_op(obj, **kwargs) >= heap[0][0]
+
+        candidates = set(objects)
+        seen = set(candidates)
+        freq_objects = None
+        while len(candidates) > 0 and k > 0:
+            log.debug('Have {0} candidates in iteration.'.format(len(candidates)))
+            frequent = Apriori._frequent_objects(candidates, freq_op, join_op, **kwargs)
+            for obj in frequent:
+                weight = weight_op(obj, **kwargs)
+                if len(heap) < k:
+                    heapq.heappush(heap, (weight, obj))
+                elif weight > heap[0][0]:
+                    heapq.heapreplace(heap, (weight, obj))
+            # the k-th best weight only rises, so prune after the whole level
+            frequent = set(obj for obj in frequent if keep(obj))
+            if freq_objects == None:
+                freq_objects = frequent
+            else:
+                freq_objects = set(obj for obj in freq_objects if keep(obj))
+            candidates = Apriori.create_conjunctions(frequent, freq_objects, join_op, set(), **kwargs)
+            candidates -= seen
+            seen |= candidates
 
+        log.debug('Returning {0} best objects.'.format(len(heap)))
+        return [obj for _, obj in sorted(heap, reverse=True)]
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Python 2.7
+#  Pattern based fact extraction library.
+#    Copyright (C) 2013 University of Tartu
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+'''Run long library calls in background threads.
+
+The SWIG bindings release the GIL while the C++ code runs, so the calls
+submitted here run in parallel with each other and with the rest of the
+Python program. Every function returns a concurrent.futures.Future. The
+arguments must not be modified before the future is done.
+'''
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pfe import *
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def executor(max_workers=4):
+    '''Return the executor shared by the wrappers in this module, creating
+    it with `max_workers` threads on first use.'''
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers)
+        return _executor
+
+def shutdown(wait=True):
+    '''Shut down the shared executor. A later call creates a new one.'''
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait)
+            _executor = None
+
+def submit(fn, *args):
+    '''Call fn(*args) in the shared executor.'''
+    return executor().submit(fn, *args)
+
+def read_corpus_from_file(*args):
+    return submit(readCorpusFromFile, *args)
+
+def basic_rule_covers(*args):
+    return submit(basicRuleCovers, *args)
+
+def cumulative_ordering(*args):
+    return submit(cumulativeOrdering, *args)
+
+def hr_apriori(*args):
+    return submit(hrApriori, *args)
+
+def hp_apriori(*args):
+    return submit(hpApriori, *args)
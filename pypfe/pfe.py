@@ -67,6 +67,13 @@ except AttributeError:
     _newclass = 0
 
 
+try:
+    import weakref
+    weakref_proxy = weakref.proxy
+except:
+    weakref_proxy = lambda x: x
+
+
 class SwigPyIterator(_object):
     __swig_setmethods__ = {}
     __setattr__ = lambda self, name, value: _swig_setattr(self, SwigPyIterator, name, value)
@@ -253,6 +260,17 @@ ERR_COULD_NOT_READ_FILE = _pypfe.ERR_COULD_NOT_READ_FILE
 ERR_COULD_NOT_WRITE_FILE = _pypfe.ERR_COULD_NOT_WRITE_FILE
 ERR_TRESHOLD_INSANE = _pypfe.ERR_TRESHOLD_INSANE
 ERR_DOCUMENT_NOT_FOUND = _pypfe.ERR_DOCUMENT_NOT_FOUND
+ERR_ATTRIBUTE_NOT_FOUND = _pypfe.ERR_ATTRIBUTE_NOT_FOUND
+ERR_INVALID_BINARY_CORPUS = _pypfe.ERR_INVALID_BINARY_CORPUS
+ERR_INVALID_CORPUS_INDEX = _pypfe.ERR_INVALID_CORPUS_INDEX
+ERR_UNKNOWN_COMPRESSION = _pypfe.ERR_UNKNOWN_COMPRESSION
+ERR_COMPRESSED_FILE = _pypfe.ERR_COMPRESSED_FILE
+ERR_INVALID_RULE_CACHE = _pypfe.ERR_INVALID_RULE_CACHE
+ERR_UNORDERED_DOC_ID = _pypfe.ERR_UNORDERED_DOC_ID
+ERR_MISMATCHING_OFFSETS = _pypfe.ERR_MISMATCHING_OFFSETS
+ERR_UNSUPPORTED_METRIC = _pypfe.ERR_UNSUPPORTED_METRIC
+ERR_INVALID_APRIORI_CHECKPOINT = _pypfe.ERR_INVALID_APRIORI_CHECKPOINT
+ERR_CANDIDATE_SPILL = _pypfe.ERR_CANDIDATE_SPILL
 PFE_VERSION_MAJOR = _pypfe.PFE_VERSION_MAJOR
 PFE_VERSION_MINOR = _pypfe.PFE_VERSION_MINOR
 class CoverMetrics(_object):
@@ -360,6 +378,37 @@ class BitsetDocCover(DocCover):
 BitsetDocCover_swigregister = _pypfe.BitsetDocCover_swigregister
 BitsetDocCover_swigregister(BitsetDocCover)
 
+ROARING_ARRAY_LIMIT = _pypfe.ROARING_ARRAY_LIMIT
+class RoaringDocCover(DocCover):
+    __swig_setmethods__ = {}
+    for _s in [DocCover]: __swig_setmethods__.update(getattr(_s,'__swig_setmethods__',{}))
+    __setattr__ = lambda self, name, value: _swig_setattr(self, RoaringDocCover, name, value)
+    __swig_getmethods__ = {}
+    for _s in [DocCover]: __swig_getmethods__.update(getattr(_s,'__swig_getmethods__',{}))
+    __getattr__ = lambda self, name: _swig_getattr(self, RoaringDocCover, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_RoaringDocCover(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def indices(self): return _pypfe.RoaringDocCover_indices(self)
+    def metrics(self, *args): return _pypfe.RoaringDocCover_metrics(self, *args)
+    def size(self): return _pypfe.RoaringDocCover_size(self)
+    def __eq__(self, *args): return _pypfe.RoaringDocCover___eq__(self, *args)
+    def __ne__(self, *args): return _pypfe.RoaringDocCover___ne__(self, *args)
+    def __iand__(self, *args): return _pypfe.RoaringDocCover___iand__(self, *args)
+    def __ior__(self, *args): return _pypfe.RoaringDocCover___ior__(self, *args)
+    def __isub__(self, *args): return _pypfe.RoaringDocCover___isub__(self, *args)
+    def __ixor__(self, *args): return _pypfe.RoaringDocCover___ixor__(self, *args)
+    def __and__(self, *args): return _pypfe.RoaringDocCover___and__(self, *args)
+    def __or__(self, *args): return _pypfe.RoaringDocCover___or__(self, *args)
+    def __sub__(self, *args): return _pypfe.RoaringDocCover___sub__(self, *args)
+    def __xor__(self, *args): return _pypfe.RoaringDocCover___xor__(self, *args)
+    __swig_destroy__ = _pypfe.delete_RoaringDocCover
+    __del__ = lambda self : None;
+RoaringDocCover_swigregister = _pypfe.RoaringDocCover_swigregister
+RoaringDocCover_swigregister(RoaringDocCover)
+
 
 def asLvFromOc(*args):
   return _pypfe.asLvFromOc(*args)
@@ -401,10 +450,91 @@ def asOrderedCover(*args):
   return _pypfe.asOrderedCover(*args)
 asOrderedCover = _pypfe.asOrderedCover
 
+def asRoaringCover(*args):
+  return _pypfe.asRoaringCover(*args)
+asRoaringCover = _pypfe.asRoaringCover
+
 def cumulativeOrdering(*args):
   return _pypfe.cumulativeOrdering(*args)
 cumulativeOrdering = _pypfe.cumulativeOrdering
 
+class Vocabulary(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, Vocabulary, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, Vocabulary, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_Vocabulary(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def add(self, *args): return _pypfe.Vocabulary_add(self, *args)
+    def id(self, *args): return _pypfe.Vocabulary_id(self, *args)
+    def attribute(self, *args): return _pypfe.Vocabulary_attribute(self, *args)
+    def contains(self, *args): return _pypfe.Vocabulary_contains(self, *args)
+    def attributes(self): return _pypfe.Vocabulary_attributes(self)
+    def size(self): return _pypfe.Vocabulary_size(self)
+    __swig_destroy__ = _pypfe.delete_Vocabulary
+    __del__ = lambda self : None;
+Vocabulary_swigregister = _pypfe.Vocabulary_swigregister
+Vocabulary_swigregister(Vocabulary)
+
+class PostingCover(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, PostingCover, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, PostingCover, name)
+    __repr__ = _swig_repr
+    def __init__(self): 
+        this = _pypfe.new_PostingCover()
+        try: self.this.append(this)
+        except: self.this = this
+    def addDocCover(self, *args): return _pypfe.PostingCover_addDocCover(self, *args)
+    def docIds(self): return _pypfe.PostingCover_docIds(self)
+    def docCover(self, *args): return _pypfe.PostingCover_docCover(self, *args)
+    def map(self): return _pypfe.PostingCover_map(self)
+    def size(self): return _pypfe.PostingCover_size(self)
+    def numDocs(self): return _pypfe.PostingCover_numDocs(self)
+    def byteSize(self): return _pypfe.PostingCover_byteSize(self)
+    def metrics(self, *args): return _pypfe.PostingCover_metrics(self, *args)
+    def __eq__(self, *args): return _pypfe.PostingCover___eq__(self, *args)
+    def __ne__(self, *args): return _pypfe.PostingCover___ne__(self, *args)
+    def __iand__(self, *args): return _pypfe.PostingCover___iand__(self, *args)
+    def __ior__(self, *args): return _pypfe.PostingCover___ior__(self, *args)
+    def __isub__(self, *args): return _pypfe.PostingCover___isub__(self, *args)
+    def __ixor__(self, *args): return _pypfe.PostingCover___ixor__(self, *args)
+    def __and__(self, *args): return _pypfe.PostingCover___and__(self, *args)
+    def __or__(self, *args): return _pypfe.PostingCover___or__(self, *args)
+    def __sub__(self, *args): return _pypfe.PostingCover___sub__(self, *args)
+    def __xor__(self, *args): return _pypfe.PostingCover___xor__(self, *args)
+    __swig_destroy__ = _pypfe.delete_PostingCover
+    __del__ = lambda self : None;
+PostingCover_swigregister = _pypfe.PostingCover_swigregister
+PostingCover_swigregister(PostingCover)
+
+
+def encodeCover(*args):
+  return _pypfe.encodeCover(*args)
+encodeCover = _pypfe.encodeCover
+
+def decodeCover(*args):
+  return _pypfe.decodeCover(*args)
+decodeCover = _pypfe.decodeCover
+
+COMPRESSION_NONE = _pypfe.COMPRESSION_NONE
+COMPRESSION_GZIP = _pypfe.COMPRESSION_GZIP
+COMPRESSION_BZIP2 = _pypfe.COMPRESSION_BZIP2
+COMPRESSION_XZ = _pypfe.COMPRESSION_XZ
+COMPRESSION_ZSTD = _pypfe.COMPRESSION_ZSTD
+
+def detectCompression(*args):
+  return _pypfe.detectCompression(*args)
+detectCompression = _pypfe.detectCompression
+
+def compressionFromExtension(*args):
+  return _pypfe.compressionFromExtension(*args)
+compressionFromExtension = _pypfe.compressionFromExtension
+
 def fullOrderedDocCoverFromDoc(*args):
   return _pypfe.fullOrderedDocCoverFromDoc(*args)
 fullOrderedDocCoverFromDoc = _pypfe.fullOrderedDocCoverFromDoc
@@ -413,6 +543,22 @@ def fullOrderedCoverFromCorpus(*args):
   return _pypfe.fullOrderedCoverFromCorpus(*args)
 fullOrderedCoverFromCorpus = _pypfe.fullOrderedCoverFromCorpus
 
+def encodeDocument(*args):
+  return _pypfe.encodeDocument(*args)
+encodeDocument = _pypfe.encodeDocument
+
+def encodeCorpus(*args):
+  return _pypfe.encodeCorpus(*args)
+encodeCorpus = _pypfe.encodeCorpus
+
+def decodeDocument(*args):
+  return _pypfe.decodeDocument(*args)
+decodeDocument = _pypfe.decodeDocument
+
+def decodeCorpus(*args):
+  return _pypfe.decodeCorpus(*args)
+decodeCorpus = _pypfe.decodeCorpus
+
 def readDocFromStr(*args):
   return _pypfe.readDocFromStr(*args)
 readDocFromStr = _pypfe.readDocFromStr
@@ -433,10 +579,218 @@ def writeCorpusToFile(*args):
   return _pypfe.writeCorpusToFile(*args)
 writeCorpusToFile = _pypfe.writeCorpusToFile
 
+class CorpusReader(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, CorpusReader, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, CorpusReader, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_CorpusReader(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def next(self): return _pypfe.CorpusReader_next(self)
+    def name(self): return _pypfe.CorpusReader_name(self)
+    def document(self): return _pypfe.CorpusReader_document(self)
+    def __iter__(self):
+        while self.next():
+            yield self.name(), Document(self.document())
+    __swig_destroy__ = _pypfe.delete_CorpusReader
+    __del__ = lambda self : None;
+CorpusReader_swigregister = _pypfe.CorpusReader_swigregister
+CorpusReader_swigregister(CorpusReader)
+
 def corpusSample(*args):
   return _pypfe.corpusSample(*args)
 corpusSample = _pypfe.corpusSample
 
+BINARY_CORPUS_MAGIC = _pypfe.BINARY_CORPUS_MAGIC
+BINARY_CORPUS_VERSION = _pypfe.BINARY_CORPUS_VERSION
+class BinaryDocument(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, BinaryDocument, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, BinaryDocument, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_BinaryDocument(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def size(self): return _pypfe.BinaryDocument_size(self)
+    def idDocument(self): return _pypfe.BinaryDocument_idDocument(self)
+    __swig_destroy__ = _pypfe.delete_BinaryDocument
+    __del__ = lambda self : None;
+BinaryDocument_swigregister = _pypfe.BinaryDocument_swigregister
+BinaryDocument_swigregister(BinaryDocument)
+
+class BinaryCorpus(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, BinaryCorpus, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, BinaryCorpus, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_BinaryCorpus(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def size(self): return _pypfe.BinaryCorpus_size(self)
+    def numStrings(self): return _pypfe.BinaryCorpus_numStrings(self)
+    def string(self, *args): return _pypfe.BinaryCorpus_string(self, *args)
+    def name(self, *args): return _pypfe.BinaryCorpus_name(self, *args)
+    def names(self): return _pypfe.BinaryCorpus_names(self)
+    def document(self, *args): return _pypfe.BinaryCorpus_document(self, *args)
+    def vocabulary(self): return _pypfe.BinaryCorpus_vocabulary(self)
+    def idCorpus(self): return _pypfe.BinaryCorpus_idCorpus(self)
+    def corpus(self): return _pypfe.BinaryCorpus_corpus(self)
+    __swig_destroy__ = _pypfe.delete_BinaryCorpus
+    __del__ = lambda self : None;
+BinaryCorpus_swigregister = _pypfe.BinaryCorpus_swigregister
+BinaryCorpus_swigregister(BinaryCorpus)
+
+def isBinaryCorpusFile(*args):
+  return _pypfe.isBinaryCorpusFile(*args)
+isBinaryCorpusFile = _pypfe.isBinaryCorpusFile
+
+def writeBinaryCorpus(*args):
+  return _pypfe.writeBinaryCorpus(*args)
+writeBinaryCorpus = _pypfe.writeBinaryCorpus
+
+def compileCorpus(*args):
+  return _pypfe.compileCorpus(*args)
+compileCorpus = _pypfe.compileCorpus
+
+class CorpusIndexEntry(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, CorpusIndexEntry, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, CorpusIndexEntry, name)
+    __repr__ = _swig_repr
+    __swig_setmethods__["name"] = _pypfe.CorpusIndexEntry_name_set
+    __swig_getmethods__["name"] = _pypfe.CorpusIndexEntry_name_get
+    if _newclass:name = _swig_property(_pypfe.CorpusIndexEntry_name_get, _pypfe.CorpusIndexEntry_name_set)
+    __swig_setmethods__["offset"] = _pypfe.CorpusIndexEntry_offset_set
+    __swig_getmethods__["offset"] = _pypfe.CorpusIndexEntry_offset_get
+    if _newclass:offset = _swig_property(_pypfe.CorpusIndexEntry_offset_get, _pypfe.CorpusIndexEntry_offset_set)
+    __swig_setmethods__["length"] = _pypfe.CorpusIndexEntry_length_set
+    __swig_getmethods__["length"] = _pypfe.CorpusIndexEntry_length_get
+    if _newclass:length = _swig_property(_pypfe.CorpusIndexEntry_length_get, _pypfe.CorpusIndexEntry_length_set)
+    def __init__(self): 
+        this = _pypfe.new_CorpusIndexEntry()
+        try: self.this.append(this)
+        except: self.this = this
+    __swig_destroy__ = _pypfe.delete_CorpusIndexEntry
+    __del__ = lambda self : None;
+CorpusIndexEntry_swigregister = _pypfe.CorpusIndexEntry_swigregister
+CorpusIndexEntry_swigregister(CorpusIndexEntry)
+
+class CorpusIndex(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, CorpusIndex, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, CorpusIndex, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_CorpusIndex(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def save(self): return _pypfe.CorpusIndex_save(self)
+    def corpusFilename(self): return _pypfe.CorpusIndex_corpusFilename(self)
+    def indexFilename(self): return _pypfe.CorpusIndex_indexFilename(self)
+    def size(self): return _pypfe.CorpusIndex_size(self)
+    def contains(self, *args): return _pypfe.CorpusIndex_contains(self, *args)
+    def entry(self, *args): return _pypfe.CorpusIndex_entry(self, *args)
+    def names(self): return _pypfe.CorpusIndex_names(self)
+    __swig_destroy__ = _pypfe.delete_CorpusIndex
+    __del__ = lambda self : None;
+CorpusIndex_swigregister = _pypfe.CorpusIndex_swigregister
+CorpusIndex_swigregister(CorpusIndex)
+
+class DocumentOffsets(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, DocumentOffsets, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, DocumentOffsets, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_DocumentOffsets(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def addDocument(self, *args): return _pypfe.DocumentOffsets_addDocument(self, *args)
+    def size(self): return _pypfe.DocumentOffsets_size(self)
+    def corpusSize(self): return _pypfe.DocumentOffsets_corpusSize(self)
+    def id(self, *args): return _pypfe.DocumentOffsets_id(self, *args)
+    def name(self, *args): return _pypfe.DocumentOffsets_name(self, *args)
+    def offset(self, *args): return _pypfe.DocumentOffsets_offset(self, *args)
+    def docSize(self, *args): return _pypfe.DocumentOffsets_docSize(self, *args)
+    def names(self): return _pypfe.DocumentOffsets_names(self)
+    def __eq__(self, *args): return _pypfe.DocumentOffsets___eq__(self, *args)
+    __swig_destroy__ = _pypfe.delete_DocumentOffsets
+    __del__ = lambda self : None;
+DocumentOffsets_swigregister = _pypfe.DocumentOffsets_swigregister
+DocumentOffsets_swigregister(DocumentOffsets)
+
+class FlatCover(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, FlatCover, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, FlatCover, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_FlatCover(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def offsets(self): return _pypfe.FlatCover_offsets(self)
+    def names(self): return _pypfe.FlatCover_names(self)
+    def docCover(self, *args): return _pypfe.FlatCover_docCover(self, *args)
+    def orderedCover(self): return _pypfe.FlatCover_orderedCover(self)
+    def size(self): return _pypfe.FlatCover_size(self)
+    def numDocs(self): return _pypfe.FlatCover_numDocs(self)
+    def metrics(self, *args): return _pypfe.FlatCover_metrics(self, *args)
+    def documentMetrics(self, *args): return _pypfe.FlatCover_documentMetrics(self, *args)
+    def __eq__(self, *args): return _pypfe.FlatCover___eq__(self, *args)
+    def __ne__(self, *args): return _pypfe.FlatCover___ne__(self, *args)
+    def __iand__(self, *args): return _pypfe.FlatCover___iand__(self, *args)
+    def __ior__(self, *args): return _pypfe.FlatCover___ior__(self, *args)
+    def __isub__(self, *args): return _pypfe.FlatCover___isub__(self, *args)
+    def __ixor__(self, *args): return _pypfe.FlatCover___ixor__(self, *args)
+    def __and__(self, *args): return _pypfe.FlatCover___and__(self, *args)
+    def __or__(self, *args): return _pypfe.FlatCover___or__(self, *args)
+    def __sub__(self, *args): return _pypfe.FlatCover___sub__(self, *args)
+    def __xor__(self, *args): return _pypfe.FlatCover___xor__(self, *args)
+    __swig_destroy__ = _pypfe.delete_FlatCover
+    __del__ = lambda self : None;
+FlatCover_swigregister = _pypfe.FlatCover_swigregister
+FlatCover_swigregister(FlatCover)
+
+
+def corpusOffsets(*args):
+  return _pypfe.corpusOffsets(*args)
+corpusOffsets = _pypfe.corpusOffsets
+
+def encodeRule(*args):
+  return _pypfe.encodeRule(*args)
+encodeRule = _pypfe.encodeRule
+
+def decodeRule(*args):
+  return _pypfe.decodeRule(*args)
+decodeRule = _pypfe.decodeRule
+
+def encodeConjunctions(*args):
+  return _pypfe.encodeConjunctions(*args)
+encodeConjunctions = _pypfe.encodeConjunctions
+
+def decodeConjunctions(*args):
+  return _pypfe.decodeConjunctions(*args)
+decodeConjunctions = _pypfe.decodeConjunctions
+
+def encodeRuleCovers(*args):
+  return _pypfe.encodeRuleCovers(*args)
+encodeRuleCovers = _pypfe.encodeRuleCovers
+
+def decodeRuleCovers(*args):
+  return _pypfe.decodeRuleCovers(*args)
+decodeRuleCovers = _pypfe.decodeRuleCovers
+
 def docBasicRuleCovers(*args):
   return _pypfe.docBasicRuleCovers(*args)
 docBasicRuleCovers = _pypfe.docBasicRuleCovers
@@ -445,6 +799,10 @@ def basicRuleCovers(*args):
   return _pypfe.basicRuleCovers(*args)
 basicRuleCovers = _pypfe.basicRuleCovers
 
+def basicPostingCovers(*args):
+  return _pypfe.basicPostingCovers(*args)
+basicPostingCovers = _pypfe.basicPostingCovers
+
 def docFullConjunctions(*args):
   return _pypfe.docFullConjunctions(*args)
 docFullConjunctions = _pypfe.docFullConjunctions
@@ -461,6 +819,14 @@ def corpusRuleCount(*args):
   return _pypfe.corpusRuleCount(*args)
 corpusRuleCount = _pypfe.corpusRuleCount
 
+RULE_COVERS = _pypfe.RULE_COVERS
+RULE_COUNTS = _pypfe.RULE_COUNTS
+FULL_CONJUNCTIONS = _pypfe.FULL_CONJUNCTIONS
+ALL_RULE_STATISTICS = _pypfe.ALL_RULE_STATISTICS
+def extractRuleStatistics(*args):
+  return _pypfe.extractRuleStatistics(*args)
+extractRuleStatistics = _pypfe.extractRuleStatistics
+
 def conjunctionPairs(*args):
   return _pypfe.conjunctionPairs(*args)
 conjunctionPairs = _pypfe.conjunctionPairs
@@ -473,14 +839,125 @@ def conjunctionCover(*args):
   return _pypfe.conjunctionCover(*args)
 conjunctionCover = _pypfe.conjunctionCover
 
+def asRoaringRuleCovers(*args):
+  return _pypfe.asRoaringRuleCovers(*args)
+asRoaringRuleCovers = _pypfe.asRoaringRuleCovers
+
+def asFlatRuleCovers(*args):
+  return _pypfe.asFlatRuleCovers(*args)
+asFlatRuleCovers = _pypfe.asFlatRuleCovers
+
 def reorderRecall(*args):
   return _pypfe.reorderRecall(*args)
 reorderRecall = _pypfe.reorderRecall
 
+RULE_COVER_CACHE_MAGIC = _pypfe.RULE_COVER_CACHE_MAGIC
+RULE_COVER_CACHE_VERSION = _pypfe.RULE_COVER_CACHE_VERSION
+def hashFile(*args):
+  return _pypfe.hashFile(*args)
+hashFile = _pypfe.hashFile
+
+def writeRuleCovers(*args):
+  return _pypfe.writeRuleCovers(*args)
+writeRuleCovers = _pypfe.writeRuleCovers
+
+def readRuleCovers(*args):
+  return _pypfe.readRuleCovers(*args)
+readRuleCovers = _pypfe.readRuleCovers
+
+def cachedBasicRuleCovers(*args):
+  return _pypfe.cachedBasicRuleCovers(*args)
+cachedBasicRuleCovers = _pypfe.cachedBasicRuleCovers
+
+class LevelStats(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, LevelStats, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, LevelStats, name)
+    __repr__ = _swig_repr
+    __swig_setmethods__["level"] = _pypfe.LevelStats_level_set
+    __swig_getmethods__["level"] = _pypfe.LevelStats_level_get
+    if _newclass:level = _swig_property(_pypfe.LevelStats_level_get, _pypfe.LevelStats_level_set)
+    __swig_setmethods__["numCandidates"] = _pypfe.LevelStats_numCandidates_set
+    __swig_getmethods__["numCandidates"] = _pypfe.LevelStats_numCandidates_get
+    if _newclass:numCandidates = _swig_property(_pypfe.LevelStats_numCandidates_get, _pypfe.LevelStats_numCandidates_set)
+    __swig_setmethods__["numFrequent"] = _pypfe.LevelStats_numFrequent_set
+    __swig_getmethods__["numFrequent"] = _pypfe.LevelStats_numFrequent_get
+    if _newclass:numFrequent = _swig_property(_pypfe.LevelStats_numFrequent_get, _pypfe.LevelStats_numFrequent_set)
+    __swig_setmethods__["evaluateTime"] = _pypfe.LevelStats_evaluateTime_set
+    __swig_getmethods__["evaluateTime"] = _pypfe.LevelStats_evaluateTime_get
+    if _newclass:evaluateTime = _swig_property(_pypfe.LevelStats_evaluateTime_get, _pypfe.LevelStats_evaluateTime_set)
+    __swig_setmethods__["candidateTime"] = _pypfe.LevelStats_candidateTime_set
+    __swig_getmethods__["candidateTime"] = _pypfe.LevelStats_candidateTime_get
+    if _newclass:candidateTime = _swig_property(_pypfe.LevelStats_candidateTime_get, _pypfe.LevelStats_candidateTime_set)
+    __swig_setmethods__["numSpilledRuns"] = _pypfe.LevelStats_numSpilledRuns_set
+    __swig_getmethods__["numSpilledRuns"] = _pypfe.LevelStats_numSpilledRuns_get
+    if _newclass:numSpilledRuns = _swig_property(_pypfe.LevelStats_numSpilledRuns_get, _pypfe.LevelStats_numSpilledRuns_set)
+    __swig_setmethods__["threadBusyTime"] = _pypfe.LevelStats_threadBusyTime_set
+    __swig_getmethods__["threadBusyTime"] = _pypfe.LevelStats_threadBusyTime_get
+    if _newclass:threadBusyTime = _swig_property(_pypfe.LevelStats_threadBusyTime_get, _pypfe.LevelStats_threadBusyTime_set)
+    __swig_setmethods__["peakCacheSize"] = _pypfe.LevelStats_peakCacheSize_set
+    __swig_getmethods__["peakCacheSize"] = _pypfe.LevelStats_peakCacheSize_get
+    if _newclass:peakCacheSize = _swig_property(_pypfe.LevelStats_peakCacheSize_get, _pypfe.LevelStats_peakCacheSize_set)
+    def __init__(self): 
+        this = _pypfe.new_LevelStats()
+        try: self.this.append(this)
+        except: self.this = this
+    __swig_destroy__ = _pypfe.delete_LevelStats
+    __del__ = lambda self : None;
+LevelStats_swigregister = _pypfe.LevelStats_swigregister
+LevelStats_swigregister(LevelStats)
+
+class MiningMonitor(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, MiningMonitor, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, MiningMonitor, name)
+    __repr__ = _swig_repr
+    __swig_destroy__ = _pypfe.delete_MiningMonitor
+    __del__ = lambda self : None;
+    def onLevel(self, *args): return _pypfe.MiningMonitor_onLevel(self, *args)
+    def __init__(self): 
+        if self.__class__ == MiningMonitor:
+            _self = None
+        else:
+            _self = self
+        this = _pypfe.new_MiningMonitor(_self, )
+        try: self.this.append(this)
+        except: self.this = this
+    def __disown__(self):
+        self.this.disown()
+        _pypfe.disown_MiningMonitor(self)
+        return weakref_proxy(self)
+MiningMonitor_swigregister = _pypfe.MiningMonitor_swigregister
+MiningMonitor_swigregister(MiningMonitor)
+
+
+def setMiningVerbose(*args):
+  return _pypfe.setMiningVerbose(*args)
+setMiningVerbose = _pypfe.setMiningVerbose
+
+def miningVerbose():
+  return _pypfe.miningVerbose()
+miningVerbose = _pypfe.miningVerbose
+
+def wallTime():
+  return _pypfe.wallTime()
+wallTime = _pypfe.wallTime
+APRIORI_CACHE_SIZE = _pypfe.APRIORI_CACHE_SIZE
+APRIORI_MAX_MEMORY = _pypfe.APRIORI_MAX_MEMORY
 def hrApriori(*args):
   return _pypfe.hrApriori(*args)
 hrApriori = _pypfe.hrApriori
 
+def hrEclat(*args):
+  return _pypfe.hrEclat(*args)
+hrEclat = _pypfe.hrEclat
+
+def topConjunctions(*args):
+  return _pypfe.topConjunctions(*args)
+topConjunctions = _pypfe.topConjunctions
+
 def hpApriori(*args):
   return _pypfe.hpApriori(*args)
 hpApriori = _pypfe.hpApriori
@@ -961,6 +1438,7 @@ class OrderedCover(_object):
         try: self.this.append(this)
         except: self.this = this
     def map(self): return _pypfe.OrderedCover_map(self)
+    def swap(self, *args): return _pypfe.OrderedCover_swap(self, *args)
     def addDocCover(self, *args): return _pypfe.OrderedCover_addDocCover(self, *args)
     def names(self): return _pypfe.OrderedCover_names(self)
     def docCover(self, *args): return _pypfe.OrderedCover_docCover(self, *args)
@@ -994,6 +1472,7 @@ class BitsetCover(_object):
         try: self.this.append(this)
         except: self.this = this
     def map(self): return _pypfe.BitsetCover_map(self)
+    def swap(self, *args): return _pypfe.BitsetCover_swap(self, *args)
     def addDocCover(self, *args): return _pypfe.BitsetCover_addDocCover(self, *args)
     def names(self): return _pypfe.BitsetCover_names(self)
     def docCover(self, *args): return _pypfe.BitsetCover_docCover(self, *args)
@@ -1016,6 +1495,40 @@ class BitsetCover(_object):
 BitsetCover_swigregister = _pypfe.BitsetCover_swigregister
 BitsetCover_swigregister(BitsetCover)
 
+class RoaringCover(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, RoaringCover, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, RoaringCover, name)
+    __repr__ = _swig_repr
+    def __init__(self, *args): 
+        this = _pypfe.new_RoaringCover(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def map(self): return _pypfe.RoaringCover_map(self)
+    def swap(self, *args): return _pypfe.RoaringCover_swap(self, *args)
+    def addDocCover(self, *args): return _pypfe.RoaringCover_addDocCover(self, *args)
+    def names(self): return _pypfe.RoaringCover_names(self)
+    def docCover(self, *args): return _pypfe.RoaringCover_docCover(self, *args)
+    def size(self): return _pypfe.RoaringCover_size(self)
+    def sample(self, *args): return _pypfe.RoaringCover_sample(self, *args)
+    def metrics(self, *args): return _pypfe.RoaringCover_metrics(self, *args)
+    def documentMetrics(self, *args): return _pypfe.RoaringCover_documentMetrics(self, *args)
+    def __eq__(self, *args): return _pypfe.RoaringCover___eq__(self, *args)
+    def __ne__(self, *args): return _pypfe.RoaringCover___ne__(self, *args)
+    def __iand__(self, *args): return _pypfe.RoaringCover___iand__(self, *args)
+    def __ior__(self, *args): return _pypfe.RoaringCover___ior__(self, *args)
+    def __isub__(self, *args): return _pypfe.RoaringCover___isub__(self, *args)
+    def __ixor__(self, *args): return _pypfe.RoaringCover___ixor__(self, *args)
+    def __and__(self, *args): return _pypfe.RoaringCover___and__(self, *args)
+    def __or__(self, *args): return _pypfe.RoaringCover___or__(self, *args)
+    def __sub__(self, *args): return _pypfe.RoaringCover___sub__(self, *args)
+    def __xor__(self, *args): return _pypfe.RoaringCover___xor__(self, *args)
+    __swig_destroy__ = _pypfe.delete_RoaringCover
+    __del__ = lambda self : None;
+RoaringCover_swigregister = _pypfe.RoaringCover_swigregister
+RoaringCover_swigregister(RoaringCover)
+
 class Conjunction(_object):
     __swig_setmethods__ = {}
     __setattr__ = lambda self, name, value: _swig_setattr(self, Conjunction, name, value)
@@ -1297,6 +1810,55 @@ class RuleOrderedCover(_object):
 RuleOrderedCover_swigregister = _pypfe.RuleOrderedCover_swigregister
 RuleOrderedCover_swigregister(RuleOrderedCover)
 
+class RulePostingCover(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, RulePostingCover, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, RulePostingCover, name)
+    __repr__ = _swig_repr
+    def iterator(self): return _pypfe.RulePostingCover_iterator(self)
+    def __iter__(self): return self.iterator()
+    def __nonzero__(self): return _pypfe.RulePostingCover___nonzero__(self)
+    def __bool__(self): return _pypfe.RulePostingCover___bool__(self)
+    def __len__(self): return _pypfe.RulePostingCover___len__(self)
+    def __iter__(self): return self.key_iterator()
+    def iterkeys(self): return self.key_iterator()
+    def itervalues(self): return self.value_iterator()
+    def iteritems(self): return self.iterator()
+    def __getitem__(self, *args): return _pypfe.RulePostingCover___getitem__(self, *args)
+    def __delitem__(self, *args): return _pypfe.RulePostingCover___delitem__(self, *args)
+    def has_key(self, *args): return _pypfe.RulePostingCover_has_key(self, *args)
+    def keys(self): return _pypfe.RulePostingCover_keys(self)
+    def values(self): return _pypfe.RulePostingCover_values(self)
+    def items(self): return _pypfe.RulePostingCover_items(self)
+    def __contains__(self, *args): return _pypfe.RulePostingCover___contains__(self, *args)
+    def key_iterator(self): return _pypfe.RulePostingCover_key_iterator(self)
+    def value_iterator(self): return _pypfe.RulePostingCover_value_iterator(self)
+    def __setitem__(self, *args): return _pypfe.RulePostingCover___setitem__(self, *args)
+    def asdict(self): return _pypfe.RulePostingCover_asdict(self)
+    def __init__(self, *args): 
+        this = _pypfe.new_RulePostingCover(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def empty(self): return _pypfe.RulePostingCover_empty(self)
+    def size(self): return _pypfe.RulePostingCover_size(self)
+    def clear(self): return _pypfe.RulePostingCover_clear(self)
+    def swap(self, *args): return _pypfe.RulePostingCover_swap(self, *args)
+    def get_allocator(self): return _pypfe.RulePostingCover_get_allocator(self)
+    def begin(self): return _pypfe.RulePostingCover_begin(self)
+    def end(self): return _pypfe.RulePostingCover_end(self)
+    def rbegin(self): return _pypfe.RulePostingCover_rbegin(self)
+    def rend(self): return _pypfe.RulePostingCover_rend(self)
+    def count(self, *args): return _pypfe.RulePostingCover_count(self, *args)
+    def erase(self, *args): return _pypfe.RulePostingCover_erase(self, *args)
+    def find(self, *args): return _pypfe.RulePostingCover_find(self, *args)
+    def lower_bound(self, *args): return _pypfe.RulePostingCover_lower_bound(self, *args)
+    def upper_bound(self, *args): return _pypfe.RulePostingCover_upper_bound(self, *args)
+    __swig_destroy__ = _pypfe.delete_RulePostingCover
+    __del__ = lambda self : None;
+RulePostingCover_swigregister = _pypfe.RulePostingCover_swigregister
+RulePostingCover_swigregister(RulePostingCover)
+
 class RuleBitsetCover(_object):
     __swig_setmethods__ = {}
     __setattr__ = lambda self, name, value: _swig_setattr(self, RuleBitsetCover, name, value)
@@ -1346,6 +1908,104 @@ class RuleBitsetCover(_object):
 RuleBitsetCover_swigregister = _pypfe.RuleBitsetCover_swigregister
 RuleBitsetCover_swigregister(RuleBitsetCover)
 
+class RuleRoaringCover(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, RuleRoaringCover, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, RuleRoaringCover, name)
+    __repr__ = _swig_repr
+    def iterator(self): return _pypfe.RuleRoaringCover_iterator(self)
+    def __iter__(self): return self.iterator()
+    def __nonzero__(self): return _pypfe.RuleRoaringCover___nonzero__(self)
+    def __bool__(self): return _pypfe.RuleRoaringCover___bool__(self)
+    def __len__(self): return _pypfe.RuleRoaringCover___len__(self)
+    def __iter__(self): return self.key_iterator()
+    def iterkeys(self): return self.key_iterator()
+    def itervalues(self): return self.value_iterator()
+    def iteritems(self): return self.iterator()
+    def __getitem__(self, *args): return _pypfe.RuleRoaringCover___getitem__(self, *args)
+    def __delitem__(self, *args): return _pypfe.RuleRoaringCover___delitem__(self, *args)
+    def has_key(self, *args): return _pypfe.RuleRoaringCover_has_key(self, *args)
+    def keys(self): return _pypfe.RuleRoaringCover_keys(self)
+    def values(self): return _pypfe.RuleRoaringCover_values(self)
+    def items(self): return _pypfe.RuleRoaringCover_items(self)
+    def __contains__(self, *args): return _pypfe.RuleRoaringCover___contains__(self, *args)
+    def key_iterator(self): return _pypfe.RuleRoaringCover_key_iterator(self)
+    def value_iterator(self): return _pypfe.RuleRoaringCover_value_iterator(self)
+    def __setitem__(self, *args): return _pypfe.RuleRoaringCover___setitem__(self, *args)
+    def asdict(self): return _pypfe.RuleRoaringCover_asdict(self)
+    def __init__(self, *args): 
+        this = _pypfe.new_RuleRoaringCover(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def empty(self): return _pypfe.RuleRoaringCover_empty(self)
+    def size(self): return _pypfe.RuleRoaringCover_size(self)
+    def clear(self): return _pypfe.RuleRoaringCover_clear(self)
+    def swap(self, *args): return _pypfe.RuleRoaringCover_swap(self, *args)
+    def get_allocator(self): return _pypfe.RuleRoaringCover_get_allocator(self)
+    def begin(self): return _pypfe.RuleRoaringCover_begin(self)
+    def end(self): return _pypfe.RuleRoaringCover_end(self)
+    def rbegin(self): return _pypfe.RuleRoaringCover_rbegin(self)
+    def rend(self): return _pypfe.RuleRoaringCover_rend(self)
+    def count(self, *args): return _pypfe.RuleRoaringCover_count(self, *args)
+    def erase(self, *args): return _pypfe.RuleRoaringCover_erase(self, *args)
+    def find(self, *args): return _pypfe.RuleRoaringCover_find(self, *args)
+    def lower_bound(self, *args): return _pypfe.RuleRoaringCover_lower_bound(self, *args)
+    def upper_bound(self, *args): return _pypfe.RuleRoaringCover_upper_bound(self, *args)
+    __swig_destroy__ = _pypfe.delete_RuleRoaringCover
+    __del__ = lambda self : None;
+RuleRoaringCover_swigregister = _pypfe.RuleRoaringCover_swigregister
+RuleRoaringCover_swigregister(RuleRoaringCover)
+
+class RuleFlatCover(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, RuleFlatCover, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, RuleFlatCover, name)
+    __repr__ = _swig_repr
+    def iterator(self): return _pypfe.RuleFlatCover_iterator(self)
+    def __iter__(self): return self.iterator()
+    def __nonzero__(self): return _pypfe.RuleFlatCover___nonzero__(self)
+    def __bool__(self): return _pypfe.RuleFlatCover___bool__(self)
+    def __len__(self): return _pypfe.RuleFlatCover___len__(self)
+    def __iter__(self): return self.key_iterator()
+    def iterkeys(self): return self.key_iterator()
+    def itervalues(self): return self.value_iterator()
+    def iteritems(self): return self.iterator()
+    def __getitem__(self, *args): return _pypfe.RuleFlatCover___getitem__(self, *args)
+    def __delitem__(self, *args): return _pypfe.RuleFlatCover___delitem__(self, *args)
+    def has_key(self, *args): return _pypfe.RuleFlatCover_has_key(self, *args)
+    def keys(self): return _pypfe.RuleFlatCover_keys(self)
+    def values(self): return _pypfe.RuleFlatCover_values(self)
+    def items(self): return _pypfe.RuleFlatCover_items(self)
+    def __contains__(self, *args): return _pypfe.RuleFlatCover___contains__(self, *args)
+    def key_iterator(self): return _pypfe.RuleFlatCover_key_iterator(self)
+    def value_iterator(self): return _pypfe.RuleFlatCover_value_iterator(self)
+    def __setitem__(self, *args): return _pypfe.RuleFlatCover___setitem__(self, *args)
+    def asdict(self): return _pypfe.RuleFlatCover_asdict(self)
+    def __init__(self, *args): 
+        this = _pypfe.new_RuleFlatCover(*args)
+        try: self.this.append(this)
+        except: self.this = this
+    def empty(self): return _pypfe.RuleFlatCover_empty(self)
+    def size(self): return _pypfe.RuleFlatCover_size(self)
+    def clear(self): return _pypfe.RuleFlatCover_clear(self)
+    def swap(self, *args): return _pypfe.RuleFlatCover_swap(self, *args)
+    def get_allocator(self): return _pypfe.RuleFlatCover_get_allocator(self)
+    def begin(self): return _pypfe.RuleFlatCover_begin(self)
+    def end(self): return _pypfe.RuleFlatCover_end(self)
+    def rbegin(self): return _pypfe.RuleFlatCover_rbegin(self)
+    def rend(self): return _pypfe.RuleFlatCover_rend(self)
+    def count(self, *args): return _pypfe.RuleFlatCover_count(self, *args)
+    def erase(self, *args): return _pypfe.RuleFlatCover_erase(self, *args)
+    def find(self, *args): return _pypfe.RuleFlatCover_find(self, *args)
+    def lower_bound(self, *args): return _pypfe.RuleFlatCover_lower_bound(self, *args)
+    def upper_bound(self, *args): return _pypfe.RuleFlatCover_upper_bound(self, *args)
+    __swig_destroy__ = _pypfe.delete_RuleFlatCover
+    __del__ = lambda self : None;
+RuleFlatCover_swigregister = _pypfe.RuleFlatCover_swigregister
+RuleFlatCover_swigregister(RuleFlatCover)
+
 class RuleCount(_object):
     __swig_setmethods__ = {}
     __setattr__ = lambda self, name, value: _swig_setattr(self, RuleCount, name, value)
@@ -1489,6 +2149,30 @@ class BitsetCoverVector(_object):
 BitsetCoverVector_swigregister = _pypfe.BitsetCoverVector_swigregister
 BitsetCoverVector_swigregister(BitsetCoverVector)
 
+class RuleStatistics(_object):
+    __swig_setmethods__ = {}
+    __setattr__ = lambda self, name, value: _swig_setattr(self, RuleStatistics, name, value)
+    __swig_getmethods__ = {}
+    __getattr__ = lambda self, name: _swig_getattr(self, RuleStatistics, name)
+    __repr__ = _swig_repr
+    __swig_setmethods__["covers"] = _pypfe.RuleStatistics_covers_set
+    __swig_getmethods__["covers"] = _pypfe.RuleStatistics_covers_get
+    if _newclass:covers = _swig_property(_pypfe.RuleStatistics_covers_get, _pypfe.RuleStatistics_covers_set)
+    __swig_setmethods__["counts"] = _pypfe.RuleStatistics_counts_set
+    __swig_getmethods__["counts"] = _pypfe.RuleStatistics_counts_get
+    if _newclass:counts = _swig_property(_pypfe.RuleStatistics_counts_get, _pypfe.RuleStatistics_counts_set)
+    __swig_setmethods__["conjunctions"] = _pypfe.RuleStatistics_conjunctions_set
+    __swig_getmethods__["conjunctions"] = _pypfe.RuleStatistics_conjunctions_get
+    if _newclass:conjunctions = _swig_property(_pypfe.RuleStatistics_conjunctions_get, _pypfe.RuleStatistics_conjunctions_set)
+    def __init__(self): 
+        this = _pypfe.new_RuleStatistics()
+        try: self.this.append(this)
+        except: self.this = this
+    __swig_destroy__ = _pypfe.delete_RuleStatistics
+    __del__ = lambda self : None;
+RuleStatistics_swigregister = _pypfe.RuleStatistics_swigregister
+RuleStatistics_swigregister(RuleStatistics)
+
 # This file is compatible with both classic and new-style classes.
 
 
@@ -16,120 +16,863 @@
 */
 
 #include <Apriori.hpp>
+#include <AprioriCheckpoint.hpp>
+#include <MiningMonitor.hpp>
+#include <ThreadPool.hpp>
 
+#include <cerrno>
+#include <cmath>
+#include <cstdio>
+#include <cstring>
+#include <functional>
+#include <limits>
+#include <queue>
 #include <set>
 
+#include <boost/noncopyable.hpp>
+#include <boost/scoped_ptr.hpp>
+#include <boost/shared_ptr.hpp>
 #include <boost/thread.hpp>
 #include <boost/thread/mutex.hpp>
 #include <boost/unordered_set.hpp>
-#include <boost/random/mersenne_twister.hpp>
-#include <boost/random/discrete_distribution.hpp>
+#include <boost/unordered_map.hpp>
 
 namespace pfe {
 
+////////////////////////////////////////////////////////////////////////////////
+// conjunction cover cache
+////////////////////////////////////////////////////////////////////////////////
+/// Maximum number of rule subsets looked up in the cache per candidate.
+#define APRIORI_CACHE_LOOKUPS 64
+
+/// Covers of the frequent conjunctions of one Apriori level. The total
+/// number of cached cover elements is bounded by maxSize, when the cache is
+/// full the largest covers are evicted first.
+template<class R, class T>
+class CoverCache {
+private:
+    typedef boost::unordered_map<std::vector<R>, T> _maptype;
+    _maptype _covers;
+    std::multimap<long, std::vector<R> > _bySize;
+    std::set<long> _lengths;
+    long _size;
+    long _peakSize;
+    long _maxSize;
+    boost::mutex _mutex;
+public:
+    explicit CoverCache(long const maxSize)
+    : _size(0), _peakSize(0), _maxSize(maxSize) {}
+
+    /// Add a cover, thread safe.
+    void add(std::vector<R> const& c, T const& cover) {
+        long const _cs = cover.size();
+        if (_cs > _maxSize) {
+            return;
+        }
+        boost::mutex::scoped_lock _lock(_mutex);
+        // make room by evicting larger covers
+        while (_size + _cs > _maxSize) {
+            auto _largest = _bySize.end();
+            --_largest;
+            if (_largest->first <= _cs) {
+                return;
+            }
+            _size -= _largest->first;
+            _covers.erase(_largest->second);
+            _bySize.erase(_largest);
+        }
+        if (_covers.insert(std::make_pair(c, cover)).second) {
+            _bySize.insert(std::make_pair(_cs, c));
+            _size += _cs;
+            _peakSize = std::max(_peakSize, _size);
+            _lengths.insert(c.size());
+        }
+    }
+
+    /// Find a cover, returns NULL if it is not cached.
+    T const* find(std::vector<R> const& c) const {
+        auto i = _covers.find(c);
+        if (i == _covers.end()) {
+            return NULL;
+        }
+        return &i->second;
+    }
+
+    void swap(CoverCache<R, T>& other) {
+        _covers.swap(other._covers);
+        _bySize.swap(other._bySize);
+        _lengths.swap(other._lengths);
+        std::swap(_size, other._size);
+        std::swap(_peakSize, other._peakSize);
+        std::swap(_maxSize, other._maxSize);
+    }
+
+    void clear() {
+        _covers.clear();
+        _bySize.clear();
+        _lengths.clear();
+        _size = 0;
+        _peakSize = 0;
+    }
+
+    /// Numbers of rules in the cached conjunctions.
+    std::set<long> const& lengths() const {
+        return _lengths;
+    }
+
+    long size() const {
+        return _size;
+    }
+
+    /// Largest size since the last clear.
+    long peakSize() const {
+        return _peakSize;
+    }
+
+    long numCovers() const {
+        return _covers.size();
+    }
+};
+
+/// Compute a conjunction cover from the smallest cached parent, that is a
+/// cached conjunction made of some of its rules, intersected with the basic
+/// covers of the remaining rules. Falls back to conjunctionCover if no
+/// parent is cached.
+template<class R, class T>
+T cachedConjunctionCover(std::vector<R> const& c,
+                         std::map<R, T> const& basicCovers,
+                         CoverCache<R, T> const& parents,
+                         long const minSize) {
+    long const _n = c.size();
+    long _k = 0;
+    T const* _parent = NULL;
+    std::vector<long> _idx, _best;
+    std::vector<R> _key;
+    // prefer the longest parents, they have the smallest covers
+    auto const& _lengths = parents.lengths();
+    for (auto k=_lengths.rbegin() ; k!=_lengths.rend() && !_parent ; ++k) {
+        _k = *k;
+        if (_k < 2 || _k >= _n) {
+            continue;
+        }
+        // enumerate the rule subsets of parent length
+        _key.resize(_k);
+        _idx.resize(_k);
+        for (long i=0 ; i<_k ; ++i) {
+            _idx[i] = i;
+        }
+        for (long l=0 ; l<APRIORI_CACHE_LOOKUPS ; ++l) {
+            for (long i=0 ; i<_k ; ++i) {
+                _key[i] = c[_idx[i]];
+            }
+            T const* _p = parents.find(_key);
+            if (_p != NULL &&
+                (_parent == NULL || _p->size() < _parent->size())) {
+                _parent = _p;
+                _best = _idx;
+            }
+            // advance to the next subset
+            long i = _k - 1;
+            while (i >= 0 && _idx[i] == _n - _k + i) {
+                --i;
+            }
+            if (i < 0) {
+                break;
+            }
+            ++_idx[i];
+            for (long j=i+1 ; j<_k ; ++j) {
+                _idx[j] = _idx[j-1] + 1;
+            }
+        }
+    }
+    if (_parent == NULL) {
+        return conjunctionCover(c, basicCovers, minSize);
+    }
+    // basic covers of the rules missing from the parent, smallest first
+    std::vector<std::pair<long, T const*> > _covers;
+    for (long i=0, b=0 ; i<_n ; ++i) {
+        if (b < _k && _best[b] == i) {
+            ++b;
+            continue;
+        }
+        auto j = basicCovers.find(c[i]);
+        if (j == basicCovers.end()) { // return empty cover
+            T _cov;
+            return _cov;
+        }
+        _covers.push_back(std::make_pair(static_cast<long>(j->second.size()),
+                                         &j->second));
+    }
+    std::sort(_covers.begin(), _covers.end(),
+              [](std::pair<long, T const*> const& a,
+                 std::pair<long, T const*> const& b) {
+        return a.first < b.first;
+    });
+    long const _minSize = std::max(minSize, 1L);
+    T _cov(*_parent);
+    for (auto i=_covers.begin() ; i!=_covers.end() ; ++i) {
+        _cov &= *i->second;
+        if (static_cast<long>(_cov.size()) < _minSize) {
+            T _empty;
+            return _empty;
+        }
+    }
+    return _cov;
+}
+
+/// Number of candidates evaluated by a worker at a time.
+#define APRIORI_CHUNK_SIZE 16
+
+/// Concatenate the per chunk results in chunk order, so that the result
+/// does not depend on thread scheduling.
+template<class R> std::vector<std::vector<R> >
+_concatChunks(std::vector<std::vector<std::vector<R> > > const& chunks) {
+    size_t N = 0;
+    for (auto i=chunks.begin() ; i!=chunks.end() ; ++i) {
+        N += i->size();
+    }
+    std::vector<std::vector<R> > _result;
+    _result.reserve(N);
+    for (auto i=chunks.begin() ; i!=chunks.end() ; ++i) {
+        _result.insert(_result.end(), i->begin(), i->end());
+    }
+    return _result;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// checkpoints
+////////////////////////////////////////////////////////////////////////////////
+/// Fingerprint of the arguments of a level-wise miner, see
+/// aprioriFingerprint. Returns 0 without checkpointDir.
+template<class R, class T>
+uint64_t _checkpointFingerprint(std::string const& checkpointDir,
+                                std::string const& miner,
+                                std::vector<std::vector<R> > const& initial,
+                                std::map<R, T> const& basicCovers,
+                                T const& trueCover,
+                                double const treshold) {
+    if (checkpointDir.empty()) {
+        return 0;
+    }
+    std::map<R, uint64_t> _hashes;
+    for (auto i=basicCovers.begin() ; i!=basicCovers.end() ; ++i) {
+        _hashes[i->first] = coverHash(i->second);
+    }
+    return aprioriFingerprint(miner, initial, _hashes, coverHash(trueCover),
+                              treshold);
+}
+
+/// Restore the state of a level-wise miner from the checkpoint in
+/// checkpointDir, if there is one for the fingerprint. Returns the first
+/// level still to be mined, its candidates are joined from the restored
+/// frequent conjunctions of the previous level. A checkpoint beyond limit
+/// is ignored.
+template<class R>
+long _resumeCheckpoint(std::string const& checkpointDir,
+                       uint64_t const fingerprint,
+                       long const limit,
+                       std::vector<std::vector<R> >& result,
+                       std::vector<std::vector<R> >& frequent)
+throw(std::runtime_error) {
+    AprioriCheckpoint<R> _checkpoint;
+    if (checkpointDir.empty() ||
+        !readAprioriCheckpoint(checkpointDir, fingerprint, _checkpoint)) {
+        return 1;
+    }
+    // the checkpoint went past the requested limit, its result is too large
+    if (limit > 0 && _checkpoint.level > limit) {
+        return 1;
+    }
+    miningLog("Resuming after level %ld with %lu frequent\n",
+              _checkpoint.level, _checkpoint.result.size());
+    result.swap(_checkpoint.result);
+    frequent.swap(_checkpoint.frequent);
+    return _checkpoint.level + 1;
+}
+
+/// Write the state of a level-wise miner after level, if checkpointDir is
+/// given. The candidates of the next level are streamed, so they are
+/// regenerated from the frequent conjunctions on resume.
+template<class R>
+void _saveCheckpoint(std::string const& checkpointDir,
+                     uint64_t const fingerprint,
+                     long const level,
+                     std::vector<std::vector<R> > const& result,
+                     std::vector<std::vector<R> > const& frequent)
+throw(std::runtime_error) {
+    if (checkpointDir.empty()) {
+        return;
+    }
+    AprioriCheckpoint<R> _checkpoint;
+    _checkpoint.level = level;
+    _checkpoint.result = result;
+    _checkpoint.frequent = frequent;
+    writeAprioriCheckpoint(checkpointDir, fingerprint, _checkpoint);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// candidate streams
+////////////////////////////////////////////////////////////////////////////////
+/// Maximum number of candidates evaluated together.
+#define APRIORI_BATCH_SIZE 65536
+/// Maximum number of spilled runs before they are merged.
+#define APRIORI_MERGE_WIDTH 16
+
+/// Approximate memory used by a rule, and by a conjunction in a hash set.
+inline long _ruleBytes(Rule const& r) {
+    return sizeof(Rule) + r.second.capacity();
+}
+
+inline long _ruleBytes(IdRule const& r) {
+    return sizeof(IdRule);
+}
+
+template<class R>
+long _conjunctionBytes(std::vector<R> const& c) {
+    long _bytes = sizeof(c) + 4 * sizeof(void*);
+    for (auto i=c.begin() ; i!=c.end() ; ++i) {
+        _bytes += _ruleBytes(*i);
+    }
+    return _bytes;
+}
+
+inline void _spillWrite(void const* data, size_t size, FILE* file) {
+    if (size > 0 && fwrite(data, size, 1, file) != 1) {
+        throw std::runtime_error(std::string(ERR_CANDIDATE_SPILL) +
+                                 strerror(errno));
+    }
+}
+
+inline void _spillRead(void* data, size_t size, FILE* file) {
+    if (size > 0 && fread(data, size, 1, file) != 1) {
+        throw std::runtime_error(std::string(ERR_CANDIDATE_SPILL) +
+                                 "truncated run");
+    }
+}
+
+inline void _spillRule(Rule const& r, FILE* file) {
+    int64_t const _pos = r.first;
+    uint64_t const _n = r.second.size();
+    _spillWrite(&_pos, sizeof(_pos), file);
+    _spillWrite(&_n, sizeof(_n), file);
+    _spillWrite(r.second.data(), _n, file);
+}
+
+inline void _spillRule(IdRule const& r, FILE* file) {
+    int64_t const _pos = r.first;
+    uint32_t const _id = r.second;
+    _spillWrite(&_pos, sizeof(_pos), file);
+    _spillWrite(&_id, sizeof(_id), file);
+}
+
+inline void _unspillRule(Rule& r, FILE* file) {
+    int64_t _pos;
+    uint64_t _n;
+    _spillRead(&_pos, sizeof(_pos), file);
+    _spillRead(&_n, sizeof(_n), file);
+    r.first = _pos;
+    r.second.resize(_n);
+    if (_n > 0) {
+        _spillRead(&r.second[0], _n, file);
+    }
+}
+
+inline void _unspillRule(IdRule& r, FILE* file) {
+    int64_t _pos;
+    uint32_t _id;
+    _spillRead(&_pos, sizeof(_pos), file);
+    _spillRead(&_id, sizeof(_id), file);
+    r.first = _pos;
+    r.second = _id;
+}
+
+/// Sorted run of conjunctions spilled to an anonymous temporary file.
+template<class R>
+class SpillRun : private boost::noncopyable {
+private:
+    FILE* _file;
+public:
+    SpillRun()
+    : _file(tmpfile()) {
+        if (_file == NULL) {
+            throw std::runtime_error(std::string(ERR_CANDIDATE_SPILL) +
+                                     strerror(errno));
+        }
+    }
+
+    ~SpillRun() {
+        fclose(_file);
+    }
+
+    void write(std::vector<R> const& c) {
+        uint64_t const _n = c.size();
+        _spillWrite(&_n, sizeof(_n), _file);
+        for (auto i=c.begin() ; i!=c.end() ; ++i) {
+            _spillRule(*i, _file);
+        }
+    }
+
+    /// Start reading the run from the beginning.
+    void rewind() {
+        if (fflush(_file) != 0 || fseek(_file, 0, SEEK_SET) != 0) {
+            throw std::runtime_error(std::string(ERR_CANDIDATE_SPILL) +
+                                     strerror(errno));
+        }
+    }
+
+    /// Read the next conjunction, returns false at the end of the run.
+    bool read(std::vector<R>& c) {
+        uint64_t _n;
+        if (fread(&_n, sizeof(_n), 1, _file) != 1) {
+            return false;
+        }
+        c.resize(_n);
+        for (auto i=c.begin() ; i!=c.end() ; ++i) {
+            _unspillRule(*i, _file);
+        }
+        return true;
+    }
+};
+
+/// Candidates of a level, produced in batches so that the whole level
+/// never has to be held in memory.
+template<class R>
+class CandidateStream : private boost::noncopyable {
+protected:
+    long _maxMemory;
+
+    /// Add a candidate to the batch, returns true if the batch is full.
+    bool _add(std::vector<std::vector<R> >& batch, std::vector<R> const& c,
+              long& bytes) const {
+        batch.push_back(c);
+        bytes += _conjunctionBytes(c);
+        return static_cast<long>(batch.size()) >= APRIORI_BATCH_SIZE ||
+               bytes >= _maxMemory;
+    }
+public:
+    explicit CandidateStream(long const maxMemory)
+    : _maxMemory(maxMemory) {}
+
+    virtual ~CandidateStream() {}
+
+    /// Replace batch by the next candidates, returns false if there are
+    /// none left.
+    virtual bool next(std::vector<std::vector<R> >& batch) = 0;
+
+    /// Number of sorted runs spilled to disk.
+    virtual long numSpilledRuns() const {
+        return 0;
+    }
+};
+
+/// Candidates given in advance.
+template<class R>
+class VectorCandidateStream : public CandidateStream<R> {
+private:
+    std::vector<std::vector<R> > const& _candidates;
+    size_t _next;
+public:
+    VectorCandidateStream(std::vector<std::vector<R> > const& candidates,
+                          long const maxMemory)
+    : CandidateStream<R>(maxMemory), _candidates(candidates), _next(0) {}
+
+    bool next(std::vector<std::vector<R> >& batch) {
+        batch.clear();
+        long _bytes = 0;
+        while (_next < _candidates.size()) {
+            if (this->_add(batch, _candidates[_next++], _bytes)) {
+                break;
+            }
+        }
+        return !batch.empty();
+    }
+};
+
+template<class R>
+bool _lengthOrder(std::vector<R> const& a, std::vector<R> const& b) {
+    if (a.size() != b.size()) {
+        return a.size() < b.size();
+    }
+    return a < b;
+}
+
+/// Apriori candidate generation: two frequent conjunctions of length k
+/// sharing the first k-1 rules are joined to a candidate of length k+1,
+/// which is kept only if all its subsets of length k are frequent.
+/// The candidates are unique by construction, so only the sorted frequent
+/// conjunctions are kept in memory.
+template<class R>
+class HrCandidateStream : public CandidateStream<R> {
+private:
+    std::vector<std::vector<R> > _sorted;
+    // next pair of frequent conjunctions to join
+    size_t _i;
+    size_t _j;
+    std::vector<R> _conjunction;
+    std::vector<R> _subset;
+
+    bool _frequent(std::vector<R> const& c) const {
+        return std::binary_search(_sorted.begin(), _sorted.end(), c,
+                                  _lengthOrder<R>);
+    }
+public:
+    HrCandidateStream(std::vector<std::vector<R> > const& conjunctions,
+                      long const maxMemory)
+    : CandidateStream<R>(maxMemory), _sorted(conjunctions), _i(0), _j(1) {
+        for (auto i=_sorted.begin() ; i!=_sorted.end() ; ++i) {
+            std::sort(i->begin(), i->end());
+            i->erase(std::unique(i->begin(), i->end()), i->end());
+        }
+        std::sort(_sorted.begin(), _sorted.end(), _lengthOrder<R>);
+        _sorted.erase(std::unique(_sorted.begin(), _sorted.end()),
+                      _sorted.end());
+    }
+
+    bool next(std::vector<std::vector<R> >& batch) {
+        batch.clear();
+        long _bytes = 0;
+        while (_i < _sorted.size()) {
+            std::vector<R> const& a = _sorted[_i];
+            // conjunctions sharing the prefix of a directly follow it
+            if (a.empty() || _j >= _sorted.size() ||
+                _sorted[_j].size() != a.size() ||
+                !std::equal(a.begin(), a.end()-1, _sorted[_j].begin())) {
+                ++_i;
+                _j = _i + 1;
+                continue;
+            }
+            long const k = a.size();
+            _conjunction = a;
+            _conjunction.push_back(_sorted[_j++].back());
+            // subsets without one of the last two rules are the parents
+            bool _prune = false;
+            for (long l=0 ; l<k-1 && !_prune ; ++l) {
+                _subset.clear();
+                _subset.insert(_subset.end(), _conjunction.begin(),
+                               _conjunction.begin()+l);
+                _subset.insert(_subset.end(), _conjunction.begin()+l+1,
+                               _conjunction.end());
+                _prune = !_frequent(_subset);
+            }
+            if (!_prune && this->_add(batch, _conjunction, _bytes)) {
+                break;
+            }
+        }
+        return !batch.empty();
+    }
+};
+
+/// High precision candidate generation: the rules of a frequent
+/// conjunction that are not in another one form a candidate.
+///
+/// Candidates are deduplicated in a hash set and streamed as soon as they
+/// are first seen. Once the set exceeds maxMemory it is spilled to disk as
+/// a sorted run, the first run holding exactly the candidates streamed so
+/// far. From then on the candidates are only collected into runs, and when
+/// all pairs are processed the runs are merged and the candidates missing
+/// from the first run are streamed.
+template<class R>
+class HpCandidateStream : public CandidateStream<R> {
+private:
+    typedef std::pair<std::vector<R>, long> _headtype;
+    typedef std::priority_queue<_headtype, std::vector<_headtype>,
+                                std::greater<_headtype> > _heaptype;
+
+    std::vector<std::vector<R> > _conjunctions;
+    // next pair of frequent conjunctions
+    size_t _i;
+    size_t _j;
+    boost::unordered_set<std::vector<R> > _present;
+    long _bytes;
+    long _numSpills;
+    std::vector<boost::shared_ptr<SpillRun<R> > > _runs;
+    _heaptype _heads;
+    bool _merging;
+    std::set<R> _running;
+    std::vector<R> _conjunction;
+
+    void _spill() {
+        std::vector<std::vector<R> > _sorted(_present.begin(),
+                                             _present.end());
+        std::sort(_sorted.begin(), _sorted.end());
+        boost::shared_ptr<SpillRun<R> > _run(new SpillRun<R>());
+        for (auto i=_sorted.begin() ; i!=_sorted.end() ; ++i) {
+            _run->write(*i);
+        }
+        _runs.push_back(_run);
+        _present.clear();
+        _bytes = 0;
+        ++_numSpills;
+        if (static_cast<long>(_runs.size()) > APRIORI_MERGE_WIDTH) {
+            _compact();
+        }
+    }
+
+    /// Merge the runs after the first one into a single run, to bound the
+    /// number of open files.
+    void _compact() {
+        boost::shared_ptr<SpillRun<R> > _run(new SpillRun<R>());
+        _heaptype _heap;
+        for (size_t r=1 ; r<_runs.size() ; ++r) {
+            _runs[r]->rewind();
+            _pushHead(_heap, r);
+        }
+        std::vector<R> _last;
+        while (!_heap.empty()) {
+            _headtype const _head = _heap.top();
+            _heap.pop();
+            // runs are never empty, so no conjunction equals the first _last
+            if (_head.first != _last) {
+                _run->write(_head.first);
+                _last = _head.first;
+            }
+            _pushHead(_heap, _head.second);
+        }
+        _runs.resize(1);
+        _runs.push_back(_run);
+    }
+
+    void _pushHead(_heaptype& heap, long const run) {
+        _headtype _head(std::vector<R>(), run);
+        if (_runs[run]->read(_head.first)) {
+            heap.push(_head);
+        }
+    }
+
+    /// Create the candidate of the current pair, returns false if there
+    /// is none.
+    bool _pair() {
+        std::vector<R> const& a = _conjunctions[_i];
+        std::vector<R> const& b = _conjunctions[_j];
+        if (a == b) {
+            return false;
+        }
+        _running.clear();
+        _running.insert(a.begin(), a.end());
+        for (auto k=b.begin() ; k!=b.end() ; ++k) {
+            _running.erase(*k);
+        }
+        if (_running.size() == 0) {
+            return false; // do not allow rule which matches everything
+        }
+        // create a conjunction, where individual components are sorted
+        _conjunction.assign(_running.begin(), _running.end());
+        // if it does not equal to none of its parents, it is a candidate
+        return _conjunction != a && _conjunction != b;
+    }
+
+    bool _merge(std::vector<std::vector<R> >& batch, long& bytes) {
+        while (!_heads.empty()) {
+            std::vector<R> _c = _heads.top().first;
+            bool _streamed = false;
+            while (!_heads.empty() && _heads.top().first == _c) {
+                long const _run = _heads.top().second;
+                _heads.pop();
+                _streamed = _streamed || _run == 0;
+                _pushHead(_heads, _run);
+            }
+            if (!_streamed && this->_add(batch, _c, bytes)) {
+                return true;
+            }
+        }
+        return false;
+    }
+public:
+    HpCandidateStream(std::vector<std::vector<R> > const& conjunctions,
+                      long const maxMemory)
+    : CandidateStream<R>(maxMemory), _conjunctions(conjunctions), _i(0),
+      _j(1), _bytes(0), _numSpills(0), _merging(false) {
+        // only the pairs in this order are combined, so sort to make the
+        // candidates independent of the order of the frequent conjunctions
+        std::sort(_conjunctions.begin(), _conjunctions.end());
+    }
+
+    bool next(std::vector<std::vector<R> >& batch) {
+        batch.clear();
+        long _batchBytes = 0;
+        if (_merging) {
+            _merge(batch, _batchBytes);
+            return !batch.empty();
+        }
+        while (_i < _conjunctions.size()) {
+            if (_j >= _conjunctions.size()) {
+                ++_i;
+                _j = _i + 1;
+                continue;
+            }
+            bool const _candidate = _pair();
+            ++_j;
+            if (!_candidate || !_present.insert(_conjunction).second) {
+                continue;
+            }
+            _bytes += _conjunctionBytes(_conjunction);
+            bool _full = false;
+            if (_runs.empty()) {
+                _full = this->_add(batch, _conjunction, _batchBytes);
+            }
+            if (_bytes >= this->_maxMemory) {
+                _spill();
+            }
+            if (_full) {
+                return true;
+            }
+        }
+        if (!_runs.empty()) {
+            _spill();
+            _merging = true;
+            for (size_t r=0 ; r<_runs.size() ; ++r) {
+                _runs[r]->rewind();
+                _pushHead(_heads, r);
+            }
+            _merge(batch, _batchBytes);
+        }
+        return !batch.empty();
+    }
+
+    long numSpilledRuns() const {
+        return _numSpills;
+    }
+};
+
 ////////////////////////////////////////////////////////////////////////////////
 // high recall
 ////////////////////////////////////////////////////////////////////////////////
-void hrFrequentThread(
+template<class R, class T>
+void hrFrequentChunk(
     long start,
     long stop,
-    std::vector<Conjunction> const& conjunctions,
-    std::map<Rule, OrderedCover> const& basicCovers,
-    OrderedCover const& trueCover,
+    std::vector<std::vector<R> > const& conjunctions,
+    std::map<R, T> const& basicCovers,
+    T const& trueCover,
     double const treshold,
-    std::vector<Conjunction>& result,
-    boost::mutex& mutex
+    CoverCache<R, T> const& parents,
+    CoverCache<R, T>& children,
+    std::vector<std::vector<R> >& result
     )
 {
-    std::vector<Conjunction> _result;
-    _result.reserve(stop-start);
-    auto start_i = conjunctions.begin();
-    auto stop_i  = conjunctions.begin();
-    std::advance(start_i, start);
-    std::advance(stop_i, stop);
-    long counter = 0;
-    for (auto i=start_i ; i!=stop_i ; ++i) {
-        OrderedCover _ordc(conjunctionCover(*i, basicCovers));
-        if (_ordc.metrics(trueCover).recall() >= treshold) {
-            _result.push_back(*i);
-            counter += 1;
-        }
-        // try copying intermediate results
-        if (counter % 256 == 0) {
-            if (mutex.try_lock()) {
-                std::copy(_result.begin(), _result.end(),
-                          std::back_inserter(result));
-                mutex.unlock();
-                _result.clear();
+    // covers with less elements can not reach the recall treshold
+    long const minSize = std::max(
+            static_cast<long>(treshold * trueCover.size()), 1L);
+    for (long i=start ; i<stop ; ++i) {
+        std::vector<R> const& c = conjunctions[i];
+        T _cov(cachedConjunctionCover(c, basicCovers, parents, minSize));
+        if (_cov.metrics(trueCover).recall() >= treshold) {
+            result.push_back(c);
+            // basic covers already serve as the parents of pairs
+            if (c.size() > 1) {
+                children.add(c, _cov);
             }
         }
     }
-    // copy to master _result vector
-    mutex.lock();
-    std::copy(_result.begin(), _result.end(), std::back_inserter(result));
-    mutex.unlock();
 }
 
-std::vector<Conjunction> hrFrequent(
-    std::vector<Conjunction> const& conjunctions,
-    std::map<Rule, OrderedCover> const& basicCovers,
-     OrderedCover const& trueCover,
+template<class R, class T>
+std::vector<std::vector<R> > hrFrequent(
+    std::vector<std::vector<R> > const& conjunctions,
+    std::map<R, T> const& basicCovers,
+     T const& trueCover,
      double const treshold,
-     long const n_threads) {
-    std::vector<Conjunction> _result; _result.reserve(conjunctions.size());
-    double interval = static_cast<double>(conjunctions.size()) / n_threads;
-    interval = std::max(interval, 1.0);
-
-    boost::thread_group threads;
-    boost::mutex mutex;
-
-    for (double start=0 ; start<conjunctions.size() ; start+=interval) {
-        long lstart = static_cast<long>(start);
-        long lend   = static_cast<long>(start+interval);
-        fprintf(stderr, "Thread will handle %lu to %lu\n", lstart, lend);
-        threads.add_thread(new boost::thread(hrFrequentThread,
-                                             lstart,
-                                             lend,
-                                             boost::ref(conjunctions),
-                                             boost::ref(basicCovers),
-                                             boost::ref(trueCover),
-                                             treshold,
-                                             boost::ref(_result),
-                                             boost::ref(mutex)));
-    }
-    threads.join_all();
-
-    return _result;
+     CoverCache<R, T> const& parents,
+     CoverCache<R, T>& children,
+     ThreadPool& pool) {
+    // every chunk has its own result buffer
+    long const N = conjunctions.size();
+    std::vector<std::vector<std::vector<R> > > _chunks(
+            (N + APRIORI_CHUNK_SIZE - 1) / APRIORI_CHUNK_SIZE);
+    pool.forEachChunk(N, APRIORI_CHUNK_SIZE, [&](long first, long last) {
+        hrFrequentChunk(first, last, conjunctions, basicCovers, trueCover,
+                        treshold, parents, children,
+                        _chunks[first / APRIORI_CHUNK_SIZE]);
+    });
+    return _concatChunks(_chunks);
 }
 
-std::vector<Conjunction> hrCandidates(
-    std::vector<Conjunction> const& conjunctions)
-{
-    boost::unordered_set<Conjunction> _present;
-    std::set<Rule> _running;
-    Conjunction _conjunction;
+template<class R, class T> std::vector<std::vector<R> >
+_hrApriori(std::vector<std::vector<R> > const& initial,
+        std::map<R, T> const& basicCovers,
+        T const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        long cacheSize,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    size_t N = trueCover.metrics(trueCover).support();
+    // treshold is smaller than minimal single occurrence, everything that
+    // exists, will be frequent.
+    if (treshold <= 1.0 / N) {
+        throw std::runtime_error(ERR_TRESHOLD_INSANE);
+    }
 
-    for (auto i=conjunctions.begin() ; i!=conjunctions.end() ; ++i) {
-        for (auto j=i+1 ; j!=conjunctions.end() ; ++j) {
-            if (*i == *j) {
-                continue;
-            }
-            // do the conjunction
-            _running.clear();
-            _running.insert(i->begin(), i->end());
-            _running.insert(j->begin(), j->end());
-            // create a conjunction, where individual components are sorted
-            _conjunction.clear();
-            _conjunction.insert(_conjunction.begin(),
-                                _running.begin(), _running.end());
-            // if it does not equal to none of its parents, add it
-            if (_conjunction != *i && _conjunction != *j) {
-                _present.insert(_conjunction);
-            }
+    std::vector<std::vector<R> > _candidates = initial;
+    std::vector<std::vector<R> > _frequent;
+    std::vector<std::vector<R> > _batch;
+    std::vector<std::vector<R> > _result;
+    uint64_t const _fingerprint = _checkpointFingerprint(checkpointDir,
+            "hrApriori", initial, basicCovers, trueCover, treshold);
+    long const _first = _resumeCheckpoint(checkpointDir, _fingerprint, limit,
+                                          _result, _frequent);
+    // covers of the frequent conjunctions of the previous and current level
+    CoverCache<R, T> _parents(cacheSize);
+    CoverCache<R, T> _children(cacheSize);
+    CoverCache<R, T> _none(0);
+    ThreadPool _pool(numThreads);
+    miningLog("Starting with %lu initial candidates\n", initial.size());
+
+    for (long iter=_first ; limit <= 0 || iter <= limit ; ++iter) {
+        LevelStats _stats;
+        _stats.level = iter;
+        // the first level evaluates the given candidates, the others join
+        // the frequent conjunctions of the previous level
+        boost::scoped_ptr<CandidateStream<R> > _stream;
+        if (iter == 1) {
+            _stream.reset(new VectorCandidateStream<R>(_candidates,
+                                                       maxMemory));
+        } else {
+            _stream.reset(new HrCandidateStream<R>(_frequent, maxMemory));
+        }
+        _frequent.clear();
+        // covers of the last level are never used as parents
+        CoverCache<R, T>& _next = (iter == limit) ? _none : _children;
+        _pool.resetBusyTimes();
+        double _start = wallTime();
+        while (_stream->next(_batch)) {
+            _stats.candidateTime += wallTime() - _start;
+            _stats.numCandidates += _batch.size();
+            _start = wallTime();
+            std::vector<std::vector<R> > _f = hrFrequent(_batch, basicCovers,
+                    trueCover, treshold, _parents, _next, _pool);
+            _frequent.insert(_frequent.end(), _f.begin(), _f.end());
+            _stats.evaluateTime += wallTime() - _start;
+            _start = wallTime();
+        }
+        _stats.candidateTime += wallTime() - _start;
+        if (_stats.numCandidates == 0) {
+            break;
+        }
+        _stats.numSpilledRuns = _stream->numSpilledRuns();
+        _stream.reset();
+        std::vector<std::vector<R> >().swap(_candidates);
+        _stats.threadBusyTime = _pool.busyTimes();
+        _stats.peakCacheSize = _parents.size() + _next.peakSize();
+        _stats.numFrequent = _frequent.size();
+        miningLog("iter %lu: %lu/%lu candidates are frequent\n",
+                  iter, _frequent.size(), _stats.numCandidates);
+        miningLog("cached %lu covers with %lu elements\n",
+                  _children.numCovers(), _children.size());
+        _parents.swap(_children);
+        _children.clear();
+        std::copy(_frequent.begin(), _frequent.end(),
+                  std::back_inserter(_result));
+        if (monitor != NULL) {
+            monitor->onLevel(_stats);
         }
+        _saveCheckpoint(checkpointDir, _fingerprint, iter, _result,
+                        _frequent);
     }
-    std::vector<Conjunction> _result(_present.begin(), _present.end());
-    return _result;
+    return uniqueConjunctions(_result);
 }
 
 std::vector<Conjunction>
@@ -138,7 +881,181 @@ hrApriori(std::vector<Conjunction> const& initial,
         OrderedCover const& trueCover,
         double treshold,
         long limit,
-        long numThreads)
+        long numThreads,
+        long cacheSize,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hrApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, cacheSize, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<IdConjunction>
+hrApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        long cacheSize,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hrApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, cacheSize, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<Conjunction>
+hrApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        long cacheSize,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hrApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, cacheSize, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<IdConjunction>
+hrApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        long cacheSize,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hrApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, cacheSize, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<Conjunction>
+hrApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        long cacheSize,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hrApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, cacheSize, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<IdConjunction>
+hrApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        long cacheSize,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hrApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, cacheSize, checkpointDir, monitor,
+                      maxMemory);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// high recall, depth first
+////////////////////////////////////////////////////////////////////////////////
+/// A conjunction together with its cover restricted to the true cover. In a
+/// diffset class the cover holds the elements lost compared to the common
+/// prefix of the class instead.
+template<class R, class T>
+struct EclatNode {
+    std::vector<R> conjunction;
+    T cover;
+    long support;
+};
+
+/// Search the extensions of the i-th conjunction of a class, which are
+/// formed by joining it with the later conjunctions of the class. The
+/// frequent extensions form a new class that is searched recursively.
+template<class R, class T>
+void _eclatExtend(std::vector<EclatNode<R, T> > const& klass,
+                  bool const diffsets,
+                  size_t const i,
+                  long const level,
+                  long const limit,
+                  long const minSupport,
+                  bool const useDiffsets,
+                  std::vector<std::vector<R> >& result) {
+    if (level == limit) {
+        return;
+    }
+    EclatNode<R, T> const& a = klass[i];
+    std::vector<EclatNode<R, T> > _children;
+    long _total = 0;
+    for (size_t j=i+1 ; j<klass.size() ; ++j) {
+        EclatNode<R, T> const& b = klass[j];
+        EclatNode<R, T> _child;
+        if (diffsets) {
+            // d(PXY) = d(PY) - d(PX)
+            _child.cover = b.cover;
+            _child.cover -= a.cover;
+            _child.support = a.support - _child.cover.size();
+        } else {
+            _child.cover = a.cover;
+            _child.cover &= b.cover;
+            _child.support = _child.cover.size();
+        }
+        if (_child.support < minSupport) {
+            continue;
+        }
+        _child.conjunction = a.conjunction;
+        _child.conjunction.push_back(b.conjunction.back());
+        result.push_back(_child.conjunction);
+        _total += _child.support;
+        _children.push_back(_child);
+    }
+    bool _diffsets = diffsets;
+    // in a dense class the children lose only a few elements compared to
+    // their parent, so keeping the lost elements is cheaper
+    if (!diffsets && useDiffsets && _children.size() > 1 &&
+            2 * _total > static_cast<long>(_children.size()) * a.support) {
+        for (auto j=_children.begin() ; j!=_children.end() ; ++j) {
+            T _lost(a.cover);
+            _lost -= j->cover;
+            j->cover = _lost;
+        }
+        _diffsets = true;
+    }
+    for (size_t j=0 ; j<_children.size() ; ++j) {
+        _eclatExtend(_children, _diffsets, j, level+1, limit, minSupport,
+                     useDiffsets, result);
+    }
+}
+
+template<class R, class T> std::vector<std::vector<R> >
+_hrEclat(std::vector<std::vector<R> > const& initial,
+        std::map<R, T> const& basicCovers,
+        T const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        bool useDiffsets)
 throw(std::runtime_error) {
     size_t N = trueCover.metrics(trueCover).support();
     // treshold is smaller than minimal single occurrence, everything that
@@ -146,161 +1063,522 @@ throw(std::runtime_error) {
     if (treshold <= 1.0 / N) {
         throw std::runtime_error(ERR_TRESHOLD_INSANE);
     }
+    // smallest support with recall at least treshold
+    long minSupport = static_cast<long>(treshold * N);
+    while (minSupport / static_cast<double>(N) < treshold) {
+        ++minSupport;
+    }
 
-    std::vector<Conjunction> _candidates = initial;
-    std::vector<Conjunction> _frequent;
-    std::vector<Conjunction> _result;
-    fprintf(stderr, "Starting with %lu initial candidates\n", initial.size());
+    std::vector<std::vector<R> > _initial;
+    _initial.reserve(initial.size());
+    for (auto i=initial.begin() ; i!=initial.end() ; ++i) {
+        if (i->empty()) {
+            continue;
+        }
+        _initial.push_back(*i);
+        std::sort(_initial.back().begin(), _initial.back().end());
+        _initial.back().erase(std::unique(_initial.back().begin(),
+                                          _initial.back().end()),
+                              _initial.back().end());
+    }
+    std::sort(_initial.begin(), _initial.end(), _lengthOrder<R>);
+    _initial.erase(std::unique(_initial.begin(), _initial.end()),
+                   _initial.end());
+    miningLog("Starting with %lu initial candidates\n", initial.size());
 
-    for (long iter=1 ; _candidates.size() > 0 ; ++iter) {
-        _frequent = hrFrequent(_candidates, basicCovers, trueCover, treshold,
-                                                                    numThreads);
-        fprintf(stderr, "iter %lu: %lu/%lu candidates are frequent\n",
-                iter, _frequent.size(), _candidates.size());
-        std::copy(_frequent.begin(), _frequent.end(),
-                  std::back_inserter(_result));
-        if (limit == iter) {
-            break;
+    // only the part of the covers within the true cover affects recall
+    ThreadPool _pool(numThreads);
+    std::vector<EclatNode<R, T> > _nodes(_initial.size());
+    _pool.forEachChunk(_initial.size(), APRIORI_CHUNK_SIZE,
+                       [&](long first, long last) {
+        for (long i=first ; i<last ; ++i) {
+            _nodes[i].conjunction = _initial[i];
+            _nodes[i].cover = conjunctionCover(_initial[i], basicCovers,
+                                               minSupport);
+            _nodes[i].cover &= trueCover;
+            _nodes[i].support = _nodes[i].cover.size();
+        }
+    });
+    // the frequent initial conjunctions sharing all but the last rule form
+    // the classes of the first level
+    std::vector<std::vector<EclatNode<R, T> > > _classes;
+    std::vector<std::vector<R> > _result;
+    for (auto i=_nodes.begin() ; i!=_nodes.end() ; ++i) {
+        if (i->support < minSupport) {
+            continue;
+        }
+        _result.push_back(i->conjunction);
+        std::vector<R> const* _last = _classes.empty() ? NULL :
+            &_classes.back().back().conjunction;
+        if (_last == NULL || _last->size() != i->conjunction.size() ||
+            !std::equal(_last->begin(), _last->end()-1,
+                        i->conjunction.begin())) {
+            _classes.push_back(std::vector<EclatNode<R, T> >());
+        }
+        _classes.back().push_back(*i);
+    }
+    std::vector<EclatNode<R, T> >().swap(_nodes);
+    miningLog("%lu/%lu initial candidates are frequent\n",
+            _result.size(), _initial.size());
+
+    // search the subtree of every frequent initial conjunction separately
+    std::vector<std::pair<size_t, size_t> > _roots;
+    for (size_t c=0 ; c<_classes.size() ; ++c) {
+        for (size_t i=0 ; i<_classes[c].size() ; ++i) {
+            _roots.push_back(std::make_pair(c, i));
+        }
+    }
+    std::vector<std::vector<std::vector<R> > > _subtrees(_roots.size());
+    _pool.forEachChunk(_roots.size(), 1, [&](long first, long last) {
+        for (long r=first ; r<last ; ++r) {
+            _eclatExtend(_classes[_roots[r].first], false, _roots[r].second,
+                         1, limit, minSupport, useDiffsets, _subtrees[r]);
         }
-        _candidates = uniqueConjunctions(hrCandidates(_frequent));
-        fprintf(stderr, "obtained %lu new candidates\n", _candidates.size());
+    });
+    for (auto i=_subtrees.begin() ; i!=_subtrees.end() ; ++i) {
+        _result.insert(_result.end(), i->begin(), i->end());
     }
     return uniqueConjunctions(_result);
 }
 
+std::vector<Conjunction>
+hrEclat(std::vector<Conjunction> const& initial,
+        std::map<Rule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        bool useDiffsets)
+throw(std::runtime_error) {
+    return _hrEclat(initial, basicCovers, trueCover, treshold, limit,
+                    numThreads, useDiffsets);
+}
+
+std::vector<IdConjunction>
+hrEclat(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        bool useDiffsets)
+throw(std::runtime_error) {
+    return _hrEclat(initial, basicCovers, trueCover, treshold, limit,
+                    numThreads, useDiffsets);
+}
+
+std::vector<Conjunction>
+hrEclat(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        bool useDiffsets)
+throw(std::runtime_error) {
+    return _hrEclat(initial, basicCovers, trueCover, treshold, limit,
+                    numThreads, useDiffsets);
+}
+
+std::vector<IdConjunction>
+hrEclat(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        bool useDiffsets)
+throw(std::runtime_error) {
+    return _hrEclat(initial, basicCovers, trueCover, treshold, limit,
+                    numThreads, useDiffsets);
+}
+
+std::vector<Conjunction>
+hrEclat(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        bool useDiffsets)
+throw(std::runtime_error) {
+    return _hrEclat(initial, basicCovers, trueCover, treshold, limit,
+                    numThreads, useDiffsets);
+}
+
+std::vector<IdConjunction>
+hrEclat(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        bool useDiffsets)
+throw(std::runtime_error) {
+    return _hrEclat(initial, basicCovers, trueCover, treshold, limit,
+                    numThreads, useDiffsets);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// top-k
+////////////////////////////////////////////////////////////////////////////////
+typedef double (CoverMetrics::*MetricFunction)() const;
+
+/// The metrics with a known upper bound over conjunction extensions.
+MetricFunction _topMetric(std::string const& metric)
+throw(std::runtime_error) {
+    if (metric == "recall") {
+        return &CoverMetrics::recall;
+    } else if (metric == "f1score") {
+        return &CoverMetrics::f1score;
+    } else if (metric == "matthews") {
+        return &CoverMetrics::matthews;
+    }
+    throw std::runtime_error(ERR_UNSUPPORTED_METRIC + metric);
+}
+
+/// The k best conjunctions found so far, thread safe.
+template<class R>
+class TopConjunctions {
+private:
+    typedef std::pair<double, std::vector<R> > _entry;
+    // the worst entry is on top of the heap
+    struct _better {
+        bool operator()(_entry const& a, _entry const& b) const {
+            return a.first > b.first ||
+                   (a.first == b.first && a.second < b.second);
+        }
+    };
+    std::vector<_entry> _heap;
+    size_t _k;
+    double _treshold;
+    mutable boost::mutex _mutex;
+public:
+    explicit TopConjunctions(long const k)
+    : _k(std::max(k, 0L)),
+      _treshold(-std::numeric_limits<double>::infinity()) {}
+
+    /// Offer a conjunction with its metric value.
+    void add(double const value, std::vector<R> const& c) {
+        if (std::isnan(value) || _k == 0) {
+            return;
+        }
+        boost::mutex::scoped_lock _lock(_mutex);
+        _entry e(value, c);
+        if (_heap.size() == _k) {
+            if (!_better()(e, _heap.front())) {
+                return;
+            }
+            std::pop_heap(_heap.begin(), _heap.end(), _better());
+            _heap.pop_back();
+        }
+        _heap.push_back(e);
+        std::push_heap(_heap.begin(), _heap.end(), _better());
+        if (_heap.size() == _k) {
+            _treshold = _heap.front().first;
+        }
+    }
+
+    /// A conjunction whose metric bound is below the treshold can not
+    /// enter the k best.
+    double treshold() const {
+        boost::mutex::scoped_lock _lock(_mutex);
+        return _treshold;
+    }
+
+    /// The conjunctions from best to worst.
+    std::vector<std::vector<R> > conjunctions() const {
+        std::vector<_entry> _sorted(_heap);
+        std::sort(_sorted.begin(), _sorted.end(), _better());
+        std::vector<std::vector<R> > _result;
+        for (auto i=_sorted.begin() ; i!=_sorted.end() ; ++i) {
+            _result.push_back(i->second);
+        }
+        return _result;
+    }
+};
+
+template<class R, class T>
+struct TopNode {
+    std::vector<R> conjunction;
+    T cover;
+    long tp;
+    double bound;
+};
+
+/// Upper bound of the metric over all extensions of a conjunction with tp
+/// true positives: extensions can only lose true positives, and the metric
+/// is best with no false positives and all negatives of the documents of
+/// the true cover being true negatives.
+double _topBound(MetricFunction const metric, long const tp, long const N,
+                 long const negatives) {
+    return (CoverMetrics(tp, 0, negatives, N - tp).*metric)();
+}
+
+/// Search the extensions of the i-th conjunction of a class depth first,
+/// see _eclatExtend.
+template<class R, class T>
+void _topExtend(std::vector<TopNode<R, T> > const& klass,
+                size_t const i,
+                long const level,
+                long const limit,
+                T const& trueCover,
+                MetricFunction const metric,
+                long const N,
+                long const negatives,
+                TopConjunctions<R>& top) {
+    TopNode<R, T> const& a = klass[i];
+    if (level == limit || a.bound < top.treshold()) {
+        return;
+    }
+    std::vector<TopNode<R, T> > _children;
+    for (size_t j=i+1 ; j<klass.size() ; ++j) {
+        TopNode<R, T> const& b = klass[j];
+        if (b.bound < top.treshold()) {
+            continue;
+        }
+        TopNode<R, T> _child;
+        _child.cover = a.cover;
+        _child.cover &= b.cover;
+        CoverMetrics m = _child.cover.metrics(trueCover);
+        if (m.tp() == 0) {
+            continue;
+        }
+        _child.conjunction = a.conjunction;
+        _child.conjunction.push_back(b.conjunction.back());
+        _child.tp = m.tp();
+        _child.bound = _topBound(metric, m.tp(), N, negatives);
+        top.add((m.*metric)(), _child.conjunction);
+        _children.push_back(_child);
+    }
+    for (size_t j=0 ; j<_children.size() ; ++j) {
+        _topExtend(_children, j, level+1, limit, trueCover, metric, N,
+                   negatives, top);
+    }
+}
+
+template<class R, class T> std::vector<std::vector<R> >
+_topConjunctions(std::vector<std::vector<R> > const& initial,
+        std::map<R, T> const& basicCovers,
+        T const& trueCover,
+        long k,
+        std::string const& metric,
+        long limit,
+        long numThreads)
+throw(std::runtime_error) {
+    MetricFunction const _metric = _topMetric(metric);
+    CoverMetrics const _true = trueCover.metrics(trueCover);
+    long const N = _true.tp();
+    long const _negatives = _true.tn();
+
+    std::vector<std::vector<R> > _initial;
+    _initial.reserve(initial.size());
+    for (auto i=initial.begin() ; i!=initial.end() ; ++i) {
+        if (i->empty()) {
+            continue;
+        }
+        _initial.push_back(*i);
+        std::sort(_initial.back().begin(), _initial.back().end());
+        _initial.back().erase(std::unique(_initial.back().begin(),
+                                          _initial.back().end()),
+                              _initial.back().end());
+    }
+    std::sort(_initial.begin(), _initial.end(), _lengthOrder<R>);
+    _initial.erase(std::unique(_initial.begin(), _initial.end()),
+                   _initial.end());
+    miningLog("Starting with %lu initial candidates\n", initial.size());
+
+    ThreadPool _pool(numThreads);
+    TopConjunctions<R> _top(k);
+    std::vector<TopNode<R, T> > _nodes(_initial.size());
+    _pool.forEachChunk(_initial.size(), APRIORI_CHUNK_SIZE,
+                       [&](long first, long last) {
+        for (long i=first ; i<last ; ++i) {
+            _nodes[i].conjunction = _initial[i];
+            _nodes[i].cover = conjunctionCover(_initial[i], basicCovers);
+            CoverMetrics m = _nodes[i].cover.metrics(trueCover);
+            _nodes[i].tp = m.tp();
+            _nodes[i].bound = _topBound(_metric, m.tp(), N, _negatives);
+            if (m.tp() > 0) {
+                _top.add((m.*_metric)(), _nodes[i].conjunction);
+            }
+        }
+    });
+    // classes of the initial conjunctions sharing all but the last rule
+    std::vector<std::vector<TopNode<R, T> > > _classes;
+    for (auto i=_nodes.begin() ; i!=_nodes.end() ; ++i) {
+        if (i->tp == 0 || i->bound < _top.treshold()) {
+            continue;
+        }
+        std::vector<R> const* _last = _classes.empty() ? NULL :
+            &_classes.back().back().conjunction;
+        if (_last == NULL || _last->size() != i->conjunction.size() ||
+            !std::equal(_last->begin(), _last->end()-1,
+                        i->conjunction.begin())) {
+            _classes.push_back(std::vector<TopNode<R, T> >());
+        }
+        _classes.back().push_back(*i);
+    }
+    std::vector<TopNode<R, T> >().swap(_nodes);
+
+    // search the most promising subtrees first to raise the treshold early
+    std::vector<std::pair<size_t, size_t> > _roots;
+    for (size_t c=0 ; c<_classes.size() ; ++c) {
+        for (size_t i=0 ; i<_classes[c].size() ; ++i) {
+            _roots.push_back(std::make_pair(c, i));
+        }
+    }
+    std::stable_sort(_roots.begin(), _roots.end(),
+                     [&](std::pair<size_t, size_t> const& a,
+                         std::pair<size_t, size_t> const& b) {
+        return _classes[a.first][a.second].bound >
+               _classes[b.first][b.second].bound;
+    });
+    _pool.forEachChunk(_roots.size(), 1, [&](long first, long last) {
+        for (long r=first ; r<last ; ++r) {
+            _topExtend(_classes[_roots[r].first], _roots[r].second, 1, limit,
+                       trueCover, _metric, N, _negatives, _top);
+        }
+    });
+    return _top.conjunctions();
+}
+
+std::vector<Conjunction>
+topConjunctions(std::vector<Conjunction> const& initial,
+        std::map<Rule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        long k,
+        std::string const& metric,
+        long limit,
+        long numThreads)
+throw(std::runtime_error) {
+    return _topConjunctions(initial, basicCovers, trueCover, k, metric,
+                            limit, numThreads);
+}
+
+std::vector<IdConjunction>
+topConjunctions(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        long k,
+        std::string const& metric,
+        long limit,
+        long numThreads)
+throw(std::runtime_error) {
+    return _topConjunctions(initial, basicCovers, trueCover, k, metric,
+                            limit, numThreads);
+}
+
+std::vector<Conjunction>
+topConjunctions(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        long k,
+        std::string const& metric,
+        long limit,
+        long numThreads)
+throw(std::runtime_error) {
+    return _topConjunctions(initial, basicCovers, trueCover, k, metric,
+                            limit, numThreads);
+}
+
+std::vector<IdConjunction>
+topConjunctions(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        long k,
+        std::string const& metric,
+        long limit,
+        long numThreads)
+throw(std::runtime_error) {
+    return _topConjunctions(initial, basicCovers, trueCover, k, metric,
+                            limit, numThreads);
+}
+
+std::vector<Conjunction>
+topConjunctions(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        long k,
+        std::string const& metric,
+        long limit,
+        long numThreads)
+throw(std::runtime_error) {
+    return _topConjunctions(initial, basicCovers, trueCover, k, metric,
+                            limit, numThreads);
+}
+
+std::vector<IdConjunction>
+topConjunctions(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        long k,
+        std::string const& metric,
+        long limit,
+        long numThreads)
+throw(std::runtime_error) {
+    return _topConjunctions(initial, basicCovers, trueCover, k, metric,
+                            limit, numThreads);
+}
+
 ////////////////////////////////////////////////////////////////////////////////
 // high precision
 ////////////////////////////////////////////////////////////////////////////////
 
-void hpFrequentThread(
+template<class R, class T>
+void hpFrequentChunk(
     long start,
     long stop,
-    std::vector<Conjunction> const& conjunctions,
-    std::map<Rule, OrderedCover> const& basicCovers,
-    OrderedCover const& trueCover,
+    std::vector<std::vector<R> > const& conjunctions,
+    std::map<R, T> const& basicCovers,
+    T const& trueCover,
     double const treshold,
-    std::vector<Conjunction>& result,
-    boost::mutex& mutex
+    std::vector<std::vector<R> >& result
     )
 {
-    std::vector<Conjunction> _result;
-    _result.reserve(stop-start);
-    auto start_i = conjunctions.begin();
-    auto stop_i  = conjunctions.begin();
-    std::advance(start_i, start);
-    std::advance(stop_i, stop);
-    long counter = 0;
-    for (auto i=start_i ; i!=stop_i ; ++i) {
-        OrderedCover _ordc(conjunctionCover(*i, basicCovers));
-        //auto xxx = _ordc.metrics(trueCover);
+    for (long i=start ; i<stop ; ++i) {
+        T _cov(conjunctionCover(conjunctions[i], basicCovers));
+        //auto xxx = _cov.metrics(trueCover);
         //printf("%d %d %d %d\n", xxx.tp(), xxx.fp(), xxx.tn(), xxx.fn());
-        //printf("%lf\n", _ordc.metrics(trueCover).fprate());
-        auto m = _ordc.metrics(trueCover);
+        //printf("%lf\n", _cov.metrics(trueCover).fprate());
+        auto m = _cov.metrics(trueCover);
         // also require precision to be good enough as fprate is
         // not reasonable metric anyway
         if (m.fprate() <= treshold && m.precision() > 0) {
-            _result.push_back(*i);
-            counter += 1;
-        }
-        // try copying intermediate results
-        if (counter % 256 == 0) {
-            if (mutex.try_lock()) {
-                std::copy(_result.begin(), _result.end(),
-                          std::back_inserter(result));
-                mutex.unlock();
-                _result.clear();
-            }
+            result.push_back(conjunctions[i]);
         }
     }
-    // copy to master _result vector
-    mutex.lock();
-    std::copy(_result.begin(), _result.end(), std::back_inserter(result));
-    mutex.unlock();
 }
 
-std::vector<Conjunction> hpFrequent(
-    std::vector<Conjunction> const& conjunctions,
-    std::map<Rule, OrderedCover> const& basicCovers,
-     OrderedCover const& trueCover,
+template<class R, class T>
+std::vector<std::vector<R> > hpFrequent(
+    std::vector<std::vector<R> > const& conjunctions,
+    std::map<R, T> const& basicCovers,
+     T const& trueCover,
      double const treshold,
-     long const n_threads)
+     ThreadPool& pool)
 {
-    std::vector<Conjunction> _result; _result.reserve(conjunctions.size());
-    double interval = static_cast<double>(conjunctions.size()) / n_threads;
-    interval = std::max(interval, 1.0);
-
-    boost::thread_group threads;
-    boost::mutex mutex;
-
-    for (double start=0 ; start<conjunctions.size() ; start+=interval) {
-        long lstart = static_cast<long>(start);
-        long lend   = static_cast<long>(start+interval);
-        fprintf(stderr, "Thread will handle %lu to %lu\n", lstart, lend);
-        threads.add_thread(new boost::thread(hpFrequentThread,
-                                             lstart,
-                                             lend,
-                                             boost::ref(conjunctions),
-                                             boost::ref(basicCovers),
-                                             boost::ref(trueCover),
-                                             treshold,
-                                             boost::ref(_result),
-                                             boost::ref(mutex)));
-    }
-    threads.join_all();
-
-    return _result;
+    // every chunk has its own result buffer
+    long const N = conjunctions.size();
+    std::vector<std::vector<std::vector<R> > > _chunks(
+            (N + APRIORI_CHUNK_SIZE - 1) / APRIORI_CHUNK_SIZE);
+    pool.forEachChunk(N, APRIORI_CHUNK_SIZE, [&](long first, long last) {
+        hpFrequentChunk(first, last, conjunctions, basicCovers, trueCover,
+                        treshold, _chunks[first / APRIORI_CHUNK_SIZE]);
+    });
+    return _concatChunks(_chunks);
 }
 
-std::vector<Conjunction> hpCandidates(
-    std::vector<Conjunction> const& conjunctions,
-    double const probability=0.1)
-{
-    boost::unordered_set<Conjunction> _present;
-    std::set<Rule> _running;
-    Conjunction _conjunction;
-    // randomness
-    boost::mt19937 gen;
-    double probs[] = {probability, 1-probability};
-    boost::random::discrete_distribution<> dist(probs);
-
-    for (auto i=conjunctions.begin() ; i!=conjunctions.end() ; ++i) {
-        //if (dist(gen) == 1) { // create a new pair with probability
-        //    continue;
-        //}
-        for (auto j=i+1 ; j!=conjunctions.end() ; ++j) {
-            if (*i == *j) {
-                continue;
-            }
-            // do the conjunction intersection
-            _running.clear();
-            _running.insert(i->begin(), i->end());
-            for (auto k=j->begin() ; k!=j->end() ; ++k) {
-                _running.erase(*k);
-            }
-            if (_running.size() == 0) {
-                continue; // do not allow rule which matches everything
-            }
-            // create a conjunction, where individual components are sorted
-            _conjunction.clear();
-            _conjunction.insert(_conjunction.begin(),
-                                _running.begin(), _running.end());
-            // if it does not equal to none of its parents, add it
-            if (_conjunction != *i && _conjunction != *j) {
-                _present.insert(_conjunction);
-            }
-        }
-    }
-    std::vector<Conjunction> _result(_present.begin(), _present.end());
-    return _result;
-}
-
-std::vector<Conjunction>
-hpApriori(std::vector<Conjunction> const& initial,
-        std::map<Rule, OrderedCover> const& basicCovers,
-        OrderedCover const& trueCover,
+template<class R, class T> std::vector<std::vector<R> >
+_hpApriori(std::vector<std::vector<R> > const& initial,
+        std::map<R, T> const& basicCovers,
+        T const& trueCover,
         double treshold,
         long limit,
-        long numThreads)
+        long numThreads,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
 throw(std::runtime_error) {
     size_t N = trueCover.metrics(trueCover).support();
     // treshold is smaller than minimal single occurrence, everything that
@@ -309,25 +1587,158 @@ throw(std::runtime_error) {
         throw std::runtime_error(ERR_TRESHOLD_INSANE);
     }
 
-    std::vector<Conjunction> _candidates = initial;
-    std::vector<Conjunction> _frequent;
-    std::vector<Conjunction> _result;
-    fprintf(stderr, "Starting with %lu initial candidates\n", initial.size());
+    std::vector<std::vector<R> > _candidates = initial;
+    std::vector<std::vector<R> > _frequent;
+    std::vector<std::vector<R> > _batch;
+    std::vector<std::vector<R> > _result;
+    uint64_t const _fingerprint = _checkpointFingerprint(checkpointDir,
+            "hpApriori", initial, basicCovers, trueCover, treshold);
+    long const _first = _resumeCheckpoint(checkpointDir, _fingerprint, limit,
+                                          _result, _frequent);
+    ThreadPool _pool(numThreads);
+    miningLog("Starting with %lu initial candidates\n", initial.size());
 
-    for (long iter=1 ; _candidates.size() > 0 ; ++iter) {
-        _frequent = hpFrequent(_candidates, basicCovers, trueCover, treshold,
-                                                                    numThreads);
-        fprintf(stderr, "iter %lu: %lu/%lu candidates are frequent\n",
-                iter, _frequent.size(), _candidates.size());
+    for (long iter=_first ; limit <= 0 || iter <= limit ; ++iter) {
+        LevelStats _stats;
+        _stats.level = iter;
+        // the first level evaluates the given candidates, the others
+        // combine the frequent conjunctions of the previous level
+        boost::scoped_ptr<CandidateStream<R> > _stream;
+        if (iter == 1) {
+            _stream.reset(new VectorCandidateStream<R>(_candidates,
+                                                       maxMemory));
+        } else {
+            _stream.reset(new HpCandidateStream<R>(_frequent, maxMemory));
+        }
+        _frequent.clear();
+        _pool.resetBusyTimes();
+        double _start = wallTime();
+        while (_stream->next(_batch)) {
+            _stats.candidateTime += wallTime() - _start;
+            _stats.numCandidates += _batch.size();
+            _start = wallTime();
+            std::vector<std::vector<R> > _f = hpFrequent(_batch, basicCovers,
+                    trueCover, treshold, _pool);
+            _frequent.insert(_frequent.end(), _f.begin(), _f.end());
+            _stats.evaluateTime += wallTime() - _start;
+            _start = wallTime();
+        }
+        _stats.candidateTime += wallTime() - _start;
+        if (_stats.numCandidates == 0) {
+            break;
+        }
+        _stats.numSpilledRuns = _stream->numSpilledRuns();
+        _stream.reset();
+        std::vector<std::vector<R> >().swap(_candidates);
+        _stats.threadBusyTime = _pool.busyTimes();
+        _stats.numFrequent = _frequent.size();
+        miningLog("iter %lu: %lu/%lu candidates are frequent\n",
+                  iter, _frequent.size(), _stats.numCandidates);
         std::copy(_frequent.begin(), _frequent.end(),
                   std::back_inserter(_result));
-        if (limit == iter) {
-            break;
+        if (monitor != NULL) {
+            monitor->onLevel(_stats);
         }
-        _candidates = uniqueConjunctions(hpCandidates(_frequent));
-        fprintf(stderr, "obtained %lu new candidates\n", _candidates.size());
+        _saveCheckpoint(checkpointDir, _fingerprint, iter, _result,
+                        _frequent);
     }
     return uniqueConjunctions(_result);
 }
 
+std::vector<Conjunction>
+hpApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hpApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<IdConjunction>
+hpApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, OrderedCover> const& basicCovers,
+        OrderedCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hpApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<Conjunction>
+hpApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hpApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<IdConjunction>
+hpApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, RoaringCover> const& basicCovers,
+        RoaringCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hpApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<Conjunction>
+hpApriori(std::vector<Conjunction> const& initial,
+        std::map<Rule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hpApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, checkpointDir, monitor,
+                      maxMemory);
+}
+
+std::vector<IdConjunction>
+hpApriori(std::vector<IdConjunction> const& initial,
+        std::map<IdRule, PostingCover> const& basicCovers,
+        PostingCover const& trueCover,
+        double treshold,
+        long limit,
+        long numThreads,
+        std::string const& checkpointDir,
+        MiningMonitor* monitor,
+        long maxMemory)
+throw(std::runtime_error) {
+    return _hpApriori(initial, basicCovers, trueCover, treshold, limit,
+                      numThreads, checkpointDir, monitor,
+                      maxMemory);
+}
+
 } // namespace pfe
@@ -0,0 +1,367 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <AprioriCheckpoint.hpp>
+#include <BinaryCorpus.hpp>
+#include <MappedFile.hpp>
+#include <Vocabulary.hpp>
+
+#include <cerrno>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+
+#include <sys/stat.h>
+#include <unistd.h>
+
+namespace pfe {
+
+/// Offset basis of 64-bit FNV-1a.
+#define APRIORI_HASH_SEED 14695981039346656037ULL
+
+/// Hash a block of memory with 64-bit FNV-1a.
+uint64_t _fnvHash(void const* data, size_t const size, uint64_t hash) {
+    unsigned char const* p = reinterpret_cast<unsigned char const*>(data);
+    for (size_t i=0 ; i<size ; ++i) {
+        hash ^= p[i];
+        hash *= 1099511628211ULL;
+    }
+    return hash;
+}
+
+uint64_t _fnvHash(long const value, uint64_t hash) {
+    int64_t const _value = value;
+    return _fnvHash(&_value, sizeof(_value), hash);
+}
+
+uint64_t _ruleHash(Rule const& rule, uint64_t hash) {
+    hash = _fnvHash(rule.first, hash);
+    hash = _fnvHash(rule.second.data(), rule.second.size(), hash);
+    // separate the attributes
+    return _fnvHash(0L, hash);
+}
+
+uint64_t _ruleHash(IdRule const& rule, uint64_t hash) {
+    hash = _fnvHash(rule.first, hash);
+    return _fnvHash(static_cast<long>(rule.second), hash);
+}
+
+uint64_t _docCoverHash(long const docSize, LongVector const& indices,
+                       uint64_t hash) {
+    hash = _fnvHash(docSize, hash);
+    hash = _fnvHash(static_cast<long>(indices.size()), hash);
+    for (auto i=indices.begin() ; i!=indices.end() ; ++i) {
+        hash = _fnvHash(*i, hash);
+    }
+    return hash;
+}
+
+template<class T>
+uint64_t _coverHash(Cover<T> const& cover, uint64_t hash) {
+    StringVector const _names = cover.names();
+    hash = _fnvHash(static_cast<long>(_names.size()), hash);
+    for (auto i=_names.begin() ; i!=_names.end() ; ++i) {
+        T const _doc = cover.docCover(*i);
+        hash = _fnvHash(i->data(), i->size(), hash);
+        hash = _docCoverHash(_doc.docSize(), _doc.indices(), hash);
+    }
+    return hash;
+}
+
+uint64_t coverHash(OrderedCover const& cover) {
+    return _coverHash(cover, APRIORI_HASH_SEED);
+}
+
+uint64_t coverHash(RoaringCover const& cover) {
+    return _coverHash(cover, APRIORI_HASH_SEED);
+}
+
+uint64_t coverHash(PostingCover const& cover) {
+    std::map<long, OrderedDocCover> const _docs = cover.map();
+    uint64_t hash = _fnvHash(static_cast<long>(_docs.size()),
+                             APRIORI_HASH_SEED);
+    for (auto i=_docs.begin() ; i!=_docs.end() ; ++i) {
+        hash = _fnvHash(i->first, hash);
+        hash = _docCoverHash(i->second.docSize(), i->second.indices(), hash);
+    }
+    return hash;
+}
+
+template<class R> uint64_t
+_aprioriFingerprint(std::string const& miner,
+                    std::vector<std::vector<R> > const& initial,
+                    std::map<R, uint64_t> const& basicHashes,
+                    uint64_t const trueHash,
+                    double const treshold) {
+    uint64_t hash = APRIORI_HASH_SEED;
+    hash = _fnvHash(miner.data(), miner.size(), hash);
+    hash = _fnvHash(&treshold, sizeof(treshold), hash);
+    hash = _fnvHash(static_cast<long>(basicHashes.size()), hash);
+    for (auto i=basicHashes.begin() ; i!=basicHashes.end() ; ++i) {
+        hash = _ruleHash(i->first, hash);
+        hash = _fnvHash(&i->second, sizeof(i->second), hash);
+    }
+    hash = _fnvHash(&trueHash, sizeof(trueHash), hash);
+    hash = _fnvHash(static_cast<long>(initial.size()), hash);
+    for (auto i=initial.begin() ; i!=initial.end() ; ++i) {
+        hash = _fnvHash(static_cast<long>(i->size()), hash);
+        for (auto j=i->begin() ; j!=i->end() ; ++j) {
+            hash = _ruleHash(*j, hash);
+        }
+    }
+    return hash;
+}
+
+uint64_t aprioriFingerprint(std::string const& miner,
+                            std::vector<Conjunction> const& initial,
+                            std::map<Rule, uint64_t> const& basicHashes,
+                            uint64_t const trueHash,
+                            double const treshold) {
+    return _aprioriFingerprint(miner, initial, basicHashes, trueHash,
+                               treshold);
+}
+
+uint64_t aprioriFingerprint(std::string const& miner,
+                            std::vector<IdConjunction> const& initial,
+                            std::map<IdRule, uint64_t> const& basicHashes,
+                            uint64_t const trueHash,
+                            double const treshold) {
+    return _aprioriFingerprint(miner, initial, basicHashes, trueHash,
+                               treshold);
+}
+
+AttrId _checkpointAttr(Rule const& rule, Vocabulary& vocabulary) {
+    return vocabulary.add(rule.second);
+}
+
+AttrId _checkpointAttr(IdRule const& rule, Vocabulary&) {
+    return rule.second;
+}
+
+/// Returns false if the entry refers to a missing attribute.
+bool _checkpointRule(AprioriCheckpointRule const& entry,
+                     StringVector const& strings, Rule& rule) {
+    if (entry.attrId >= strings.size()) {
+        return false;
+    }
+    rule.first  = entry.offset;
+    rule.second = strings[entry.attrId];
+    return true;
+}
+
+bool _checkpointRule(AprioriCheckpointRule const& entry,
+                     StringVector const&, IdRule& rule) {
+    rule.first  = entry.offset;
+    rule.second = entry.attrId;
+    return true;
+}
+
+std::string _checkpointFilename(std::string const& directory) {
+    return directory + "/" + APRIORI_CHECKPOINT_FILE;
+}
+
+template<class R>
+void _writeAprioriCheckpoint(std::string const& directory,
+                             uint64_t const fingerprint,
+                             AprioriCheckpoint<R> const& checkpoint)
+throw(std::runtime_error) {
+    if (mkdir(directory.c_str(), 0777) != 0 && errno != EEXIST) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + directory);
+    }
+    Vocabulary vocabulary;
+    std::vector<uint64_t> _conjunctions(1, 0);
+    std::vector<AprioriCheckpointRule> _rules;
+    std::vector<std::vector<R> > const* _sections[] = {
+        &checkpoint.result, &checkpoint.frequent
+    };
+    for (unsigned int s=0 ; s<2 ; ++s) {
+        auto const& _section = *_sections[s];
+        for (auto i=_section.begin() ; i!=_section.end() ; ++i) {
+            for (auto j=i->begin() ; j!=i->end() ; ++j) {
+                AprioriCheckpointRule rule;
+                rule.offset   = j->first;
+                rule.attrId   = _checkpointAttr(*j, vocabulary);
+                rule.reserved = 0;
+                _rules.push_back(rule);
+            }
+            _conjunctions.push_back(_rules.size());
+        }
+    }
+    StringVector _strings = vocabulary.attributes();
+    std::vector<uint64_t> _stringOffsets(1, 0);
+    std::string _stringData;
+    for (auto i=_strings.begin() ; i!=_strings.end() ; ++i) {
+        _stringData += *i;
+        _stringOffsets.push_back(_stringData.size());
+    }
+    AprioriCheckpointHeader header;
+    std::memset(&header, 0, sizeof(header));
+    std::memcpy(header.magic, APRIORI_CHECKPOINT_MAGIC, 8);
+    header.version        = APRIORI_CHECKPOINT_VERSION;
+    header.fingerprint    = fingerprint;
+    header.level          = checkpoint.level;
+    header.numStrings     = _strings.size();
+    header.stringDataSize = _stringData.size();
+    header.numResult      = checkpoint.result.size();
+    header.numFrequent    = checkpoint.frequent.size();
+    header.numRules       = _rules.size();
+
+    // write to a temporary file first, so that a killed process never
+    // leaves a partially written checkpoint behind
+    std::string const _filename = _checkpointFilename(directory);
+    std::stringstream ss;
+    ss << _filename << ".tmp" << getpid();
+    std::string const _tmpFilename = ss.str();
+    std::ofstream fout(_tmpFilename.c_str(), std::ios::binary | std::ios::out);
+    if (!fout) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + _tmpFilename);
+    }
+    writeBinarySection(fout, &header, sizeof(header));
+    writeBinarySection(fout, _stringOffsets.data(),
+                       _stringOffsets.size() * sizeof(uint64_t));
+    writeBinarySection(fout, _stringData.data(), _stringData.size());
+    writeBinarySection(fout, _conjunctions.data(),
+                       _conjunctions.size() * sizeof(uint64_t));
+    writeBinarySection(fout, _rules.data(),
+                       _rules.size() * sizeof(AprioriCheckpointRule));
+    fout.close();
+    if (!fout) {
+        std::remove(_tmpFilename.c_str());
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + _tmpFilename);
+    }
+    if (std::rename(_tmpFilename.c_str(), _filename.c_str()) != 0) {
+        std::remove(_tmpFilename.c_str());
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + _filename);
+    }
+}
+
+void writeAprioriCheckpoint(std::string const& directory,
+                            uint64_t const fingerprint,
+                            AprioriCheckpoint<Rule> const& checkpoint)
+throw(std::runtime_error) {
+    _writeAprioriCheckpoint(directory, fingerprint, checkpoint);
+}
+
+void writeAprioriCheckpoint(std::string const& directory,
+                            uint64_t const fingerprint,
+                            AprioriCheckpoint<IdRule> const& checkpoint)
+throw(std::runtime_error) {
+    _writeAprioriCheckpoint(directory, fingerprint, checkpoint);
+}
+
+template<class R>
+bool _readAprioriCheckpoint(std::string const& directory,
+                            uint64_t const fingerprint,
+                            AprioriCheckpoint<R>& checkpoint)
+throw(std::runtime_error) {
+    std::string const _filename = _checkpointFilename(directory);
+    std::ifstream fin(_filename.c_str(), std::ios::in | std::ios::binary);
+    if (!fin.good()) {
+        return false;
+    }
+    fin.close();
+    MappedFile file(_filename);
+    if (file.size() < sizeof(AprioriCheckpointHeader)) {
+        throw std::runtime_error(ERR_INVALID_APRIORI_CHECKPOINT + _filename);
+    }
+    AprioriCheckpointHeader const* header =
+        reinterpret_cast<AprioriCheckpointHeader const*>(file.data());
+    if (std::memcmp(header->magic, APRIORI_CHECKPOINT_MAGIC, 8) != 0 ||
+        header->version != APRIORI_CHECKPOINT_VERSION) {
+        throw std::runtime_error(ERR_INVALID_APRIORI_CHECKPOINT + _filename);
+    }
+    if (header->fingerprint != fingerprint) {
+        return false;
+    }
+    uint64_t const _numConjunctions = header->numResult +
+                                      header->numFrequent;
+    size_t const _size = sizeof(AprioriCheckpointHeader) +
+        binaryAlign8((header->numStrings + 1) * sizeof(uint64_t)) +
+        binaryAlign8(header->stringDataSize) +
+        binaryAlign8((_numConjunctions + 1) * sizeof(uint64_t)) +
+        binaryAlign8(header->numRules * sizeof(AprioriCheckpointRule));
+    if (file.size() < _size) {
+        throw std::runtime_error(ERR_INVALID_APRIORI_CHECKPOINT + _filename);
+    }
+    // locate the sections
+    char const* p = file.data();
+    size_t pos = sizeof(AprioriCheckpointHeader);
+    uint64_t const* _stringOffsets = reinterpret_cast<uint64_t const*>(p + pos);
+    pos += binaryAlign8((header->numStrings + 1) * sizeof(uint64_t));
+    char const* _stringData = p + pos;
+    pos += binaryAlign8(header->stringDataSize);
+    uint64_t const* _conjunctions = reinterpret_cast<uint64_t const*>(p + pos);
+    pos += binaryAlign8((_numConjunctions + 1) * sizeof(uint64_t));
+    AprioriCheckpointRule const* _rules =
+        reinterpret_cast<AprioriCheckpointRule const*>(p + pos);
+
+    if (_stringOffsets[header->numStrings] > header->stringDataSize) {
+        throw std::runtime_error(ERR_INVALID_APRIORI_CHECKPOINT + _filename);
+    }
+    StringVector _strings;
+    _strings.reserve(header->numStrings);
+    for (uint64_t i=0 ; i<header->numStrings ; ++i) {
+        _strings.push_back(std::string(_stringData + _stringOffsets[i],
+                           _stringOffsets[i+1] - _stringOffsets[i]));
+    }
+    checkpoint.level = header->level;
+    std::vector<std::vector<R> >* _sections[] = {
+        &checkpoint.result, &checkpoint.frequent
+    };
+    uint64_t const _counts[] = {
+        header->numResult, header->numFrequent
+    };
+    uint64_t c = 0;
+    for (unsigned int s=0 ; s<2 ; ++s) {
+        _sections[s]->clear();
+        _sections[s]->reserve(_counts[s]);
+        for (uint64_t i=0 ; i<_counts[s] ; ++i, ++c) {
+            if (_conjunctions[c+1] > header->numRules) {
+                throw std::runtime_error(ERR_INVALID_APRIORI_CHECKPOINT +
+                                         _filename);
+            }
+            std::vector<R> _conjunction;
+            for (uint64_t j=_conjunctions[c] ; j<_conjunctions[c+1] ; ++j) {
+                R rule;
+                if (!_checkpointRule(_rules[j], _strings, rule)) {
+                    throw std::runtime_error(ERR_INVALID_APRIORI_CHECKPOINT +
+                                             _filename);
+                }
+                _conjunction.push_back(rule);
+            }
+            _sections[s]->push_back(_conjunction);
+        }
+    }
+    return true;
+}
+
+bool readAprioriCheckpoint(std::string const& directory,
+                           uint64_t const fingerprint,
+                           AprioriCheckpoint<Rule>& checkpoint)
+throw(std::runtime_error) {
+    return _readAprioriCheckpoint(directory, fingerprint, checkpoint);
+}
+
+bool readAprioriCheckpoint(std::string const& directory,
+                           uint64_t const fingerprint,
+                           AprioriCheckpoint<IdRule>& checkpoint)
+throw(std::runtime_error) {
+    return _readAprioriCheckpoint(directory, fingerprint, checkpoint);
+}
+
+} // namespace pfe
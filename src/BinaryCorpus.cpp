@@ -0,0 +1,249 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <BinaryCorpus.hpp>
+
+#include <cstring>
+#include <fstream>
+
+namespace pfe {
+
+size_t binaryAlign8(size_t const size) {
+    return (size + 7) & ~static_cast<size_t>(7);
+}
+
+bool isBinaryCorpusFile(std::string const& filename) {
+    std::ifstream fin(filename.c_str(), std::ios::in | std::ios::binary);
+    char magic[8];
+    fin.read(magic, 8);
+    return fin.gcount() == 8 &&
+           std::memcmp(magic, BINARY_CORPUS_MAGIC, 8) == 0;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// BinaryDocument
+////////////////////////////////////////////////////////////////////////////////
+
+IdDocument BinaryDocument::idDocument() const {
+    IdDocument _doc(_size);
+    for (size_t idx=0 ; idx<_size ; ++idx) {
+        AttrRange r = (*this)[idx];
+        _doc[idx].assign(r.begin(), r.end());
+    }
+    return _doc;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// BinaryCorpus
+////////////////////////////////////////////////////////////////////////////////
+
+BinaryCorpus::BinaryCorpus(std::string const& filename)
+throw(std::runtime_error) : _file(filename) {
+    if (_file.size() < sizeof(BinaryCorpusHeader)) {
+        throw std::runtime_error(ERR_INVALID_BINARY_CORPUS + filename);
+    }
+    // check that the file is what it claims to be before locating the
+    // sections
+    char const* p = _file.data();
+    _header = reinterpret_cast<BinaryCorpusHeader const*>(p);
+    if (std::memcmp(_header->magic, BINARY_CORPUS_MAGIC, 8) != 0 ||
+        _header->version != BINARY_CORPUS_VERSION) {
+        throw std::runtime_error(ERR_INVALID_BINARY_CORPUS + filename);
+    }
+    size_t pos = sizeof(BinaryCorpusHeader);
+    _stringOffsets = reinterpret_cast<uint64_t const*>(p + pos);
+    pos += (_header->numStrings + 1) * sizeof(uint64_t);
+    _stringData = p + pos;
+    pos += binaryAlign8(_header->stringDataSize);
+    _docs = reinterpret_cast<BinaryDocEntry const*>(p + pos);
+    pos += _header->numDocs * sizeof(BinaryDocEntry);
+    _tokenOffsets = reinterpret_cast<uint64_t const*>(p + pos);
+    pos += (_header->numTokens + 1) * sizeof(uint64_t);
+    _attrs = reinterpret_cast<AttrId const*>(p + pos);
+    pos += _header->numAttrs * sizeof(AttrId);
+    if (pos > _file.size()) {
+        throw std::runtime_error(ERR_INVALID_BINARY_CORPUS + filename);
+    }
+}
+
+std::string BinaryCorpus::string(AttrId const id) const
+throw(std::range_error) {
+    if (id >= _header->numStrings) {
+        throw std::range_error(ERR_ATTRIBUTE_NOT_FOUND);
+    }
+    return std::string(_stringData + _stringOffsets[id],
+                       _stringOffsets[id+1] - _stringOffsets[id]);
+}
+
+std::string BinaryCorpus::name(size_t const idx) const
+throw(std::range_error) {
+    if (idx >= size()) {
+        throw std::range_error(ERR_DOCUMENT_NOT_FOUND);
+    }
+    return string(_docs[idx].nameId);
+}
+
+StringVector BinaryCorpus::names() const {
+    StringVector _names;
+    _names.reserve(size());
+    for (size_t idx=0 ; idx<size() ; ++idx) {
+        _names.push_back(name(idx));
+    }
+    return _names;
+}
+
+BinaryDocument BinaryCorpus::document(size_t const idx) const
+throw(std::range_error) {
+    if (idx >= size()) {
+        throw std::range_error(ERR_DOCUMENT_NOT_FOUND);
+    }
+    return BinaryDocument(_tokenOffsets + _docs[idx].firstToken, _attrs,
+                          _docs[idx].numTokens);
+}
+
+BinaryDocument BinaryCorpus::document(std::string const& docName) const
+throw(std::range_error) {
+    // document directory is sorted by name, do a binary search
+    size_t lo = 0;
+    size_t hi = size();
+    while (lo < hi) {
+        size_t mid = lo + (hi - lo) / 2;
+        if (name(mid) < docName) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    if (lo == size() || name(lo) != docName) {
+        throw std::range_error(ERR_DOCUMENT_NOT_FOUND);
+    }
+    return document(lo);
+}
+
+Vocabulary BinaryCorpus::vocabulary() const {
+    StringVector _strings;
+    _strings.reserve(numStrings());
+    for (size_t idx=0 ; idx<numStrings() ; ++idx) {
+        _strings.push_back(string(idx));
+    }
+    return Vocabulary(_strings);
+}
+
+IdCorpus BinaryCorpus::idCorpus() const {
+    IdCorpus _corpus;
+    for (size_t idx=0 ; idx<size() ; ++idx) {
+        _corpus.insert(_corpus.end(), {name(idx), document(idx).idDocument()});
+    }
+    return _corpus;
+}
+
+Corpus BinaryCorpus::corpus() const {
+    return decodeCorpus(idCorpus(), vocabulary());
+}
+
+OrderedCover fullOrderedCoverFromCorpus(BinaryCorpus const& corpus) {
+    std::map<std::string, OrderedDocCover> _map;
+    for (size_t idx=0 ; idx<corpus.size() ; ++idx) {
+        long docSize = corpus.document(idx).size();
+        LongVector _indices(docSize);
+        for (long i=0 ; i<docSize ; ++i) {
+            _indices[i] = i;
+        }
+        _map.insert(_map.end(),
+                    {corpus.name(idx), OrderedDocCover(docSize, _indices)});
+    }
+    return OrderedCover(_map);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// Binary corpus writing
+////////////////////////////////////////////////////////////////////////////////
+
+void writeBinarySection(std::ostream& os, void const* data,
+                        size_t const size) {
+    static char const padding[8] = {0};
+    os.write(static_cast<char const*>(data), size);
+    os.write(padding, binaryAlign8(size) - size);
+}
+
+void writeBinaryCorpus(std::string const& filename, Corpus const& corpus)
+throw(std::runtime_error) {
+    Vocabulary vocabulary;
+    std::vector<BinaryDocEntry> _docs;
+    std::vector<uint64_t> _tokenOffsets(1, 0);
+    AttrIdVector _attrs;
+    // intern the names and attributes, the corpus is already sorted by name
+    _docs.reserve(corpus.size());
+    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
+        BinaryDocEntry entry;
+        entry.nameId     = vocabulary.add(i->first);
+        entry.reserved   = 0;
+        entry.firstToken = _tokenOffsets.size() - 1;
+        entry.numTokens  = i->second.size();
+        for (auto j=i->second.begin() ; j!=i->second.end() ; ++j) {
+            for (auto k=j->begin() ; k!=j->end() ; ++k) {
+                _attrs.push_back(vocabulary.add(*k));
+            }
+            _tokenOffsets.push_back(_attrs.size());
+        }
+        _docs.push_back(entry);
+    }
+    // build the string table
+    StringVector _strings = vocabulary.attributes();
+    std::vector<uint64_t> _stringOffsets(1, 0);
+    std::string _stringData;
+    for (auto i=_strings.begin() ; i!=_strings.end() ; ++i) {
+        _stringData += *i;
+        _stringOffsets.push_back(_stringData.size());
+    }
+    BinaryCorpusHeader header;
+    std::memset(&header, 0, sizeof(header));
+    std::memcpy(header.magic, BINARY_CORPUS_MAGIC, 8);
+    header.version        = BINARY_CORPUS_VERSION;
+    header.numStrings     = _strings.size();
+    header.numDocs        = _docs.size();
+    header.numTokens      = _tokenOffsets.size() - 1;
+    header.numAttrs       = _attrs.size();
+    header.stringDataSize = _stringData.size();
+
+    std::ofstream fout(filename.c_str(), std::ios::binary | std::ios::out);
+    if (!fout) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + filename);
+    }
+    writeBinarySection(fout, &header, sizeof(header));
+    writeBinarySection(fout, _stringOffsets.data(),
+                       _stringOffsets.size() * sizeof(uint64_t));
+    writeBinarySection(fout, _stringData.data(), _stringData.size());
+    writeBinarySection(fout, _docs.data(),
+                       _docs.size() * sizeof(BinaryDocEntry));
+    writeBinarySection(fout, _tokenOffsets.data(),
+                       _tokenOffsets.size() * sizeof(uint64_t));
+    writeBinarySection(fout, _attrs.data(),
+                       _attrs.size() * sizeof(AttrId));
+    if (!fout) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + filename);
+    }
+    fout.close();
+}
+
+void compileCorpus(std::string const& textFilename,
+                   std::string const& binaryFilename)
+throw(std::runtime_error) {
+    writeBinaryCorpus(binaryFilename, readCorpusFromFile(textFilename));
+}
+
+} // namespace pfe
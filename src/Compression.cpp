@@ -0,0 +1,130 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <Compression.hpp>
+
+#include <cstring>
+#include <fstream>
+
+#include <boost/iostreams/device/file.hpp>
+#include <boost/iostreams/filter/bzip2.hpp>
+#include <boost/iostreams/filter/gzip.hpp>
+#include <boost/iostreams/filter/lzma.hpp>
+#ifdef PFE_HAVE_ZSTD
+#include <boost/iostreams/filter/zstd.hpp>
+#endif
+
+namespace io = boost::iostreams;
+
+namespace pfe {
+
+std::string detectCompression(std::string const& filename)
+throw(std::runtime_error) {
+    std::ifstream fin(filename.c_str(), std::ios::in | std::ios::binary);
+    if (fin.fail()) {
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE + filename);
+    }
+    unsigned char magic[6] = {0, 0, 0, 0, 0, 0};
+    fin.read(reinterpret_cast<char*>(magic), sizeof(magic));
+
+    if (magic[0] == 0x1f && magic[1] == 0x8b) {
+        return COMPRESSION_GZIP;
+    }
+    if (std::memcmp(magic, "BZh", 3) == 0) {
+        return COMPRESSION_BZIP2;
+    }
+    if (std::memcmp(magic, "\xfd" "7zXZ\0", 6) == 0) {
+        return COMPRESSION_XZ;
+    }
+    if (std::memcmp(magic, "\x28\xb5\x2f\xfd", 4) == 0) {
+        return COMPRESSION_ZSTD;
+    }
+    return COMPRESSION_NONE;
+}
+
+/// Check if string s ends with given suffix.
+bool endsWith(std::string const& s, std::string const& suffix) {
+    return s.size() >= suffix.size() &&
+           s.compare(s.size() - suffix.size(), suffix.size(), suffix) == 0;
+}
+
+std::string compressionFromExtension(std::string const& filename) {
+    if (endsWith(filename, ".gz")) {
+        return COMPRESSION_GZIP;
+    }
+    if (endsWith(filename, ".bz2")) {
+        return COMPRESSION_BZIP2;
+    }
+    if (endsWith(filename, ".xz")) {
+        return COMPRESSION_XZ;
+    }
+    if (endsWith(filename, ".zst")) {
+        return COMPRESSION_ZSTD;
+    }
+    return COMPRESSION_NONE;
+}
+
+void openInputFile(io::filtering_istream& is, std::string const& filename)
+throw(std::runtime_error) {
+    std::string compression = detectCompression(filename);
+    if (compression == COMPRESSION_GZIP) {
+        is.push(io::gzip_decompressor());
+    } else if (compression == COMPRESSION_BZIP2) {
+        is.push(io::bzip2_decompressor());
+    } else if (compression == COMPRESSION_XZ) {
+        is.push(io::lzma_decompressor());
+    } else if (compression == COMPRESSION_ZSTD) {
+#ifdef PFE_HAVE_ZSTD
+        is.push(io::zstd_decompressor());
+#else
+        throw std::runtime_error(ERR_UNKNOWN_COMPRESSION + compression);
+#endif
+    }
+    io::file_source source(filename, std::ios::in | std::ios::binary);
+    if (!source.is_open()) {
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE + filename);
+    }
+    is.push(source);
+}
+
+void openOutputFile(io::filtering_ostream& os, std::string const& filename,
+        std::string const& compression) throw(std::runtime_error) {
+    std::string _compression = compression;
+    if (_compression.size() == 0) {
+        _compression = compressionFromExtension(filename);
+    }
+    if (_compression == COMPRESSION_GZIP) {
+        os.push(io::gzip_compressor());
+    } else if (_compression == COMPRESSION_BZIP2) {
+        os.push(io::bzip2_compressor());
+    } else if (_compression == COMPRESSION_XZ) {
+        os.push(io::lzma_compressor());
+#ifdef PFE_HAVE_ZSTD
+    } else if (_compression == COMPRESSION_ZSTD) {
+        os.push(io::zstd_compressor());
+#endif
+    } else if (_compression != COMPRESSION_NONE) {
+        throw std::runtime_error(ERR_UNKNOWN_COMPRESSION + _compression);
+    }
+    io::file_sink sink(filename, std::ios::out | std::ios::binary);
+    if (!sink.is_open()) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + filename);
+    }
+    os.push(sink);
+}
+
+} // namespace pfe
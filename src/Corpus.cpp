@@ -15,26 +15,41 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 */
 #include <Corpus.hpp>
+#include <BinaryCorpus.hpp>
+#include <Compression.hpp>
+#include <MappedFile.hpp>
 
+#include <algorithm>
+#include <cstring>
 #include <fstream>
 #include <sstream>
 
+#include <boost/thread.hpp>
+
 namespace pfe {
 
 ////////////////////////////////////////////////////////////////////////////////
 // Corpus cover related
 ////////////////////////////////////////////////////////////////////////////////
 
-OrderedDocCover fullOrderedDocCoverFromDoc(Document const& doc) {
+OrderedDocCover fullOrderedDocCoverFromSize(long const docSize) {
     LongVector _indices;
-    _indices.reserve(doc.size());
-    for (unsigned long i=0 ; i<doc.size() ; ++i) {
+    _indices.reserve(docSize);
+    for (long i=0 ; i<docSize ; ++i) {
         _indices.push_back(i);
     }
-    return OrderedDocCover(doc.size(), _indices);
+    return OrderedDocCover(docSize, _indices);
 }
 
-OrderedCover fullOrderedCoverFromCorpus(Corpus const& corpus) {
+OrderedDocCover fullOrderedDocCoverFromDoc(Document const& doc) {
+    return fullOrderedDocCoverFromSize(doc.size());
+}
+
+OrderedDocCover fullOrderedDocCoverFromDoc(IdDocument const& doc) {
+    return fullOrderedDocCoverFromSize(doc.size());
+}
+
+template<class C> OrderedCover _fullOrderedCoverFromCorpus(C const& corpus) {
     std::map<std::string, OrderedDocCover> _map;
     for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
         _map.insert(_map.end(),
@@ -43,6 +58,60 @@ OrderedCover fullOrderedCoverFromCorpus(Corpus const& corpus) {
     return OrderedCover(_map);
 }
 
+OrderedCover fullOrderedCoverFromCorpus(Corpus const& corpus) {
+    return _fullOrderedCoverFromCorpus(corpus);
+}
+
+OrderedCover fullOrderedCoverFromCorpus(IdCorpus const& corpus) {
+    return _fullOrderedCoverFromCorpus(corpus);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// Attribute encoding
+////////////////////////////////////////////////////////////////////////////////
+
+IdDocument encodeDocument(Document const& doc, Vocabulary& vocabulary) {
+    IdDocument _doc(doc.size());
+    for (size_t idx=0 ; idx<doc.size() ; ++idx) {
+        _doc[idx].reserve(doc[idx].size());
+        for (auto i=doc[idx].begin() ; i!=doc[idx].end() ; ++i) {
+            _doc[idx].push_back(vocabulary.add(*i));
+        }
+    }
+    return _doc;
+}
+
+IdCorpus encodeCorpus(Corpus const& corpus, Vocabulary& vocabulary) {
+    IdCorpus _corpus;
+    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
+        _corpus.insert(_corpus.end(),
+                       {i->first, encodeDocument(i->second, vocabulary)});
+    }
+    return _corpus;
+}
+
+Document decodeDocument(IdDocument const& doc, Vocabulary const& vocabulary)
+throw(std::range_error) {
+    Document _doc(doc.size());
+    for (size_t idx=0 ; idx<doc.size() ; ++idx) {
+        _doc[idx].reserve(doc[idx].size());
+        for (auto i=doc[idx].begin() ; i!=doc[idx].end() ; ++i) {
+            _doc[idx].push_back(vocabulary.attribute(*i));
+        }
+    }
+    return _doc;
+}
+
+Corpus decodeCorpus(IdCorpus const& corpus, Vocabulary const& vocabulary)
+throw(std::range_error) {
+    Corpus _corpus;
+    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
+        _corpus.insert(_corpus.end(),
+                       {i->first, decodeDocument(i->second, vocabulary)});
+    }
+    return _corpus;
+}
+
 ////////////////////////////////////////////////////////////////////////////////
 // Corpus parsing
 ////////////////////////////////////////////////////////////////////////////////
@@ -90,6 +159,23 @@ Corpus readCorpusFromStream(std::istream& is) {
     return corpus;
 }
 
+CorpusReader::CorpusReader(std::string const& filename)
+throw(std::runtime_error) : _is(_fin) {
+    openInputFile(_fin, filename);
+}
+
+bool CorpusReader::next() {
+    if (_is.eof() || _is.fail()) {
+        return false;
+    }
+    _document = readDocFromStream(_is, _name);
+    if (!_is.eof() && !_is.fail()) {
+        return true;
+    }
+    // last document in the stream, skip it if nothing was read
+    return _name.size() > 0 || _document.size() > 0;
+}
+
 Document readDocFromStr(std::string const& s, std::string& docName) {
     std::stringstream ss(s);
     return readDocFromStream(ss, docName);
@@ -97,14 +183,9 @@ Document readDocFromStr(std::string const& s, std::string& docName) {
 
 Document readDocFromFile(std::string const& filename, std::string& docName)
 throw (std::runtime_error) {
-    std::ifstream fin(filename.c_str(), std::ios::in | std::ios::binary);
-    if (fin.fail()) {
-        std::string err = ERR_COULD_NOT_READ_FILE + filename;
-        throw std::runtime_error(err.c_str());
-    }
-    Document doc = readDocFromStream(fin, docName);
-    fin.close();
-    return doc;
+    boost::iostreams::filtering_istream fin;
+    openInputFile(fin, filename);
+    return readDocFromStream(fin, docName);
 }
 
 Corpus readCorpusFromStr(std::string const& s) {
@@ -112,18 +193,136 @@ Corpus readCorpusFromStr(std::string const& s) {
     return readCorpusFromStream(ss);
 }
 
-Corpus readCorpusFromFile(std::string const& filename)
-throw (std::runtime_error) {
-    std::ifstream fin(filename, std::ios::in | std::ios::binary);
-    if (fin.fail()) {
-        std::string err = ERR_COULD_NOT_READ_FILE + filename;
-        throw std::runtime_error(err.c_str());
+typedef std::pair<std::string, Document> NamedDocument;
+typedef std::vector<NamedDocument> NamedDocumentVector;
+
+/// Parse the documents in the memory range [begin, end) that starts at a
+/// document name. The lines are interpreted as in @see:readCorpusFromStream:
+/// a document ends at the first empty line after its name and the line after
+/// that is the name of the next document, even if it is empty. Documents
+/// ending with an empty line are appended to documents. If the range ends
+/// the file, the unterminated last document is stored in last. Like with
+/// std::getline, a last line without a trailing newline is not a word.
+void parseCorpusChunk(char const* begin, char const* end,
+        NamedDocumentVector* documents, NamedDocument* last) {
+    char const* p = begin;
+    while (p < end) {
+        char const* _eol = static_cast<char const*>(
+                std::memchr(p, '\n', end - p));
+        if (_eol == 0) {
+            break;
+        }
+        documents->push_back(std::make_pair(std::string(p, _eol),
+                                            Document()));
+        p = _eol + 1;
+        while (p < end) {
+            _eol = static_cast<char const*>(std::memchr(p, '\n', end - p));
+            if (_eol == 0 || _eol == p) {
+                break;
+            }
+            // the first field is the word itself, the rest are attributes
+            Document& doc = documents->back().second;
+            doc.push_back(StringVector());
+            StringVector& word = doc.back();
+            char const* _field = static_cast<char const*>(
+                    std::memchr(p, '\t', _eol - p));
+            while (_field != 0) {
+                char const* _next = static_cast<char const*>(
+                        std::memchr(_field + 1, '\t', _eol - _field - 1));
+                word.push_back(std::string(_field + 1,
+                                           _next == 0 ? _eol : _next));
+                _field = _next;
+            }
+            p = _eol + 1;
+        }
+        if (p == end || _eol == 0) {
+            // the end of the file was reached before an empty line
+            if (last != NULL) {
+                last->first.swap(documents->back().first);
+                last->second.swap(documents->back().second);
+            }
+            documents->pop_back();
+            return;
+        }
+        ++p; // the empty line
+    }
+    if (last != NULL) {
+        // the end of the file was reached while reading a name
+        last->first = std::string(p, end);
+    }
+}
+
+/// Read a text corpus file using numThreads parser threads.
+Corpus readCorpusFromFileParallel(std::string const& filename,
+        long const numThreads) throw (std::runtime_error) {
+    MappedFile file(filename);
+    char const* data = file.data();
+    char const* end = data + file.size();
+
+    // split the file after empty lines ending a document, ie empty lines
+    // following a non-empty line
+    std::vector<char const*> bounds;
+    bounds.push_back(data);
+    for (long i=1 ; i<numThreads ; ++i) {
+        char const* p = std::max(bounds.back(), data + file.size() * i /
+                                                numThreads);
+        while (p < end && !(*p == '\n' && p - data >= 2 &&
+                            *(p-1) == '\n' && *(p-2) != '\n')) {
+            p = static_cast<char const*>(std::memchr(p + 1, '\n',
+                                                     end - p - 1));
+            if (p == 0) {
+                p = end;
+            }
+        }
+        bounds.push_back(p < end ? p + 1 : end);
+    }
+    bounds.push_back(end);
+
+    // the last non-empty chunk ends the file
+    long lastChunk = 0;
+    for (long i=0 ; i<numThreads ; ++i) {
+        if (bounds[i] < end) {
+            lastChunk = i;
+        }
+    }
+
+    std::vector<NamedDocumentVector> chunks(numThreads);
+    NamedDocument last;
+    boost::thread_group threads;
+    for (long i=0 ; i<numThreads ; ++i) {
+        threads.add_thread(new boost::thread(parseCorpusChunk, bounds[i],
+                bounds[i+1], &chunks[i], i == lastChunk ? &last : NULL));
+    }
+    threads.join_all();
+
+    Corpus corpus;
+    for (auto i=chunks.begin() ; i!=chunks.end() ; ++i) {
+        for (auto j=i->begin() ; j!=i->end() ; ++j) {
+            corpus[j->first].swap(j->second);
+        }
+        NamedDocumentVector().swap(*i);
+    }
+    // as in readCorpusFromStream, the last document does not replace an
+    // earlier one with the same name
+    if (corpus.find(last.first) == corpus.end()) {
+        corpus[last.first].swap(last.second);
     }
-    Corpus corpus = readCorpusFromStream(fin);
-    fin.close();
     return corpus;
 }
 
+Corpus readCorpusFromFile(std::string const& filename, long numThreads)
+throw (std::runtime_error) {
+    if (isBinaryCorpusFile(filename)) {
+        return BinaryCorpus(filename).corpus();
+    }
+    if (numThreads > 1 && detectCompression(filename) == COMPRESSION_NONE) {
+        return readCorpusFromFileParallel(filename, numThreads);
+    }
+    boost::iostreams::filtering_istream fin;
+    openInputFile(fin, filename);
+    return readCorpusFromStream(fin);
+}
+
 ////////////////////////////////////////////////////////////////////////////////
 // Corpus writing
 ////////////////////////////////////////////////////////////////////////////////
@@ -151,15 +350,17 @@ void writeCorpusToStream(std::ostream& os, Corpus const& corpus) {
     }
 }
 
-void writeCorpusToFile(std::string const& filename, Corpus const& corpus)
-throw (std::runtime_error) {
-    std::ofstream fout(filename.c_str(), std::ios::binary | std::ios::out);
-    if (!fout) {
-        fout.close();
-        throw std::runtime_error((ERR_COULD_NOT_WRITE_FILE + filename).c_str());
-    }
+void writeCorpusToFile(std::string const& filename, Corpus const& corpus,
+        std::string const& compression) throw (std::runtime_error) {
+    boost::iostreams::filtering_ostream fout;
+    openOutputFile(fout, filename, compression);
     writeCorpusToStream(fout, corpus);
-    fout.close();
+    fout.flush();
+    if (fout.fail()) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + filename);
+    }
+    // closing the chain writes the final compressed block
+    fout.reset();
 }
 
 Corpus
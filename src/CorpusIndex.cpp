@@ -0,0 +1,238 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <CorpusIndex.hpp>
+#include <MappedFile.hpp>
+
+#include <algorithm>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+
+#include <sys/stat.h>
+
+#define CORPUS_INDEX_HEADER "#pfeindex"
+
+namespace pfe {
+
+/// Read the size and modification time of the corpus file. The sidecar is
+/// only valid for the version of the corpus with the same stamp.
+void _corpusStamp(std::string const& filename, uint64_t& size,
+                  uint64_t& mtime) throw(std::runtime_error) {
+    struct stat st;
+    if (stat(filename.c_str(), &st) != 0) {
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE + filename);
+    }
+    size = st.st_size;
+    mtime = static_cast<uint64_t>(st.st_mtim.tv_sec) * 1000000000ULL +
+            st.st_mtim.tv_nsec;
+}
+
+CorpusIndex::CorpusIndex(std::string const& corpusFilename,
+                         std::string const& indexFilename)
+throw(std::runtime_error)
+    : _corpusFilename(corpusFilename), _indexFilename(indexFilename) {
+    if (detectCompression(corpusFilename) != COMPRESSION_NONE) {
+        throw std::runtime_error(ERR_COMPRESSED_FILE + corpusFilename);
+    }
+    if (_indexFilename.size() == 0) {
+        _indexFilename = corpusFilename + ".idx";
+    }
+    if (!load()) {
+        build();
+    }
+}
+
+/// Scan the corpus for document boundaries. The boundaries are the same
+/// @see:readCorpusFromStream uses.
+void CorpusIndex::build() throw(std::runtime_error) {
+    MappedFile file(_corpusFilename);
+    char const* data = file.data();
+    char const* end = data + file.size();
+    char const* p = data;
+
+    _entries.clear();
+    _positions.clear();
+    while (p < end) {
+        char const* _begin = p;
+        char const* _eol = static_cast<char const*>(
+                std::memchr(p, '\n', end - p));
+        CorpusIndexEntry entry;
+        entry.name = std::string(p, _eol == 0 ? end : _eol);
+        p = _eol == 0 ? end : _eol + 1;
+        // words continue until an empty line
+        while (p < end && *p != '\n') {
+            _eol = static_cast<char const*>(std::memchr(p, '\n', end - p));
+            p = _eol == 0 ? end : _eol + 1;
+        }
+        entry.offset = _begin - data;
+        entry.length = p - _begin;
+        if (p < end) {
+            ++p; // the empty line
+        }
+        // skip the empty fragment after the last document
+        if (entry.length == 0 || (p == end && entry.length == 1)) {
+            continue;
+        }
+        auto i = _positions.find(entry.name);
+        if (i != _positions.end()) {
+            _entries[i->second] = entry;
+        } else {
+            _positions[entry.name] = _entries.size();
+            _entries.push_back(entry);
+        }
+    }
+}
+
+/// Load the sidecar file. Return false if it does not exist or belongs to
+/// a different version of the corpus.
+bool CorpusIndex::load() throw(std::runtime_error) {
+    std::ifstream fin(_indexFilename.c_str(), std::ios::in | std::ios::binary);
+    if (fin.fail()) {
+        return false;
+    }
+    uint64_t corpusSize = 0;
+    uint64_t corpusMtime = 0;
+    _corpusStamp(_corpusFilename, corpusSize, corpusMtime);
+
+    std::string line;
+    std::string header;
+    uint64_t size = 0;
+    uint64_t mtime = 0;
+    std::getline(fin, line);
+    std::istringstream hs(line);
+    hs >> header >> size >> mtime;
+    if (header != CORPUS_INDEX_HEADER || size != corpusSize ||
+        mtime != corpusMtime) {
+        return false;
+    }
+
+    _entries.clear();
+    _positions.clear();
+    while (std::getline(fin, line)) {
+        CorpusIndexEntry entry;
+        size_t _tab1 = line.find('\t');
+        size_t _tab2 = line.find('\t', _tab1 + 1);
+        if (_tab1 == std::string::npos || _tab2 == std::string::npos) {
+            throw std::runtime_error(ERR_INVALID_CORPUS_INDEX +
+                                     _indexFilename);
+        }
+        std::istringstream(line.substr(0, _tab1)) >> entry.offset;
+        std::istringstream(line.substr(_tab1 + 1, _tab2 - _tab1 - 1))
+            >> entry.length;
+        entry.name = line.substr(_tab2 + 1);
+        if (entry.offset + entry.length > corpusSize) {
+            throw std::runtime_error(ERR_INVALID_CORPUS_INDEX +
+                                     _indexFilename);
+        }
+        _positions[entry.name] = _entries.size();
+        _entries.push_back(entry);
+    }
+    return true;
+}
+
+void CorpusIndex::save() const throw(std::runtime_error) {
+    std::ofstream fout(_indexFilename.c_str(),
+                       std::ios::out | std::ios::binary);
+    if (!fout) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + _indexFilename);
+    }
+    uint64_t corpusSize = 0;
+    uint64_t corpusMtime = 0;
+    _corpusStamp(_corpusFilename, corpusSize, corpusMtime);
+    fout << CORPUS_INDEX_HEADER << '\t' << corpusSize << '\t' << corpusMtime
+         << '\n';
+    for (auto i=_entries.begin() ; i!=_entries.end() ; ++i) {
+        fout << i->offset << '\t' << i->length << '\t' << i->name << '\n';
+    }
+    if (fout.fail()) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + _indexFilename);
+    }
+}
+
+CorpusIndexEntry const& CorpusIndex::entry(std::string const& docName) const
+throw(std::runtime_error) {
+    auto i = _positions.find(docName);
+    if (i == _positions.end()) {
+        throw std::runtime_error(ERR_DOCUMENT_NOT_FOUND);
+    }
+    return _entries[i->second];
+}
+
+StringVector CorpusIndex::names() const {
+    StringVector _names;
+    _names.reserve(_entries.size());
+    for (auto i=_entries.begin() ; i!=_entries.end() ; ++i) {
+        _names.push_back(i->name);
+    }
+    return _names;
+}
+
+/// Read the document at given location of an open corpus file.
+Document readIndexedDoc(std::ifstream& fin, CorpusIndexEntry const& entry,
+        std::string const& filename) throw(std::runtime_error) {
+    std::string buffer(entry.length, '\0');
+    fin.seekg(entry.offset);
+    fin.read(&buffer[0], entry.length);
+    if (fin.fail()) {
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE + filename);
+    }
+    std::string docName;
+    return readDocFromStr(buffer, docName);
+}
+
+Document readDocFromFile(CorpusIndex const& index, std::string const& docName)
+throw(std::runtime_error) {
+    CorpusIndexEntry const& entry = index.entry(docName);
+    std::ifstream fin(index.corpusFilename().c_str(),
+                      std::ios::in | std::ios::binary);
+    if (fin.fail()) {
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE +
+                                 index.corpusFilename());
+    }
+    return readIndexedDoc(fin, entry, index.corpusFilename());
+}
+
+Corpus corpusSample(CorpusIndex const& index,
+                    std::vector<std::string> const& docIds)
+throw(std::runtime_error) {
+    std::vector<CorpusIndexEntry const*> entries;
+    entries.reserve(docIds.size());
+    for (auto i=docIds.begin() ; i!=docIds.end() ; ++i) {
+        entries.push_back(&index.entry(*i));
+    }
+    // read in file order to keep the seeks short
+    std::sort(entries.begin(), entries.end(),
+              [](CorpusIndexEntry const* a, CorpusIndexEntry const* b) {
+                  return a->offset < b->offset;
+              });
+
+    std::ifstream fin(index.corpusFilename().c_str(),
+                      std::ios::in | std::ios::binary);
+    if (fin.fail()) {
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE +
+                                 index.corpusFilename());
+    }
+    Corpus _sample;
+    for (auto i=entries.begin() ; i!=entries.end() ; ++i) {
+        _sample[(*i)->name] = readIndexedDoc(fin, **i,
+                                             index.corpusFilename());
+    }
+    return _sample;
+}
+
+} // namespace pfe
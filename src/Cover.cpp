@@ -137,6 +137,25 @@ Cover<OrderedDocCover> asOrderedCover(Cover<BitsetDocCover> const& c) {
     return oc;
 }
 
+Cover<RoaringDocCover> asRoaringCover(Cover<OrderedDocCover> const& c) {
+    Cover<RoaringDocCover> rc;
+    auto names = c.names();
+    for (auto i=names.begin(); i!=names.end() ; ++i) {
+        rc.addDocCover(*i, RoaringDocCover(c.docCover(*i)));
+    }
+    return rc;
+}
+
+Cover<OrderedDocCover> asOrderedCover(Cover<RoaringDocCover> const& c) {
+    Cover<OrderedDocCover> oc;
+    auto names = c.names();
+    for (auto i=names.begin(); i!=names.end() ; ++i) {
+        RoaringDocCover rdc(c.docCover(*i));
+        oc.addDocCover(*i, OrderedDocCover(rdc.docSize(), rdc.indices()));
+    }
+    return oc;
+}
+
 std::vector<long>
 cumulativeOrdering(std::vector<OrderedCover> const& covers,
                    OrderedCover const& trueCover,
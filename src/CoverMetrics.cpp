@@ -67,12 +67,16 @@ double CoverMetrics::fnrate() const {
 }
 
 double CoverMetrics::matthews() const {
-    long numerator   = _tp*_tn - _fp*_fn;
-    long denominator = (_tp + _fp)*(_tp + _fn)*(_tn + _fp)*(_tn + _fn);
+    // compute in floating point, the products overflow long on large
+    // corpora
+    double numerator   = static_cast<double>(_tp)*_tn -
+                         static_cast<double>(_fp)*_fn;
+    double denominator = static_cast<double>(_tp + _fp)*(_tp + _fn)*
+                         static_cast<double>(_tn + _fp)*(_tn + _fn);
     if (denominator == 0) {
         return std::sqrt(-1); // return NaN
     }
-    return numerator / std::sqrt(static_cast<double>(denominator));
+    return numerator / std::sqrt(denominator);
 }
 double CoverMetrics::support() const {
     return _tp + _fp;
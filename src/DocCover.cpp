@@ -25,6 +25,61 @@ namespace pfe {
 // OrderedDocCover
 ////////////////////////////////////////////////////////////////////////////////
 
+/// Size ratio of two covers above which the elements of the smaller cover
+/// are searched in the larger one instead of merging the covers.
+#define GALLOP_RATIO 16
+
+/// Exponential search for the first element not less than value.
+template<class I> I _gallop(I first, I const last, long const value) {
+    if (first == last || !(*first < value)) {
+        return first;
+    }
+    long bound = 1;
+    while (bound < last - first && first[bound] < value) {
+        bound *= 2;
+    }
+    return std::lower_bound(first + bound / 2,
+                            first + std::min<long>(bound, last - first),
+                            value);
+}
+
+/// Call f(value) for the common elements of two sorted vectors in
+/// increasing order. If the sizes are skewed, the elements of the smaller
+/// vector are searched in the larger one, which is logarithmic in the size
+/// of the larger vector.
+template<class F> void _forEachCommon(LongVector const& a,
+                                      LongVector const& b, F f) {
+    bool const aSmaller = a.size() <= b.size();
+    LongVector const& small = aSmaller ? a : b;
+    LongVector const& large = aSmaller ? b : a;
+    auto j = large.begin();
+    if (small.size() * GALLOP_RATIO < large.size()) {
+        for (auto i=small.begin() ; i!=small.end() ; ++i) {
+            j = _gallop(j, large.end(), *i);
+            if (j == large.end()) {
+                return;
+            }
+            if (*j == *i) {
+                f(*i);
+                ++j;
+            }
+        }
+        return;
+    }
+    auto i = small.begin();
+    while (i != small.end() && j != large.end()) {
+        if (*i < *j) {
+            ++i;
+        } else if (*j < *i) {
+            ++j;
+        } else {
+            f(*i);
+            ++i;
+            ++j;
+        }
+    }
+}
+
 OrderedDocCover::OrderedDocCover(BitsetDocCover const& other)
     : DocCover(other.docSize()) {
     _indices.reserve(other.size());
@@ -53,57 +108,94 @@ throw(std::runtime_error) {
     if (docSize() != trueCover.docSize()) {
         throw std::runtime_error(ERR_MISMATCHING_DOC_SIZES);
     }
-    long tp = (*this & trueCover).size();
-    long fp = (*this - trueCover).size();
-    long fn = (trueCover - *this).size();
-    long tn = docSize() - (*this | trueCover).size();
-    return CoverMetrics(tp, fp, tn, fn);
+    // count the common elements in a single pass
+    long tp = 0;
+    _forEachCommon(_indices, trueCover._indices, [&tp](long) {
+        ++tp;
+    });
+    long predicted = _indices.size();
+    long actual = trueCover._indices.size();
+    return CoverMetrics(tp, predicted - tp,
+                        docSize() - (predicted + actual - tp), actual - tp);
 }
 
 OrderedDocCover const&
 OrderedDocCover::operator&=(OrderedDocCover const& other) {
-    LongVector indices;
-    std::set_intersection(_indices.begin(),
-                          _indices.end(),
-                          other._indices.begin(),
-                          other._indices.end(),
-                          std::back_inserter(indices));
-    _indices = indices;
+    // the common elements are never ahead of the read position, so they
+    // can be compacted in place
+    size_t size = 0;
+    _forEachCommon(_indices, other._indices, [this, &size](long value) {
+        _indices[size++] = value;
+    });
+    _indices.resize(size);
     return *this;
 }
 
 OrderedDocCover const&
 OrderedDocCover::operator|=(OrderedDocCover const& other) {
+    if (other._indices.empty()) {
+        return *this;
+    }
     LongVector indices;
+    indices.reserve(_indices.size() + other._indices.size());
     std::set_union(_indices.begin(),
                    _indices.end(),
                    other._indices.begin(),
                    other._indices.end(),
                    std::back_inserter(indices));
-    _indices = indices;
+    _indices.swap(indices);
     return *this;
 }
 
 OrderedDocCover const&
 OrderedDocCover::operator-=(OrderedDocCover const& other) {
-    LongVector indices;
-    std::set_difference(_indices.begin(),
-                        _indices.end(),
-                        other._indices.begin(),
-                        other._indices.end(),
-                        std::back_inserter(indices));
-    _indices = indices;
+    if (this == &other) {
+        _indices.clear();
+        return *this;
+    }
+    LongVector const& b = other._indices;
+    auto out = _indices.begin();
+    auto i = _indices.begin();
+    if (b.size() * GALLOP_RATIO < _indices.size()) {
+        // few elements to remove, move the runs between them. Until the
+        // first removed element the runs are already in place, and copying
+        // them onto themselves is not allowed.
+        for (auto j=b.begin() ; j!=b.end() ; ++j) {
+            auto k = _gallop(i, _indices.end(), *j);
+            out = (out == i) ? k : std::copy(i, k, out);
+            i = (k != _indices.end() && *k == *j) ? k + 1 : k;
+        }
+        out = (out == i) ? _indices.end() : std::copy(i, _indices.end(), out);
+    } else {
+        bool const gallop = _indices.size() * GALLOP_RATIO < b.size();
+        auto j = b.begin();
+        for ( ; i!=_indices.end() ; ++i) {
+            if (gallop) {
+                j = _gallop(j, b.end(), *i);
+            } else {
+                while (j != b.end() && *j < *i) {
+                    ++j;
+                }
+            }
+            if (j == b.end() || *j != *i) {
+                *out++ = *i;
+            }
+        }
+    }
+    _indices.erase(out, _indices.end());
     return *this;
 }
+
 OrderedDocCover const&
 OrderedDocCover::operator^=(OrderedDocCover const& other) {
     LongVector indices;
+    indices.reserve(_indices.size() + other._indices.size());
     std::set_symmetric_difference(_indices.begin(),
                                   _indices.end(),
                                   other._indices.begin(),
                                   other._indices.end(),
                                   std::back_inserter(indices));
-    _indices = indices;
+    _indices.swap(indices);
     return *this;
 }
 
@@ -171,11 +263,18 @@ throw(std::runtime_error) {
     if (docSize() != trueCover.docSize()) {
         throw std::runtime_error(ERR_MISMATCHING_DOC_SIZES);
     }
-    long tp = (*this & trueCover).size();
-    long fp = (*this - trueCover).size();
-    long fn = (trueCover - *this).size();
-    long tn = docSize() - (*this | trueCover).size();
-    return CoverMetrics(tp, fp, tn, fn);
+    long predicted = _bits.count();
+    long actual = trueCover._bits.count();
+    // test the bits of the sparser cover against the other one
+    bool const sparse = predicted < actual;
+    boost::dynamic_bitset<> const& a = sparse ? _bits : trueCover._bits;
+    boost::dynamic_bitset<> const& b = sparse ? trueCover._bits : _bits;
+    long tp = 0;
+    for (size_t i=a.find_first() ; i!=a.npos ; i=a.find_next(i)) {
+        tp += b[i];
+    }
+    return CoverMetrics(tp, predicted - tp,
+                        docSize() - (predicted + actual - tp), actual - tp);
 }
 
 bool BitsetDocCover::operator==(BitsetDocCover const& other) const {
@@ -229,4 +328,394 @@ BitsetDocCover BitsetDocCover::operator^(BitsetDocCover const& other) const {
     return c;
 }
 
+////////////////////////////////////////////////////////////////////////////////
+// RoaringDocCover
+////////////////////////////////////////////////////////////////////////////////
+
+/// Number of 64-bit words in a bitmap container.
+#define ROARING_BITMAP_WORDS 1024
+
+/// Set operations of the roaring containers.
+enum { ROARING_AND, ROARING_OR, ROARING_ANDNOT, ROARING_XOR };
+
+inline bool _bitmapContains(std::vector<uint64_t> const& bitmap,
+                            uint16_t const value) {
+    return (bitmap[value >> 6] >> (value & 63)) & 1;
+}
+
+inline std::vector<uint64_t> _arrayToBitmap(std::vector<uint16_t> const& a) {
+    std::vector<uint64_t> bitmap(ROARING_BITMAP_WORDS, 0);
+    for (auto i=a.begin() ; i!=a.end() ; ++i) {
+        bitmap[*i >> 6] |= 1ULL << (*i & 63);
+    }
+    return bitmap;
+}
+
+RoaringDocCover::RoaringDocCover(long const docSize,
+                                 LongVector const& indices)
+throw(std::runtime_error) : DocCover(docSize) {
+    for (auto i=indices.begin() ; i != indices.end() ; ++i) {
+        if (*i >= docSize || *i < 0) {
+            throw std::runtime_error(ERR_INVALID_COVER_ELEMENT);
+        }
+    }
+    LongVector s(indices);
+    std::sort(s.begin(), s.end());
+    s.erase(std::unique(s.begin(), s.end()), s.end());
+    for (auto i=s.begin() ; i!=s.end() ; ++i) {
+        long key = *i >> 16;
+        if (_containers.empty() || _containers.back().key != key) {
+            _containers.push_back(Container());
+            _containers.back().key = key;
+            _containers.back().cardinality = 0;
+        }
+        _containers.back().array.push_back(static_cast<uint16_t>(*i));
+        _containers.back().cardinality += 1;
+    }
+    for (auto i=_containers.begin() ; i!=_containers.end() ; ++i) {
+        normalize(*i);
+    }
+}
+
+RoaringDocCover::RoaringDocCover(OrderedDocCover const& other)
+    : DocCover(other.docSize()) {
+    *this = RoaringDocCover(other.docSize(), other.indices());
+}
+
+LongVector RoaringDocCover::indices() const {
+    LongVector _indices;
+    _indices.reserve(size());
+    for (auto i=_containers.begin() ; i!=_containers.end() ; ++i) {
+        long high = i->key << 16;
+        if (i->bitmap.empty()) {
+            for (auto j=i->array.begin() ; j!=i->array.end() ; ++j) {
+                _indices.push_back(high | *j);
+            }
+            continue;
+        }
+        for (long w=0 ; w<ROARING_BITMAP_WORDS ; ++w) {
+            for (uint64_t word=i->bitmap[w] ; word!=0 ; word&=word-1) {
+                _indices.push_back(high | (w << 6) | __builtin_ctzll(word));
+            }
+        }
+    }
+    return _indices;
+}
+
+/// Call f(container, lo, hi) for every container overlapping range
+/// [first, last), where [lo, hi) is the overlapping range of low bits.
+template<class F> void
+RoaringDocCover::forEachInRange(long const first, long const last,
+                                F f) const {
+    if (first >= last) {
+        return;
+    }
+    long const firstKey = first >> 16;
+    long const lastKey  = (last - 1) >> 16;
+    auto i = std::lower_bound(_containers.begin(), _containers.end(),
+                              firstKey, [](Container const& c, long key) {
+        return c.key < key;
+    });
+    for ( ; i!=_containers.end() && i->key<=lastKey ; ++i) {
+        long lo = (i->key == firstKey) ? (first & 0xffff) : 0;
+        long hi = (i->key == lastKey) ? ((last - 1) & 0xffff) + 1 : 0x10000;
+        f(*i, lo, hi);
+    }
+}
+
+LongVector RoaringDocCover::indices(long const first, long const last) const {
+    LongVector _indices;
+    forEachInRange(first, last, [&](Container const& c, long lo, long hi) {
+        long high = c.key << 16;
+        if (c.bitmap.empty()) {
+            auto j = std::lower_bound(c.array.begin(), c.array.end(), lo);
+            for ( ; j!=c.array.end() && *j<hi ; ++j) {
+                _indices.push_back(high | *j);
+            }
+            return;
+        }
+        for (long k=lo ; k<hi ; ++k) {
+            if (_bitmapContains(c.bitmap, k)) {
+                _indices.push_back(high | k);
+            }
+        }
+    });
+    return _indices;
+}
+
+long RoaringDocCover::count(long const first, long const last) const {
+    long _count = 0;
+    forEachInRange(first, last, [&](Container const& c, long lo, long hi) {
+        if (c.bitmap.empty()) {
+            _count += std::lower_bound(c.array.begin(), c.array.end(), hi) -
+                      std::lower_bound(c.array.begin(), c.array.end(), lo);
+            return;
+        }
+        if (lo == 0 && hi == 0x10000) {
+            _count += c.cardinality;
+            return;
+        }
+        for (long w=lo>>6 ; w<=(hi-1)>>6 ; ++w) {
+            uint64_t word = c.bitmap[w];
+            if (w == lo>>6) {
+                word &= ~0ULL << (lo & 63);
+            }
+            if (w == (hi-1)>>6 && (hi & 63) != 0) {
+                word &= ~0ULL >> (64 - (hi & 63));
+            }
+            _count += __builtin_popcountll(word);
+        }
+    });
+    return _count;
+}
+
+long RoaringDocCover::size() const {
+    long _size = 0;
+    for (auto i=_containers.begin() ; i!=_containers.end() ; ++i) {
+        _size += i->cardinality;
+    }
+    return _size;
+}
+
+/// Use the representation that fits the number of elements.
+void RoaringDocCover::normalize(Container& c) {
+    if (c.bitmap.empty() && c.cardinality > ROARING_ARRAY_LIMIT) {
+        c.bitmap = _arrayToBitmap(c.array);
+        std::vector<uint16_t>().swap(c.array);
+    } else if (!c.bitmap.empty() && c.cardinality <= ROARING_ARRAY_LIMIT) {
+        c.array.reserve(c.cardinality);
+        for (long w=0 ; w<ROARING_BITMAP_WORDS ; ++w) {
+            for (uint64_t word=c.bitmap[w] ; word!=0 ; word&=word-1) {
+                c.array.push_back((w << 6) | __builtin_ctzll(word));
+            }
+        }
+        std::vector<uint64_t>().swap(c.bitmap);
+    }
+}
+
+/// Count the common elements of two containers with the same key.
+long RoaringDocCover::intersectionSize(Container const& a,
+                                       Container const& b) {
+    long count = 0;
+    if (!a.bitmap.empty() && !b.bitmap.empty()) {
+        for (long w=0 ; w<ROARING_BITMAP_WORDS ; ++w) {
+            count += __builtin_popcountll(a.bitmap[w] & b.bitmap[w]);
+        }
+    } else if (!a.bitmap.empty() || !b.bitmap.empty()) {
+        Container const& _array  = a.bitmap.empty() ? a : b;
+        Container const& _bitmap = a.bitmap.empty() ? b : a;
+        for (auto i=_array.array.begin() ; i!=_array.array.end() ; ++i) {
+            count += _bitmapContains(_bitmap.bitmap, *i);
+        }
+    } else {
+        auto i = a.array.begin();
+        auto j = b.array.begin();
+        while (i != a.array.end() && j != b.array.end()) {
+            if (*i < *j) {
+                ++i;
+            } else if (*j < *i) {
+                ++j;
+            } else {
+                ++count;
+                ++i;
+                ++j;
+            }
+        }
+    }
+    return count;
+}
+
+/// Apply a set operation to two containers with the same key.
+RoaringDocCover::Container
+RoaringDocCover::combine(Container const& a, Container const& b,
+                         int const op) {
+    Container c;
+    c.key = a.key;
+    bool const aArray = a.bitmap.empty();
+    bool const bArray = b.bitmap.empty();
+    if (aArray && bArray) {
+        auto out = std::back_inserter(c.array);
+        switch (op) {
+        case ROARING_AND:
+            std::set_intersection(a.array.begin(), a.array.end(),
+                                  b.array.begin(), b.array.end(), out);
+            break;
+        case ROARING_OR:
+            std::set_union(a.array.begin(), a.array.end(),
+                           b.array.begin(), b.array.end(), out);
+            break;
+        case ROARING_ANDNOT:
+            std::set_difference(a.array.begin(), a.array.end(),
+                                b.array.begin(), b.array.end(), out);
+            break;
+        default:
+            std::set_symmetric_difference(a.array.begin(), a.array.end(),
+                                          b.array.begin(), b.array.end(),
+                                          out);
+        }
+        c.cardinality = c.array.size();
+    } else if (aArray && (op == ROARING_AND || op == ROARING_ANDNOT)) {
+        // filter the array through the bitmap
+        bool const keep = (op == ROARING_AND);
+        for (auto i=a.array.begin() ; i!=a.array.end() ; ++i) {
+            if (_bitmapContains(b.bitmap, *i) == keep) {
+                c.array.push_back(*i);
+            }
+        }
+        c.cardinality = c.array.size();
+    } else if (bArray && op == ROARING_AND) {
+        return combine(b, a, op);
+    } else {
+        c.bitmap = aArray ? _arrayToBitmap(a.array) : a.bitmap;
+        std::vector<uint64_t> const& other = bArray ?
+            _arrayToBitmap(b.array) : b.bitmap;
+        c.cardinality = 0;
+        for (long w=0 ; w<ROARING_BITMAP_WORDS ; ++w) {
+            switch (op) {
+            case ROARING_AND:
+                c.bitmap[w] &= other[w];
+                break;
+            case ROARING_OR:
+                c.bitmap[w] |= other[w];
+                break;
+            case ROARING_ANDNOT:
+                c.bitmap[w] &= ~other[w];
+                break;
+            default:
+                c.bitmap[w] ^= other[w];
+            }
+            c.cardinality += __builtin_popcountll(c.bitmap[w]);
+        }
+    }
+    normalize(c);
+    return c;
+}
+
+/// Apply a set operation to all containers. Containers only in this cover
+/// are kept by or, and-not and xor, containers only in the other cover by or
+/// and xor.
+void RoaringDocCover::combine(RoaringDocCover const& other, int const op) {
+    if (docSize() != other.docSize()) {
+        throw std::runtime_error(ERR_MISMATCHING_DOC_SIZES);
+    }
+    bool const keepFirst  = (op != ROARING_AND);
+    bool const keepSecond = (op == ROARING_OR || op == ROARING_XOR);
+    std::vector<Container> _result;
+    _result.reserve(_containers.size() + other._containers.size());
+    auto i = _containers.begin();
+    auto j = other._containers.begin();
+    while (i != _containers.end() || j != other._containers.end()) {
+        if (j == other._containers.end() ||
+                (i != _containers.end() && i->key < j->key)) {
+            if (keepFirst) {
+                _result.push_back(Container());
+                _result.back().key = i->key;
+                _result.back().cardinality = i->cardinality;
+                _result.back().array.swap(i->array);
+                _result.back().bitmap.swap(i->bitmap);
+            }
+            ++i;
+        } else if (i == _containers.end() || j->key < i->key) {
+            if (keepSecond) {
+                _result.push_back(*j);
+            }
+            ++j;
+        } else {
+            Container c = combine(*i, *j, op);
+            if (c.cardinality > 0) {
+                _result.push_back(Container());
+                _result.back().key = c.key;
+                _result.back().cardinality = c.cardinality;
+                _result.back().array.swap(c.array);
+                _result.back().bitmap.swap(c.bitmap);
+            }
+            ++i;
+            ++j;
+        }
+    }
+    _containers.swap(_result);
+}
+
+CoverMetrics RoaringDocCover::metrics(RoaringDocCover const& trueCover) const
+throw(std::runtime_error) {
+    if (docSize() != trueCover.docSize()) {
+        throw std::runtime_error(ERR_MISMATCHING_DOC_SIZES);
+    }
+    long tp = 0;
+    auto i = _containers.begin();
+    auto j = trueCover._containers.begin();
+    while (i != _containers.end() && j != trueCover._containers.end()) {
+        if (i->key < j->key) {
+            ++i;
+        } else if (j->key < i->key) {
+            ++j;
+        } else {
+            tp += intersectionSize(*i, *j);
+            ++i;
+            ++j;
+        }
+    }
+    long const predicted = size();
+    long const actual = trueCover.size();
+    long fp = predicted - tp;
+    long fn = actual - tp;
+    long tn = docSize() - (predicted + actual - tp);
+    return CoverMetrics(tp, fp, tn, fn);
+}
+
+bool RoaringDocCover::operator==(RoaringDocCover const& other) const {
+    if (this == &other) { // same object
+        return true;
+    }
+    return docSize() == other.docSize() && _containers == other._containers;
+}
+
+RoaringDocCover const&
+RoaringDocCover::operator&=(RoaringDocCover const& other) {
+    combine(other, ROARING_AND);
+    return *this;
+}
+
+RoaringDocCover const&
+RoaringDocCover::operator|=(RoaringDocCover const& other) {
+    combine(other, ROARING_OR);
+    return *this;
+}
+
+RoaringDocCover const&
+RoaringDocCover::operator-=(RoaringDocCover const& other) {
+    combine(other, ROARING_ANDNOT);
+    return *this;
+}
+
+RoaringDocCover const&
+RoaringDocCover::operator^=(RoaringDocCover const& other) {
+    combine(other, ROARING_XOR);
+    return *this;
+}
+
+RoaringDocCover RoaringDocCover::operator&(RoaringDocCover const& other) const {
+    RoaringDocCover c(*this);
+    c &= other;
+    return c;
+}
+
+RoaringDocCover RoaringDocCover::operator|(RoaringDocCover const& other) const {
+    RoaringDocCover c(*this);
+    c |= other;
+    return c;
+}
+
+RoaringDocCover RoaringDocCover::operator-(RoaringDocCover const& other) const {
+    RoaringDocCover c(*this);
+    c -= other;
+    return c;
+}
+
+RoaringDocCover RoaringDocCover::operator^(RoaringDocCover const& other) const {
+    RoaringDocCover c(*this);
+    c ^= other;
+    return c;
+}
+
 } // namespace pfe
@@ -0,0 +1,314 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <FlatCover.hpp>
+
+namespace pfe {
+
+/// Set operations of the flat covers.
+enum { FLAT_AND, FLAT_OR, FLAT_ANDNOT, FLAT_XOR };
+
+////////////////////////////////////////////////////////////////////////////////
+// DocumentOffsets
+////////////////////////////////////////////////////////////////////////////////
+
+template<class C> void _addCorpusDocuments(DocumentOffsets& offsets,
+                                           C const& corpus) {
+    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
+        offsets.addDocument(i->first, i->second.size());
+    }
+}
+
+DocumentOffsets::DocumentOffsets(Corpus const& corpus) : _offsets(1, 0) {
+    _addCorpusDocuments(*this, corpus);
+}
+
+DocumentOffsets::DocumentOffsets(IdCorpus const& corpus) : _offsets(1, 0) {
+    _addCorpusDocuments(*this, corpus);
+}
+
+DocumentOffsets::DocumentOffsets(BinaryCorpus const& corpus)
+    : _offsets(1, 0) {
+    _addCorpusDocuments(*this, corpus);
+}
+
+void DocumentOffsets::addDocument(std::string const& docName,
+                                  long const docSize)
+throw(std::runtime_error) {
+    if (docSize < 0) {
+        throw std::runtime_error(ERR_DOCSIZE_LESS_0);
+    }
+    if (!_ids.insert(std::make_pair(docName, _names.size())).second) {
+        throw std::runtime_error(ERR_DOC_WITH_NAME_EXIST);
+    }
+    _names.push_back(docName);
+    _offsets.push_back(_offsets.back() + docSize);
+}
+
+long DocumentOffsets::id(std::string const& docName) const
+throw(std::range_error) {
+    auto i = _ids.find(docName);
+    if (i == _ids.end()) {
+        throw std::range_error(ERR_DOCUMENT_NOT_FOUND);
+    }
+    return i->second;
+}
+
+DocumentOffsetsPtr corpusOffsets(Corpus const& corpus) {
+    return DocumentOffsetsPtr(new DocumentOffsets(corpus));
+}
+
+DocumentOffsetsPtr corpusOffsets(IdCorpus const& corpus) {
+    return DocumentOffsetsPtr(new DocumentOffsets(corpus));
+}
+
+DocumentOffsetsPtr corpusOffsets(BinaryCorpus const& corpus) {
+    return DocumentOffsetsPtr(new DocumentOffsets(corpus));
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// FlatCover
+////////////////////////////////////////////////////////////////////////////////
+
+FlatCover::FlatCover(DocumentOffsetsPtr const& offsets)
+    : _offsets(offsets), _docs(offsets->size()),
+      _elements(offsets->corpusSize()) {
+}
+
+FlatCover::FlatCover(OrderedCover const& cover,
+                     DocumentOffsetsPtr const& offsets)
+throw(std::range_error)
+    : _offsets(offsets), _docs(offsets->size()) {
+    LongVector _positions;
+    _positions.reserve(cover.size());
+    std::map<std::string, OrderedDocCover> _map = cover.map();
+    for (auto i=_map.begin() ; i!=_map.end() ; ++i) {
+        long id = offsets->id(i->first);
+        if (i->second.docSize() != offsets->docSize(id)) {
+            throw std::range_error(ERR_MISMATCHING_DOC_SIZES);
+        }
+        _docs[id] = true;
+        LongVector const _indices = i->second.indices();
+        for (auto j=_indices.begin() ; j!=_indices.end() ; ++j) {
+            _positions.push_back(offsets->offset(id) + *j);
+        }
+    }
+    _elements = RoaringDocCover(offsets->corpusSize(), _positions);
+}
+
+StringVector FlatCover::names() const {
+    StringVector _names;
+    for (size_t i=_docs.find_first() ; i!=_docs.npos ; i=_docs.find_next(i)) {
+        _names.push_back(_offsets->name(i));
+    }
+    return _names;
+}
+
+OrderedDocCover FlatCover::docCover(std::string const& docName) const
+throw(std::range_error) {
+    if (!_offsets) {
+        throw std::range_error(ERR_DOC_NOT_FOUNT);
+    }
+    long id = _offsets->id(docName);
+    if (!_docs[id]) {
+        throw std::range_error(ERR_DOC_NOT_FOUNT);
+    }
+    long offset = _offsets->offset(id);
+    LongVector _indices = _elements.indices(offset,
+                                            offset + _offsets->docSize(id));
+    for (auto i=_indices.begin() ; i!=_indices.end() ; ++i) {
+        *i -= offset;
+    }
+    return OrderedDocCover(_offsets->docSize(id), _indices);
+}
+
+OrderedCover FlatCover::orderedCover() const {
+    OrderedCover _cover;
+    for (size_t i=_docs.find_first() ; i!=_docs.npos ; i=_docs.find_next(i)) {
+        _cover.addDocCover(_offsets->name(i), docCover(_offsets->name(i)));
+    }
+    return _cover;
+}
+
+bool FlatCover::sameOffsets(FlatCover const& other) const {
+    return _offsets == other._offsets || *_offsets == *other._offsets;
+}
+
+/// Apply a set operation with the semantics of @see:Cover. Documents only
+/// in this cover are kept by or, and-not and xor, documents only in the
+/// other cover by or and xor.
+void FlatCover::combine(FlatCover const& other, int const op)
+throw(std::runtime_error) {
+    if (!other._offsets) { // other cover is empty
+        if (_offsets && op == FLAT_AND) {
+            *this = FlatCover(_offsets);
+        }
+        return;
+    }
+    if (!_offsets) {
+        *this = FlatCover(other._offsets);
+    } else if (!sameOffsets(other)) {
+        throw std::runtime_error(ERR_MISMATCHING_OFFSETS);
+    }
+    switch (op) {
+    case FLAT_AND:
+        _docs &= other._docs;
+        _elements &= other._elements;
+        break;
+    case FLAT_OR:
+        _docs |= other._docs;
+        _elements |= other._elements;
+        break;
+    case FLAT_ANDNOT:
+        _elements -= other._elements;
+        break;
+    default:
+        _docs |= other._docs;
+        _elements ^= other._elements;
+    }
+}
+
+CoverMetrics FlatCover::metrics(FlatCover const& trueCover) const
+throw(std::runtime_error) {
+    if (!_offsets || !trueCover._offsets) {
+        return CoverMetrics(0, size(), 0, trueCover.size());
+    }
+    if (!sameOffsets(trueCover)) {
+        throw std::runtime_error(ERR_MISMATCHING_OFFSETS);
+    }
+    long tp = _elements.metrics(trueCover._elements).tp();
+    long fp = size() - tp;
+    long fn = trueCover.size() - tp;
+    // true negatives are counted only in documents present in both covers,
+    // so leave out the elements of the other documents
+    long common = size() + trueCover.size() - tp;
+    boost::dynamic_bitset<> _only = _docs ^ trueCover._docs;
+    for (size_t i=_only.find_first() ; i!=_only.npos ;
+            i=_only.find_next(i)) {
+        long offset = _offsets->offset(i);
+        long last = offset + _offsets->docSize(i);
+        common -= _docs[i] ? _elements.count(offset, last) :
+                             trueCover._elements.count(offset, last);
+    }
+    long tn = -common;
+    boost::dynamic_bitset<> _both = _docs & trueCover._docs;
+    for (size_t i=_both.find_first() ; i!=_both.npos ;
+            i=_both.find_next(i)) {
+        tn += _offsets->docSize(i);
+    }
+    return CoverMetrics(tp, fp, tn, fn);
+}
+
+std::map<std::string, CoverMetrics>
+FlatCover::documentMetrics(FlatCover const& trueCover) const
+throw(std::runtime_error) {
+    std::map<std::string, CoverMetrics> m;
+    if (!_offsets || !trueCover._offsets) {
+        FlatCover const& _cover = _offsets ? *this : trueCover;
+        StringVector _names = _cover.names();
+        for (auto i=_names.begin() ; i!=_names.end() ; ++i) {
+            long n = _cover.docCover(*i).size();
+            m[*i] = _offsets ? CoverMetrics(0, n, 0, 0) :
+                               CoverMetrics(0, 0, 0, n);
+        }
+        return m;
+    }
+    if (!sameOffsets(trueCover)) {
+        throw std::runtime_error(ERR_MISMATCHING_OFFSETS);
+    }
+    RoaringDocCover _tp = _elements & trueCover._elements;
+    boost::dynamic_bitset<> _any = _docs | trueCover._docs;
+    for (size_t i=_any.find_first() ; i!=_any.npos ; i=_any.find_next(i)) {
+        long offset = _offsets->offset(i);
+        long last = offset + _offsets->docSize(i);
+        long predicted = _elements.count(offset, last);
+        long actual = trueCover._elements.count(offset, last);
+        if (!trueCover._docs[i]) {
+            m[_offsets->name(i)] = CoverMetrics(0, predicted, 0, 0);
+        } else if (!_docs[i]) {
+            m[_offsets->name(i)] = CoverMetrics(0, 0, 0, actual);
+        } else {
+            long tp = _tp.count(offset, last);
+            m[_offsets->name(i)] = CoverMetrics(tp, predicted - tp,
+                    _offsets->docSize(i) - (predicted + actual - tp),
+                    actual - tp);
+        }
+    }
+    return m;
+}
+
+bool FlatCover::operator==(FlatCover const& other) const {
+    if (!_offsets || !other._offsets) {
+        return numDocs() == 0 && other.numDocs() == 0;
+    }
+    return sameOffsets(other) && _docs == other._docs &&
+           _elements == other._elements;
+}
+
+FlatCover const& FlatCover::operator&=(FlatCover const& other)
+throw(std::runtime_error) {
+    combine(other, FLAT_AND);
+    return *this;
+}
+
+FlatCover const& FlatCover::operator|=(FlatCover const& other)
+throw(std::runtime_error) {
+    combine(other, FLAT_OR);
+    return *this;
+}
+
+FlatCover const& FlatCover::operator-=(FlatCover const& other)
+throw(std::runtime_error) {
+    combine(other, FLAT_ANDNOT);
+    return *this;
+}
+
+FlatCover const& FlatCover::operator^=(FlatCover const& other)
+throw(std::runtime_error) {
+    combine(other, FLAT_XOR);
+    return *this;
+}
+
+FlatCover FlatCover::operator&(FlatCover const& other) const
+throw(std::runtime_error) {
+    FlatCover c(*this);
+    c &= other;
+    return c;
+}
+
+FlatCover FlatCover::operator|(FlatCover const& other) const
+throw(std::runtime_error) {
+    FlatCover c(*this);
+    c |= other;
+    return c;
+}
+
+FlatCover FlatCover::operator-(FlatCover const& other) const
+throw(std::runtime_error) {
+    FlatCover c(*this);
+    c -= other;
+    return c;
+}
+
+FlatCover FlatCover::operator^(FlatCover const& other) const
+throw(std::runtime_error) {
+    FlatCover c(*this);
+    c ^= other;
+    return c;
+}
+
+} // namespace pfe
@@ -0,0 +1,56 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <MappedFile.hpp>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+namespace pfe {
+
+MappedFile::MappedFile(std::string const& filename) throw(std::runtime_error)
+    : _data(0), _size(0) {
+    int fd = open(filename.c_str(), O_RDONLY);
+    if (fd < 0) {
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE + filename);
+    }
+    struct stat st;
+    if (fstat(fd, &st) != 0) {
+        close(fd);
+        throw std::runtime_error(ERR_COULD_NOT_READ_FILE + filename);
+    }
+    _size = st.st_size;
+    if (_size > 0) { // empty files cannot be mapped
+        _data = mmap(0, _size, PROT_READ, MAP_SHARED, fd, 0);
+        if (_data == MAP_FAILED) {
+            _data = 0;
+            close(fd);
+            throw std::runtime_error(ERR_COULD_NOT_READ_FILE + filename);
+        }
+    }
+    close(fd);
+}
+
+MappedFile::~MappedFile() {
+    if (_data != 0) {
+        munmap(_data, _size);
+    }
+}
+
+} // namespace pfe
@@ -0,0 +1,67 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <MiningMonitor.hpp>
+
+#include <cstdarg>
+#include <cstdio>
+
+#include <boost/date_time/posix_time/posix_time.hpp>
+
+namespace pfe {
+
+namespace {
+volatile bool _verbose = true;
+}
+
+LevelStats::LevelStats()
+: level(0), numCandidates(0), numFrequent(0), evaluateTime(0.0),
+  candidateTime(0.0), numSpilledRuns(0), peakCacheSize(0) {
+}
+
+MiningMonitor::~MiningMonitor() {
+}
+
+void MiningMonitor::onLevel(LevelStats const& stats) {
+}
+
+void setMiningVerbose(bool verbose) {
+    _verbose = verbose;
+}
+
+bool miningVerbose() {
+    return _verbose;
+}
+
+void miningLog(char const* format, ...) {
+    if (!_verbose) {
+        return;
+    }
+    va_list _args;
+    va_start(_args, format);
+    vfprintf(stderr, format, _args);
+    va_end(_args);
+}
+
+double wallTime() {
+    using namespace boost::posix_time;
+    static ptime const _epoch(boost::gregorian::date(1970, 1, 1));
+    return (microsec_clock::universal_time() - _epoch).total_microseconds()
+           / 1e6;
+}
+
+} // namespace pfe
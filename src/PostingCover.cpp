@@ -0,0 +1,371 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <PostingCover.hpp>
+
+#include <algorithm>
+
+namespace pfe {
+
+/// Append an unsigned integer in LEB128 encoding.
+inline void putVarint(std::vector<uint8_t>& data, uint64_t value) {
+    while (value >= 0x80) {
+        data.push_back(static_cast<uint8_t>(value) | 0x80);
+        value >>= 7;
+    }
+    data.push_back(static_cast<uint8_t>(value));
+}
+
+/// Decode an unsigned integer in LEB128 encoding and advance the pointer.
+inline uint64_t getVarint(uint8_t const*& p) {
+    uint64_t value = 0;
+    for (int shift=0 ; ; shift+=7) {
+        uint8_t byte = *p++;
+        value |= static_cast<uint64_t>(byte & 0x7f) << shift;
+        if (byte < 0x80) {
+            return value;
+        }
+    }
+}
+
+/// Sequential reader of the document entries of a posting cover.
+struct PostingEntryReader {
+    uint8_t const* p;
+    uint8_t const* end;
+    long docId;
+    long docSize;
+    long count;
+    uint8_t const* elems;
+    uint8_t const* elemsEnd;
+
+    PostingEntryReader(std::vector<uint8_t> const& data)
+        : p(data.data()), end(data.data() + data.size()), docId(-1),
+          docSize(0), count(0), elems(p), elemsEnd(p) { }
+    /// Advance to the next document entry, return false at the end.
+    bool next() {
+        if (p >= end) {
+            docId = -1;
+            return false;
+        }
+        docId   += getVarint(p) + 1;
+        docSize  = getVarint(p);
+        count    = getVarint(p);
+        size_t numBytes = getVarint(p);
+        elems    = p;
+        elemsEnd = p + numBytes;
+        p = elemsEnd;
+        return true;
+    }
+    /// Decode the cover elements of the current entry.
+    void decode(LongVector& indices) const {
+        indices.clear();
+        indices.reserve(count);
+        long value = -1;
+        for (uint8_t const* q=elems ; q<elemsEnd ; ) {
+            value += getVarint(q) + 1;
+            indices.push_back(value);
+        }
+    }
+};
+
+/// Sequential reader of the cover elements of a document entry.
+struct PostingElemReader {
+    uint8_t const* p;
+    uint8_t const* end;
+    long value;
+
+    PostingElemReader(PostingEntryReader const& entry)
+        : p(entry.elems), end(entry.elemsEnd), value(-1) {
+        next();
+    }
+    bool valid() const {
+        return value >= 0;
+    }
+    void next() {
+        if (p < end) {
+            value += getVarint(p) + 1;
+        } else {
+            value = -1;
+        }
+    }
+};
+
+/// Encoder of the cover elements of a single document entry.
+struct PostingElemWriter {
+    std::vector<uint8_t> data;
+    long count;
+    long last;
+
+    void clear() {
+        data.clear();
+        count = 0;
+        last  = -1;
+    }
+    void add(long const value) {
+        putVarint(data, value - last - 1);
+        last = value;
+        ++count;
+    }
+};
+
+void PostingCover::append(long const docId, long const docSize,
+        long const count, uint8_t const* elems, size_t const numBytes) {
+    putVarint(_data, docId - _lastDocId - 1);
+    putVarint(_data, docSize);
+    putVarint(_data, count);
+    putVarint(_data, numBytes);
+    _data.insert(_data.end(), elems, elems + numBytes);
+    _lastDocId = docId;
+    _numDocs  += 1;
+    _size     += count;
+}
+
+void PostingCover::addDocCover(long const docId, OrderedDocCover const& cover)
+throw(std::runtime_error) {
+    if (docId <= _lastDocId) {
+        throw std::runtime_error(ERR_UNORDERED_DOC_ID);
+    }
+    PostingElemWriter writer;
+    writer.clear();
+    LongVector const _indices = cover.indices();
+    for (auto i=_indices.begin() ; i!=_indices.end() ; ++i) {
+        writer.add(*i);
+    }
+    append(docId, cover.docSize(), writer.count, writer.data.data(),
+           writer.data.size());
+}
+
+LongVector PostingCover::docIds() const {
+    LongVector _ids;
+    _ids.reserve(_numDocs);
+    PostingEntryReader entry(_data);
+    while (entry.next()) {
+        _ids.push_back(entry.docId);
+    }
+    return _ids;
+}
+
+OrderedDocCover PostingCover::docCover(long const docId) const
+throw(std::range_error) {
+    PostingEntryReader entry(_data);
+    while (entry.next() && entry.docId <= docId) {
+        if (entry.docId == docId) {
+            LongVector _indices;
+            entry.decode(_indices);
+            return OrderedDocCover(entry.docSize, _indices);
+        }
+    }
+    throw std::range_error(ERR_DOC_NOT_FOUNT);
+}
+
+std::map<long, OrderedDocCover> PostingCover::map() const {
+    std::map<long, OrderedDocCover> m;
+    PostingEntryReader entry(_data);
+    LongVector _indices;
+    while (entry.next()) {
+        entry.decode(_indices);
+        m.insert(m.end(), {entry.docId,
+                           OrderedDocCover(entry.docSize, _indices)});
+    }
+    return m;
+}
+
+CoverMetrics PostingCover::metrics(PostingCover const& trueCover) const
+throw(std::runtime_error) {
+    long tp = 0;
+    long fp = 0;
+    long tn = 0;
+    long fn = 0;
+    PostingEntryReader a(_data);
+    PostingEntryReader b(trueCover._data);
+    a.next();
+    b.next();
+    while (a.docId >= 0 || b.docId >= 0) {
+        if (b.docId < 0 || (a.docId >= 0 && a.docId < b.docId)) {
+            // if second cover is not found, assume it is empty
+            fp += a.count;
+            a.next();
+        } else if (a.docId < 0 || b.docId < a.docId) {
+            // documents only in the true cover are false negatives
+            fn += b.count;
+            b.next();
+        } else {
+            if (a.docSize != b.docSize) {
+                throw std::runtime_error(ERR_MISMATCHING_DOC_SIZES);
+            }
+            // only the common elements need decoding
+            long common = 0;
+            PostingElemReader i(a);
+            PostingElemReader j(b);
+            while (i.valid() && j.valid()) {
+                if (i.value < j.value) {
+                    i.next();
+                } else if (j.value < i.value) {
+                    j.next();
+                } else {
+                    ++common;
+                    i.next();
+                    j.next();
+                }
+            }
+            tp += common;
+            fp += a.count - common;
+            fn += b.count - common;
+            tn += a.docSize - (a.count + b.count - common);
+            a.next();
+            b.next();
+        }
+    }
+    return CoverMetrics(tp, fp, tn, fn);
+}
+
+bool PostingCover::operator==(PostingCover const& other) const {
+    // the encoding is canonical
+    return _data == other._data;
+}
+
+/// Combine two covers document by document. Elements (and documents) only
+/// in the first cover are kept if keepFirst is set, elements only in the
+/// second cover if keepSecond is set and elements in both if keepBoth is
+/// set. Documents present in both covers are always kept.
+PostingCover PostingCover::combine(PostingCover const& other,
+        bool const keepFirst, bool const keepSecond,
+        bool const keepBoth) const throw(std::runtime_error) {
+    PostingCover _result;
+    _result._data.reserve(std::max(_data.size(), other._data.size()));
+    PostingElemWriter writer;
+    PostingEntryReader a(_data);
+    PostingEntryReader b(other._data);
+    a.next();
+    b.next();
+    while (a.docId >= 0 || b.docId >= 0) {
+        if (b.docId < 0 || (a.docId >= 0 && a.docId < b.docId)) {
+            if (keepFirst) {
+                _result.append(a.docId, a.docSize, a.count, a.elems,
+                               a.elemsEnd - a.elems);
+            }
+            a.next();
+        } else if (a.docId < 0 || b.docId < a.docId) {
+            if (keepSecond) {
+                _result.append(b.docId, b.docSize, b.count, b.elems,
+                               b.elemsEnd - b.elems);
+            }
+            b.next();
+        } else {
+            if (a.docSize != b.docSize) {
+                throw std::runtime_error(ERR_MISMATCHING_DOC_SIZES);
+            }
+            writer.clear();
+            PostingElemReader i(a);
+            PostingElemReader j(b);
+            while (i.valid() || j.valid()) {
+                if (!j.valid() || (i.valid() && i.value < j.value)) {
+                    if (keepFirst) {
+                        writer.add(i.value);
+                    }
+                    i.next();
+                } else if (!i.valid() || j.value < i.value) {
+                    if (keepSecond) {
+                        writer.add(j.value);
+                    }
+                    j.next();
+                } else {
+                    if (keepBoth) {
+                        writer.add(i.value);
+                    }
+                    i.next();
+                    j.next();
+                }
+            }
+            _result.append(a.docId, a.docSize, writer.count,
+                           writer.data.data(), writer.data.size());
+            a.next();
+            b.next();
+        }
+    }
+    return _result;
+}
+
+PostingCover const& PostingCover::operator&=(PostingCover const& other)
+throw(std::runtime_error) {
+    *this = combine(other, false, false, true);
+    return *this;
+}
+
+PostingCover const& PostingCover::operator|=(PostingCover const& other)
+throw(std::runtime_error) {
+    *this = combine(other, true, true, true);
+    return *this;
+}
+
+PostingCover const& PostingCover::operator-=(PostingCover const& other)
+throw(std::runtime_error) {
+    *this = combine(other, true, false, false);
+    return *this;
+}
+
+PostingCover const& PostingCover::operator^=(PostingCover const& other)
+throw(std::runtime_error) {
+    *this = combine(other, true, true, false);
+    return *this;
+}
+
+PostingCover PostingCover::operator&(PostingCover const& other) const
+throw(std::runtime_error) {
+    return combine(other, false, false, true);
+}
+
+PostingCover PostingCover::operator|(PostingCover const& other) const
+throw(std::runtime_error) {
+    return combine(other, true, true, true);
+}
+
+PostingCover PostingCover::operator-(PostingCover const& other) const
+throw(std::runtime_error) {
+    return combine(other, true, false, false);
+}
+
+PostingCover PostingCover::operator^(PostingCover const& other) const
+throw(std::runtime_error) {
+    return combine(other, true, true, false);
+}
+
+PostingCover encodeCover(OrderedCover const& cover, Vocabulary& documents) {
+    std::map<long, OrderedDocCover> _covers;
+    std::map<std::string, OrderedDocCover> _map = cover.map();
+    for (auto i=_map.begin() ; i!=_map.end() ; ++i) {
+        _covers[documents.add(i->first)] = i->second;
+    }
+    PostingCover _cover;
+    for (auto i=_covers.begin() ; i!=_covers.end() ; ++i) {
+        _cover.addDocCover(i->first, i->second);
+    }
+    return _cover;
+}
+
+OrderedCover decodeCover(PostingCover const& cover,
+                         Vocabulary const& documents)
+throw(std::range_error) {
+    OrderedCover _cover;
+    std::map<long, OrderedDocCover> _map = cover.map();
+    for (auto i=_map.begin() ; i!=_map.end() ; ++i) {
+        _cover.addDocCover(documents.attribute(i->first), i->second);
+    }
+    return _cover;
+}
+
+} // namespace pfe
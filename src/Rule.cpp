@@ -16,16 +16,165 @@
 */
 #include "Rule.hpp"
 
+#include <algorithm>
+
+#include <boost/thread.hpp>
 #include <boost/unordered_set.hpp>
 #include <boost/unordered_map.hpp>
 
 namespace pfe {
 
-std::map<Rule, OrderedDocCover>
-docBasicRuleCovers(Document const& document, long const radius) {
-    boost::unordered_map<Rule, LongVector > _map;
+////////////////////////////////////////////////////////////////////////////////
+// Attribute encoding
+////////////////////////////////////////////////////////////////////////////////
+
+IdRule encodeRule(Rule const& rule, Vocabulary& vocabulary) {
+    return IdRule(rule.first, vocabulary.add(rule.second));
+}
+
+Rule decodeRule(IdRule const& rule, Vocabulary const& vocabulary)
+throw(std::range_error) {
+    return Rule(rule.first, vocabulary.attribute(rule.second));
+}
+
+std::vector<IdConjunction>
+encodeConjunctions(std::vector<Conjunction> const& conjunctions,
+                   Vocabulary& vocabulary) {
+    std::vector<IdConjunction> _result(conjunctions.size());
+    for (size_t idx=0 ; idx<conjunctions.size() ; ++idx) {
+        Conjunction const& c = conjunctions[idx];
+        _result[idx].reserve(c.size());
+        for (auto i=c.begin() ; i!=c.end() ; ++i) {
+            _result[idx].push_back(encodeRule(*i, vocabulary));
+        }
+        std::sort(_result[idx].begin(), _result[idx].end());
+    }
+    return _result;
+}
+
+std::vector<Conjunction>
+decodeConjunctions(std::vector<IdConjunction> const& conjunctions,
+                   Vocabulary const& vocabulary)
+throw(std::range_error) {
+    std::vector<Conjunction> _result(conjunctions.size());
+    for (size_t idx=0 ; idx<conjunctions.size() ; ++idx) {
+        IdConjunction const& c = conjunctions[idx];
+        _result[idx].reserve(c.size());
+        for (auto i=c.begin() ; i!=c.end() ; ++i) {
+            _result[idx].push_back(decodeRule(*i, vocabulary));
+        }
+        std::sort(_result[idx].begin(), _result[idx].end());
+    }
+    return _result;
+}
+
+std::map<IdRule, OrderedCover>
+encodeRuleCovers(std::map<Rule, OrderedCover> const& covers,
+                 Vocabulary& vocabulary) {
+    std::map<IdRule, OrderedCover> _map;
+    for (auto i=covers.begin() ; i!=covers.end() ; ++i) {
+        _map[encodeRule(i->first, vocabulary)] = i->second;
+    }
+    return _map;
+}
+
+std::map<Rule, OrderedCover>
+decodeRuleCovers(std::map<IdRule, OrderedCover> const& covers,
+                 Vocabulary const& vocabulary)
+throw(std::range_error) {
+    std::map<Rule, OrderedCover> _map;
+    for (auto i=covers.begin() ; i!=covers.end() ; ++i) {
+        _map[decodeRule(i->first, vocabulary)] = i->second;
+    }
+    return _map;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// Rule extraction
+//
+// The extraction functions are written once as templates over the document
+// type D and rule type R, and instantiated for string and identifier based
+// documents below. Corpus level functions visit the documents through
+// forEachDocument, so they work on both in-memory corpora and CorpusReader.
+// In-memory corpora can also be processed by several threads: the documents
+// are split into contiguous shards, each thread collects the results of its
+// shard and the shard results are merged pairwise in parallel.
+////////////////////////////////////////////////////////////////////////////////
+
+/// Call f(docName, document) for every document of an in-memory corpus.
+template<class C, class F> void forEachDocument(C const& corpus, F f) {
+    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
+        f(i->first, i->second);
+    }
+}
+
+/// Call f(docName, document) for every remaining document of the reader.
+template<class F> void forEachDocument(CorpusReader& reader, F f) {
+    while (reader.next()) {
+        f(reader.name(), reader.document());
+    }
+}
+
+/// Call f(docName, document) for documents [first, last) of an in-memory
+/// corpus.
+template<class C, class F>
+void forEachDocument(C const& corpus, size_t first, size_t last, F f) {
+    auto i = corpus.begin();
+    for (size_t idx=0 ; idx<first ; ++idx) {
+        ++i;
+    }
+    for (size_t idx=first ; idx<last ; ++idx, ++i) {
+        f(i->first, i->second);
+    }
+}
+
+/// Split the corpus into numThreads shards and call
+/// f(result, docName, document) for the documents of each shard in a
+/// separate thread. Return the per-shard results.
+template<class M, class C, class F>
+std::vector<M> _shardDocuments(C const& corpus, long const numThreads, F f) {
+    std::vector<M> _shards(numThreads);
+    size_t const N = corpus.size();
+    boost::thread_group threads;
+    for (long t=0 ; t<numThreads ; ++t) {
+        size_t first = N * t / numThreads;
+        size_t last  = N * (t + 1) / numThreads;
+        M* _result = &_shards[t];
+        threads.create_thread([&corpus, &f, first, last, _result]() {
+            forEachDocument(corpus, first, last,
+                            [&](std::string const& docName,
+                                typename C::mapped_type const& doc) {
+                f(*_result, docName, doc);
+            });
+        });
+    }
+    threads.join_all();
+    return _shards;
+}
+
+/// Merge the shard results pairwise in parallel rounds, the result is left
+/// in the first shard. merge(a, b) should merge b into a.
+template<class M, class F> void _treeMerge(std::vector<M>& shards, F merge) {
+    for (size_t step=1 ; step<shards.size() ; step*=2) {
+        boost::thread_group threads;
+        for (size_t i=0 ; i+step<shards.size() ; i+=2*step) {
+            M* a = &shards[i];
+            M* b = &shards[i+step];
+            threads.create_thread([&merge, a, b]() {
+                merge(*a, *b);
+                M().swap(*b);
+            });
+        }
+        threads.join_all();
+    }
+}
+
+template<class R, class D> std::map<R, OrderedDocCover>
+_docBasicRuleCovers(D const& document, long const radius,
+                    boost::unordered_set<R> const* rules=0) {
+    boost::unordered_map<R, LongVector > _map;
     long const N = static_cast<long>(document.size());
-    Rule rule;
+    R rule;
     // enumerate the rules
     for (long idx=0 ; idx<N ; ++idx) {
         for (long offset=-radius ; offset<=radius ; ++offset) {
@@ -40,34 +189,215 @@ docBasicRuleCovers(Document const& document, long const radius) {
             }
         }
     }
-    std::map<Rule, OrderedDocCover> _rulemap;
+    std::map<R, OrderedDocCover> _rulemap;
     for (auto i=_map.begin() ; i!=_map.end() ; ++i) {
+        if (rules != 0 && rules->find(i->first) == rules->end()) {
+            continue;
+        }
         _rulemap[i->first] = OrderedDocCover(N, i->second);
     }
     return _rulemap;
 }
 
-std::map<Rule, OrderedCover>
-basicRuleCovers(Corpus const& corpus, long const radius) {
-    std::map<Rule, OrderedCover> _map;
-    std::map<Rule, OrderedDocCover> _docMap;
-    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
-        std::string const& docName = i->first;
-        Document const& doc        = i->second;
-        _docMap = docBasicRuleCovers(doc, radius);
+template<class R, class D> std::map<R, long>
+_docRuleCount(D const& document, long const radius) {
+    std::map<R, long> _map;
+    long const N = static_cast<long>(document.size());
+    R rule;
+    // enumerate the rules
+    for (long idx=0 ; idx<N ; ++idx) {
+        for (long offset=-radius ; offset<=radius ; ++offset) {
+            long pos = idx + offset;
+            if (pos<0 || pos>=N) {
+                continue;
+            }
+            rule.first = offset;
+            for (auto i=document[idx].begin(); i!=document[idx].end() ; ++i) {
+                rule.second = *i;
+                _map[rule] += 1;
+            }
+        }
+    }
+    return _map;
+}
+
+std::map<Rule, OrderedDocCover>
+docBasicRuleCovers(Document const& document, long const radius) {
+    return _docBasicRuleCovers<Rule>(document, radius);
+}
+
+std::map<IdRule, OrderedDocCover>
+docBasicRuleCovers(IdDocument const& document, long const radius) {
+    return _docBasicRuleCovers<IdRule>(document, radius);
+}
+
+std::map<IdRule, OrderedDocCover>
+docBasicRuleCovers(BinaryDocument const& document, long const radius) {
+    return _docBasicRuleCovers<IdRule>(document, radius);
+}
+
+template<class R, class D>
+void _addDocBasicRuleCovers(std::map<R, OrderedCover>& covers,
+        std::string const& docName, D const& doc, long const radius,
+        boost::unordered_set<R> const* rules=0) {
+    auto _docMap = _docBasicRuleCovers<R>(doc, radius, rules);
+    for (auto j=_docMap.begin() ; j!=_docMap.end() ; ++j) {
+        covers[j->first].addDocCover(docName, j->second);
+    }
+}
+
+template<class R, class C> std::map<R, OrderedCover>
+_basicRuleCovers(C& corpus, long const radius) {
+    std::map<R, OrderedCover> _map;
+    forEachDocument(corpus, [&](std::string const& docName,
+                                typename C::mapped_type const& doc) {
+        _addDocBasicRuleCovers(_map, docName, doc, radius);
+    });
+    return _map;
+}
+
+/// Merge the rule covers of b into a. The covers must have disjoint
+/// documents, b is left in unspecified state.
+template<class R> void _mergeRuleCovers(std::map<R, OrderedCover>& a,
+                                        std::map<R, OrderedCover>& b) {
+    for (auto i=b.begin() ; i!=b.end() ; ++i) {
+        auto j = a.find(i->first);
+        if (j == a.end()) {
+            a.insert(j, std::make_pair(i->first, OrderedCover()))
+                ->second.swap(i->second);
+        } else {
+            j->second |= i->second;
+        }
+    }
+}
+
+/// Return the rules occurring at least minCount times and in at least
+/// minDocCount documents of the corpus.
+template<class R, class C> boost::unordered_set<R>
+_supportedRules(C const& corpus, long const radius, long const numThreads,
+                long const minCount, long const minDocCount) {
+    // rule -> (count, document count)
+    typedef boost::unordered_map<R, std::pair<long, long> > M;
+    std::vector<M> _shards = _shardDocuments<M>(corpus,
+            std::max(numThreads, 1L),
+            [radius](M& counts, std::string const& docName,
+                     typename C::mapped_type const& doc) {
+        auto _docMap = _docRuleCount<R>(doc, radius);
         for (auto j=_docMap.begin() ; j!=_docMap.end() ; ++j) {
-            _map[j->first].addDocCover(docName, j->second);
+            std::pair<long, long>& _count = counts[j->first];
+            _count.first  += j->second;
+            _count.second += 1;
         }
+    });
+    _treeMerge(_shards, [](M& a, M& b) {
+        for (auto j=b.begin() ; j!=b.end() ; ++j) {
+            std::pair<long, long>& _count = a[j->first];
+            _count.first  += j->second.first;
+            _count.second += j->second.second;
+        }
+    });
+    boost::unordered_set<R> _rules;
+    for (auto i=_shards[0].begin() ; i!=_shards[0].end() ; ++i) {
+        if (i->second.first >= minCount && i->second.second >= minDocCount) {
+            _rules.insert(i->first);
+        }
+    }
+    return _rules;
+}
+
+template<class R, class C> std::map<R, OrderedCover>
+_basicRuleCovers(C const& corpus, long const radius, long const numThreads,
+                 long const minCount, long const minDocCount) {
+    boost::unordered_set<R> _rules;
+    boost::unordered_set<R> const* _filter = 0;
+    if (minCount > 1 || minDocCount > 1) {
+        _rules = _supportedRules<R>(corpus, radius, numThreads, minCount,
+                                    minDocCount);
+        _filter = &_rules;
+    }
+    typedef std::map<R, OrderedCover> M;
+    if (numThreads <= 1) {
+        M _map;
+        forEachDocument(corpus, [&](std::string const& docName,
+                                    typename C::mapped_type const& doc) {
+            _addDocBasicRuleCovers(_map, docName, doc, radius, _filter);
+        });
+        return _map;
     }
+    std::vector<M> _shards = _shardDocuments<M>(corpus, numThreads,
+            [radius, _filter](M& covers, std::string const& docName,
+                              typename C::mapped_type const& doc) {
+        _addDocBasicRuleCovers(covers, docName, doc, radius, _filter);
+    });
+    _treeMerge(_shards, _mergeRuleCovers<R>);
+    return _shards[0];
+}
+
+std::map<Rule, OrderedCover>
+basicRuleCovers(Corpus const& corpus, long const radius, long numThreads,
+                long minCount, long minDocCount) {
+    return _basicRuleCovers<Rule>(corpus, radius, numThreads, minCount,
+                                  minDocCount);
+}
+
+std::map<Rule, OrderedCover>
+basicRuleCovers(CorpusReader& reader, long const radius) {
+    return _basicRuleCovers<Rule>(reader, radius);
+}
+
+std::map<IdRule, OrderedCover>
+basicRuleCovers(IdCorpus const& corpus, long const radius, long numThreads,
+                long minCount, long minDocCount) {
+    return _basicRuleCovers<IdRule>(corpus, radius, numThreads, minCount,
+                                    minDocCount);
+}
+
+std::map<IdRule, OrderedCover>
+basicRuleCovers(BinaryCorpus const& corpus, long const radius,
+                long numThreads, long minCount, long minDocCount) {
+    return _basicRuleCovers<IdRule>(corpus, radius, numThreads, minCount,
+                                    minDocCount);
+}
+
+template<class R, class C> std::map<R, PostingCover>
+_basicPostingCovers(C const& corpus, Vocabulary& documents,
+                    long const radius) {
+    std::map<R, PostingCover> _map;
+    forEachDocument(corpus, [&](std::string const& docName,
+                                typename C::mapped_type const& doc) {
+        long const docId = documents.add(docName);
+        auto _docMap = _docBasicRuleCovers<R>(doc, radius);
+        for (auto j=_docMap.begin() ; j!=_docMap.end() ; ++j) {
+            _map[j->first].addDocCover(docId, j->second);
+        }
+    });
     return _map;
 }
 
-std::set<Conjunction>
-docFullConjunctions(Document const& document, long const radius) {
-    std::set<Conjunction> _conjunctions;
-    Conjunction _conjunction;
+std::map<Rule, PostingCover>
+basicPostingCovers(Corpus const& corpus, Vocabulary& documents,
+                   long const radius) {
+    return _basicPostingCovers<Rule>(corpus, documents, radius);
+}
+
+std::map<IdRule, PostingCover>
+basicPostingCovers(IdCorpus const& corpus, Vocabulary& documents,
+                   long const radius) {
+    return _basicPostingCovers<IdRule>(corpus, documents, radius);
+}
+
+std::map<IdRule, PostingCover>
+basicPostingCovers(BinaryCorpus const& corpus, Vocabulary& documents,
+                   long const radius) {
+    return _basicPostingCovers<IdRule>(corpus, documents, radius);
+}
+
+template<class R, class D> std::set<std::vector<R> >
+_docFullConjunctions(D const& document, long const radius) {
+    std::set<std::vector<R> > _conjunctions;
+    std::vector<R> _conjunction;
     long const N = static_cast<long>(document.size());
-    Rule rule;
+    R rule;
     // enumerate the rules
     for (long idx=0 ; idx<N ; ++idx) {
         _conjunction.clear();
@@ -89,24 +419,170 @@ docFullConjunctions(Document const& document, long const radius) {
     return _conjunctions;
 }
 
-std::vector<Conjunction>
-fullConjunctions(Corpus const& corpus, long const radius) {
-    std::set<Conjunction> _conjunctions;
-    std::set<Conjunction> _docConjunctions;
-    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
-        _docConjunctions = docFullConjunctions(i->second, radius);
+std::set<Conjunction>
+docFullConjunctions(Document const& document, long const radius) {
+    return _docFullConjunctions<Rule>(document, radius);
+}
+
+std::set<IdConjunction>
+docFullConjunctions(IdDocument const& document, long const radius) {
+    return _docFullConjunctions<IdRule>(document, radius);
+}
+
+std::set<IdConjunction>
+docFullConjunctions(BinaryDocument const& document, long const radius) {
+    return _docFullConjunctions<IdRule>(document, radius);
+}
+
+template<class R, class C> std::vector<std::vector<R> >
+_fullConjunctions(C& corpus, long const radius) {
+    std::set<std::vector<R> > _conjunctions;
+    forEachDocument(corpus, [&](std::string const& docName,
+                                typename C::mapped_type const& doc) {
+        auto _docConjunctions = _docFullConjunctions<R>(doc, radius);
         _conjunctions.insert(_docConjunctions.begin(), _docConjunctions.end());
+    });
+    return std::vector<std::vector<R> >(_conjunctions.begin(),
+                                        _conjunctions.end());
+}
+
+template<class R, class C> std::vector<std::vector<R> >
+_fullConjunctions(C const& corpus, long const radius, long const numThreads) {
+    if (numThreads <= 1) {
+        return _fullConjunctions<R>(corpus, radius);
     }
-    return std::vector<Conjunction>(_conjunctions.begin(), _conjunctions.end());
+    typedef std::set<std::vector<R> > S;
+    std::vector<S> _shards = _shardDocuments<S>(corpus, numThreads,
+            [radius](S& conjunctions, std::string const& docName,
+                     typename C::mapped_type const& doc) {
+        auto _docConjunctions = _docFullConjunctions<R>(doc, radius);
+        conjunctions.insert(_docConjunctions.begin(), _docConjunctions.end());
+    });
+    _treeMerge(_shards, [](S& a, S& b) {
+        a.insert(b.begin(), b.end());
+    });
+    return std::vector<std::vector<R> >(_shards[0].begin(),
+                                        _shards[0].end());
+}
+
+std::vector<Conjunction>
+fullConjunctions(Corpus const& corpus, long const radius, long numThreads) {
+    return _fullConjunctions<Rule>(corpus, radius, numThreads);
+}
+
+std::vector<Conjunction>
+fullConjunctions(CorpusReader& reader, long const radius) {
+    return _fullConjunctions<Rule>(reader, radius);
+}
+
+std::vector<IdConjunction>
+fullConjunctions(IdCorpus const& corpus, long const radius, long numThreads) {
+    return _fullConjunctions<IdRule>(corpus, radius, numThreads);
+}
+
+std::vector<IdConjunction>
+fullConjunctions(BinaryCorpus const& corpus, long const radius,
+                 long numThreads) {
+    return _fullConjunctions<IdRule>(corpus, radius, numThreads);
 }
 
 std::map<Rule, long>
 docRuleCount(Document const& document, long const radius) {
-    std::map<Rule, long> _map;
+    return _docRuleCount<Rule>(document, radius);
+}
+
+std::map<IdRule, long>
+docRuleCount(IdDocument const& document, long const radius) {
+    return _docRuleCount<IdRule>(document, radius);
+}
+
+std::map<IdRule, long>
+docRuleCount(BinaryDocument const& document, long const radius) {
+    return _docRuleCount<IdRule>(document, radius);
+}
+
+/// Add the counts of map b to map a.
+template<class R> void _addRuleCounts(std::map<R, long>& a,
+                                      std::map<R, long> const& b) {
+    for (auto j=b.begin() ; j!=b.end() ; ++j) {
+        a[j->first] += j->second;
+    }
+}
+
+template<class R, class C> std::map<R, long>
+_corpusRuleCount(C& corpus, long const radius) {
+    std::map<R, long> _map;
+    forEachDocument(corpus, [&](std::string const& docName,
+                                typename C::mapped_type const& doc) {
+        _addRuleCounts(_map, _docRuleCount<R>(doc, radius));
+    });
+    return _map;
+}
+
+template<class R, class C> std::map<R, long>
+_corpusRuleCount(C const& corpus, long const radius, long const numThreads) {
+    if (numThreads <= 1) {
+        return _corpusRuleCount<R>(corpus, radius);
+    }
+    typedef std::map<R, long> M;
+    std::vector<M> _shards = _shardDocuments<M>(corpus, numThreads,
+            [radius](M& counts, std::string const& docName,
+                     typename C::mapped_type const& doc) {
+        _addRuleCounts(counts, _docRuleCount<R>(doc, radius));
+    });
+    _treeMerge(_shards, _addRuleCounts<R>);
+    return _shards[0];
+}
+
+std::map<Rule, long>
+corpusRuleCount(Corpus const& corpus, long const radius, long numThreads) {
+    return _corpusRuleCount<Rule>(corpus, radius, numThreads);
+}
+
+std::map<Rule, long>
+corpusRuleCount(CorpusReader& reader, long const radius) {
+    return _corpusRuleCount<Rule>(reader, radius);
+}
+
+std::map<IdRule, long>
+corpusRuleCount(IdCorpus const& corpus, long const radius, long numThreads) {
+    return _corpusRuleCount<IdRule>(corpus, radius, numThreads);
+}
+
+std::map<IdRule, long>
+corpusRuleCount(BinaryCorpus const& corpus, long const radius,
+                long numThreads) {
+    return _corpusRuleCount<IdRule>(corpus, radius, numThreads);
+}
+
+/// Rule statistics of a shard of documents, conjunctions are kept in a set
+/// until all shards are merged.
+template<class R> struct _RuleStatisticsShard {
+    BasicRuleStatistics<R> statistics;
+    std::set<std::vector<R> > conjunctions;
+    void swap(_RuleStatisticsShard<R>& other) {
+        statistics.covers.swap(other.statistics.covers);
+        statistics.counts.swap(other.statistics.counts);
+        conjunctions.swap(other.conjunctions);
+    }
+};
+
+/// Add the requested statistics of a single document to the shard.
+/// All statistics are collected in a single enumeration of the rules.
+template<class R, class D>
+void _addDocRuleStatistics(_RuleStatisticsShard<R>& shard,
+        std::string const& docName, D const& document, long const radius,
+        long const what) {
+    boost::unordered_map<R, LongVector> _map;
+    std::set<std::vector<R> > _docConjunctions;
+    std::vector<R> _conjunction;
+    bool const _rules = (what & (RULE_COVERS | RULE_COUNTS)) != 0;
+    bool const _conjunctions = (what & FULL_CONJUNCTIONS) != 0;
     long const N = static_cast<long>(document.size());
-    Rule rule;
+    R rule;
     // enumerate the rules
     for (long idx=0 ; idx<N ; ++idx) {
+        _conjunction.clear();
         for (long offset=-radius ; offset<=radius ; ++offset) {
             long pos = idx + offset;
             if (pos<0 || pos>=N) {
@@ -115,31 +591,103 @@ docRuleCount(Document const& document, long const radius) {
             rule.first = offset;
             for (auto i=document[idx].begin(); i!=document[idx].end() ; ++i) {
                 rule.second = *i;
-                _map[rule] += 1;
+                if (_rules) {
+                    _map[rule].push_back(idx);
+                }
+                if (_conjunctions) {
+                    _conjunction.push_back(rule);
+                }
             }
         }
+        if (_conjunctions) {
+            std::sort(_conjunction.begin(), _conjunction.end());
+            _docConjunctions.insert(_conjunction);
+        }
     }
-    return _map;
+    // every occurrence of a rule adds its position to the list
+    for (auto i=_map.begin() ; i!=_map.end() ; ++i) {
+        if (what & RULE_COUNTS) {
+            shard.statistics.counts[i->first] += i->second.size();
+        }
+        if (what & RULE_COVERS) {
+            shard.statistics.covers[i->first].addDocCover(docName,
+                    OrderedDocCover(N, i->second));
+        }
+    }
+    shard.conjunctions.insert(_docConjunctions.begin(),
+                              _docConjunctions.end());
 }
 
-std::map<Rule, long>
-corpusRuleCount(Corpus const& corpus, long const radius) {
-    std::map<Rule, long> _map;
-    std::map<Rule, long> _docMap;
-    for (auto i=corpus.begin() ; i!=corpus.end() ; ++i) {
-        _docMap = docRuleCount(i->second, radius);
-        for (auto j=_docMap.begin() ; j!=_docMap.end() ; ++j) {
-            _map[j->first] += j->second;
-        }
+template<class R>
+BasicRuleStatistics<R> _finishRuleStatistics(_RuleStatisticsShard<R>& shard) {
+    BasicRuleStatistics<R> _result;
+    _result.covers.swap(shard.statistics.covers);
+    _result.counts.swap(shard.statistics.counts);
+    _result.conjunctions.assign(shard.conjunctions.begin(),
+                                shard.conjunctions.end());
+    return _result;
+}
+
+template<class R, class C> BasicRuleStatistics<R>
+_extractRuleStatistics(C& corpus, long const radius, long const what) {
+    _RuleStatisticsShard<R> _shard;
+    forEachDocument(corpus, [&](std::string const& docName,
+                                typename C::mapped_type const& doc) {
+        _addDocRuleStatistics(_shard, docName, doc, radius, what);
+    });
+    return _finishRuleStatistics(_shard);
+}
+
+template<class R, class C> BasicRuleStatistics<R>
+_extractRuleStatistics(C const& corpus, long const radius, long const what,
+                       long const numThreads) {
+    if (numThreads <= 1) {
+        return _extractRuleStatistics<R>(corpus, radius, what);
     }
-    return _map;
+    typedef _RuleStatisticsShard<R> S;
+    std::vector<S> _shards = _shardDocuments<S>(corpus, numThreads,
+            [radius, what](S& shard, std::string const& docName,
+                           typename C::mapped_type const& doc) {
+        _addDocRuleStatistics(shard, docName, doc, radius, what);
+    });
+    _treeMerge(_shards, [](S& a, S& b) {
+        _mergeRuleCovers(a.statistics.covers, b.statistics.covers);
+        _addRuleCounts(a.statistics.counts, b.statistics.counts);
+        a.conjunctions.insert(b.conjunctions.begin(), b.conjunctions.end());
+    });
+    return _finishRuleStatistics(_shards[0]);
 }
 
-std::vector<Conjunction> conjunctionPairs(std::vector<Conjunction> const& A,
-                                          std::vector<Conjunction> const& B) {
-    std::set<Conjunction> _conjunctions;
-    std::set<Rule> _rules;
-    Conjunction _conjunction;
+RuleStatistics extractRuleStatistics(Corpus const& corpus, long const radius,
+        long const what, long numThreads) {
+    return _extractRuleStatistics<Rule>(corpus, radius, what, numThreads);
+}
+
+RuleStatistics extractRuleStatistics(CorpusReader& reader, long const radius,
+        long const what) {
+    return _extractRuleStatistics<Rule>(reader, radius, what);
+}
+
+IdRuleStatistics extractRuleStatistics(IdCorpus const& corpus,
+        long const radius, long const what, long numThreads) {
+    return _extractRuleStatistics<IdRule>(corpus, radius, what, numThreads);
+}
+
+IdRuleStatistics extractRuleStatistics(BinaryCorpus const& corpus,
+        long const radius, long const what, long numThreads) {
+    return _extractRuleStatistics<IdRule>(corpus, radius, what, numThreads);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+// Conjunctions
+////////////////////////////////////////////////////////////////////////////////
+
+template<class R> std::vector<std::vector<R> >
+_conjunctionPairs(std::vector<std::vector<R> > const& A,
+                  std::vector<std::vector<R> > const& B) {
+    std::set<std::vector<R> > _conjunctions;
+    std::set<R> _rules;
+    std::vector<R> _conjunction;
     for (auto i=A.begin() ; i!=A.end() ; ++i) {
         for (auto j=B.begin() ; j!=B.end() ; ++j) {
             _rules.clear();
@@ -153,58 +701,191 @@ std::vector<Conjunction> conjunctionPairs(std::vector<Conjunction> const& A,
             _conjunctions.insert(_conjunction);
         }
     }
-    std::vector<Conjunction> _result; _result.reserve(_conjunctions.size());
+    std::vector<std::vector<R> > _result;
+    _result.reserve(_conjunctions.size());
     _result.insert(_result.end(), _conjunctions.begin(), _conjunctions.end());
     return _result;
 }
 
-std::vector<Conjunction> uniqueConjunctions(std::vector<Conjunction> const& A) {
-    boost::unordered_set<Conjunction> _conjunctions;
+std::vector<Conjunction> conjunctionPairs(std::vector<Conjunction> const& A,
+                                          std::vector<Conjunction> const& B) {
+    return _conjunctionPairs(A, B);
+}
+
+std::vector<IdConjunction>
+conjunctionPairs(std::vector<IdConjunction> const& A,
+                 std::vector<IdConjunction> const& B) {
+    return _conjunctionPairs(A, B);
+}
+
+template<class R> std::vector<std::vector<R> >
+_uniqueConjunctions(std::vector<std::vector<R> > const& A) {
+    boost::unordered_set<std::vector<R> > _conjunctions;
     std::copy(A.begin(), A.end(),
               std::inserter(_conjunctions, _conjunctions.end()));
-    std::vector<Conjunction> _result; _result.reserve(_conjunctions.size());
+    std::vector<std::vector<R> > _result;
+    _result.reserve(_conjunctions.size());
     std::copy(_conjunctions.begin(), _conjunctions.end(),
               std::back_inserter(_result));
     return _result;
 }
 
-OrderedCover conjunctionCover(Conjunction const& c,
-                            std::map<Rule, OrderedCover> const& basicCovers) {
+std::vector<Conjunction> uniqueConjunctions(std::vector<Conjunction> const& A) {
+    return _uniqueConjunctions(A);
+}
+
+std::vector<IdConjunction>
+uniqueConjunctions(std::vector<IdConjunction> const& A) {
+    return _uniqueConjunctions(A);
+}
+
+template<class R, class T> T
+_conjunctionCover(std::vector<R> const& c,
+                  std::map<R, T> const& basicCovers,
+                  long const minSize=0) {
     assert (c.size() > 0);
-    std::vector<OrderedCover> _covers;
+    // look up the covers by reference, together with their sizes
+    std::vector<std::pair<long, T const*> > _covers;
     _covers.reserve(c.size());
     for (auto i=c.begin() ; i!=c.end() ; ++i) {
         auto j = basicCovers.find(*i);
         if (j == basicCovers.end()) { // return empty cover
-            OrderedCover _cov;
+            T _cov;
             return _cov;
         }
-        _covers.push_back(j->second);
+        _covers.push_back(std::make_pair(static_cast<long>(j->second.size()),
+                                         &j->second));
     }
-    OrderedCover _cov = _covers[0];
+    std::sort(_covers.begin(), _covers.end(),
+              [](std::pair<long, T const*> const& a,
+                 std::pair<long, T const*> const& b) {
+        return a.first < b.first;
+    });
+    // intersections never grow the cover, so stop as soon as it is too
+    // small. Without minSize all covers are intersected, so that the
+    // documents shared by all rules are kept even if the rules never
+    // co-occur in them.
+    if (minSize > 0 && _covers[0].first < minSize) {
+        T _cov;
+        return _cov;
+    }
+    T _cov = *_covers[0].second;
     for (unsigned int i=1 ; i<_covers.size() ; ++i) {
-        _cov &= _covers[i];
+        _cov &= *_covers[i].second;
+        if (minSize > 0 && static_cast<long>(_cov.size()) < minSize) {
+            T _empty;
+            return _empty;
+        }
     }
     return _cov;
 }
 
-std::vector<Conjunction>
-reorderRecall(std::vector<Conjunction> const& conjunctions,
-              std::map<Rule, OrderedCover> const& basicCovers,
-              OrderedCover const& trueCover)
+OrderedCover conjunctionCover(Conjunction const& c,
+                            std::map<Rule, OrderedCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+OrderedCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, OrderedCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+PostingCover conjunctionCover(Conjunction const& c,
+                            std::map<Rule, PostingCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+PostingCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, PostingCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+RoaringCover conjunctionCover(Conjunction const& c,
+                            std::map<Rule, RoaringCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+RoaringCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, RoaringCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+FlatCover conjunctionCover(Conjunction const& c,
+                            std::map<Rule, FlatCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+FlatCover conjunctionCover(IdConjunction const& c,
+                            std::map<IdRule, FlatCover> const& basicCovers,
+                            long const minSize) {
+    return _conjunctionCover(c, basicCovers, minSize);
+}
+
+template<class R> std::map<R, RoaringCover>
+_asRoaringRuleCovers(std::map<R, OrderedCover> const& basicCovers) {
+    std::map<R, RoaringCover> _map;
+    for (auto i=basicCovers.begin() ; i!=basicCovers.end() ; ++i) {
+        _map.insert(_map.end(), {i->first, asRoaringCover(i->second)});
+    }
+    return _map;
+}
+
+std::map<Rule, RoaringCover>
+asRoaringRuleCovers(std::map<Rule, OrderedCover> const& basicCovers) {
+    return _asRoaringRuleCovers(basicCovers);
+}
+
+std::map<IdRule, RoaringCover>
+asRoaringRuleCovers(std::map<IdRule, OrderedCover> const& basicCovers) {
+    return _asRoaringRuleCovers(basicCovers);
+}
+
+template<class R> std::map<R, FlatCover>
+_asFlatRuleCovers(std::map<R, OrderedCover> const& basicCovers,
+                  DocumentOffsetsPtr const& offsets) {
+    std::map<R, FlatCover> _map;
+    for (auto i=basicCovers.begin() ; i!=basicCovers.end() ; ++i) {
+        _map.insert(_map.end(), {i->first, FlatCover(i->second, offsets)});
+    }
+    return _map;
+}
+
+std::map<Rule, FlatCover>
+asFlatRuleCovers(std::map<Rule, OrderedCover> const& basicCovers,
+                 DocumentOffsetsPtr const& offsets) {
+    return _asFlatRuleCovers(basicCovers, offsets);
+}
+
+std::map<IdRule, FlatCover>
+asFlatRuleCovers(std::map<IdRule, OrderedCover> const& basicCovers,
+                 DocumentOffsetsPtr const& offsets) {
+    return _asFlatRuleCovers(basicCovers, offsets);
+}
+
+template<class R> std::vector<std::vector<R> >
+_reorderRecall(std::vector<std::vector<R> > const& conjunctions,
+               std::map<R, OrderedCover> const& basicCovers,
+               OrderedCover const& trueCover)
 {
     std::vector<std::pair<double, long> > _buffer;
     _buffer.reserve(conjunctions.size());
     // compute the recalls
     for (size_t idx=0 ; idx<conjunctions.size() ; ++idx) {
-        OrderedCover c = conjunctionCover(conjunctions[idx], basicCovers);
+        OrderedCover c = _conjunctionCover(conjunctions[idx], basicCovers);
         auto metrics = c.metrics(trueCover);
         _buffer.push_back({metrics.recall(), idx});
     }
     // sort according to recall decreasingly
     std::sort(_buffer.begin(), _buffer.end(),
               std::greater<std::pair<double, long> >());
-    std::vector<Conjunction> _result;
+    std::vector<std::vector<R> > _result;
     // copy and return conjunctions
     _result.reserve(_buffer.size());
     for (auto i=_buffer.begin() ; i!=_buffer.end() ; ++i) {
@@ -213,4 +894,20 @@ reorderRecall(std::vector<Conjunction> const& conjunctions,
     return _result;
 }
 
+std::vector<Conjunction>
+reorderRecall(std::vector<Conjunction> const& conjunctions,
+              std::map<Rule, OrderedCover> const& basicCovers,
+              OrderedCover const& trueCover)
+{
+    return _reorderRecall(conjunctions, basicCovers, trueCover);
+}
+
+std::vector<IdConjunction>
+reorderRecall(std::vector<IdConjunction> const& conjunctions,
+              std::map<IdRule, OrderedCover> const& basicCovers,
+              OrderedCover const& trueCover)
+{
+    return _reorderRecall(conjunctions, basicCovers, trueCover);
+}
+
 } // namespace pfe
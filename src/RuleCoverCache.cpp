@@ -0,0 +1,218 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <RuleCoverCache.hpp>
+#include <MappedFile.hpp>
+
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+
+#include <unistd.h>
+
+namespace pfe {
+
+uint64_t hashFile(std::string const& filename) throw(std::runtime_error) {
+    MappedFile file(filename);
+    unsigned char const* p = reinterpret_cast<unsigned char const*>(
+            file.data());
+    uint64_t hash = 14695981039346656037ULL;
+    for (size_t i=0 ; i<file.size() ; ++i) {
+        hash ^= p[i];
+        hash *= 1099511628211ULL;
+    }
+    return hash;
+}
+
+void writeRuleCovers(std::string const& filename,
+                     std::map<Rule, OrderedCover> const& covers,
+                     uint64_t const corpusHash, long const radius)
+throw(std::runtime_error) {
+    Vocabulary vocabulary;
+    std::vector<RuleCoverCacheRule> _rules;
+    std::vector<RuleCoverCacheDoc> _docs;
+    std::vector<uint32_t> _indices;
+    _rules.reserve(covers.size() + 1);
+    for (auto i=covers.begin() ; i!=covers.end() ; ++i) {
+        RuleCoverCacheRule rule;
+        rule.offset   = i->first.first;
+        rule.attrId   = vocabulary.add(i->first.second);
+        rule.reserved = 0;
+        rule.firstDoc = _docs.size();
+        _rules.push_back(rule);
+        std::map<std::string, OrderedDocCover> _map = i->second.map();
+        for (auto j=_map.begin() ; j!=_map.end() ; ++j) {
+            RuleCoverCacheDoc doc;
+            doc.nameId     = vocabulary.add(j->first);
+            doc.docSize    = j->second.docSize();
+            doc.firstIndex = _indices.size();
+            _docs.push_back(doc);
+            LongVector const _elems = j->second.indices();
+            _indices.insert(_indices.end(), _elems.begin(), _elems.end());
+        }
+    }
+    // sentinel entries mark the ends of the last rule and document
+    RuleCoverCacheRule _lastRule = {0, 0, 0, _docs.size()};
+    _rules.push_back(_lastRule);
+    RuleCoverCacheDoc _lastDoc = {0, 0, _indices.size()};
+    _docs.push_back(_lastDoc);
+
+    StringVector _strings = vocabulary.attributes();
+    std::vector<uint64_t> _stringOffsets(1, 0);
+    std::string _stringData;
+    for (auto i=_strings.begin() ; i!=_strings.end() ; ++i) {
+        _stringData += *i;
+        _stringOffsets.push_back(_stringData.size());
+    }
+    RuleCoverCacheHeader header;
+    std::memset(&header, 0, sizeof(header));
+    std::memcpy(header.magic, RULE_COVER_CACHE_MAGIC, 8);
+    header.version        = RULE_COVER_CACHE_VERSION;
+    header.corpusHash     = corpusHash;
+    header.radius         = radius;
+    header.numStrings     = _strings.size();
+    header.stringDataSize = _stringData.size();
+    header.numRules       = _rules.size() - 1;
+    header.numDocs        = _docs.size() - 1;
+    header.numIndices     = _indices.size();
+
+    std::ofstream fout(filename.c_str(), std::ios::binary | std::ios::out);
+    if (!fout) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + filename);
+    }
+    writeBinarySection(fout, &header, sizeof(header));
+    writeBinarySection(fout, _stringOffsets.data(),
+                       _stringOffsets.size() * sizeof(uint64_t));
+    writeBinarySection(fout, _stringData.data(), _stringData.size());
+    writeBinarySection(fout, _rules.data(),
+                       _rules.size() * sizeof(RuleCoverCacheRule));
+    writeBinarySection(fout, _docs.data(),
+                       _docs.size() * sizeof(RuleCoverCacheDoc));
+    writeBinarySection(fout, _indices.data(),
+                       _indices.size() * sizeof(uint32_t));
+    if (!fout) {
+        throw std::runtime_error(ERR_COULD_NOT_WRITE_FILE + filename);
+    }
+    fout.close();
+}
+
+/// Return the validated header of a mapped rule cover cache file.
+RuleCoverCacheHeader const* ruleCoverCacheHeader(MappedFile const& file,
+        std::string const& filename) throw(std::runtime_error) {
+    if (file.size() < sizeof(RuleCoverCacheHeader)) {
+        throw std::runtime_error(ERR_INVALID_RULE_CACHE + filename);
+    }
+    RuleCoverCacheHeader const* header =
+        reinterpret_cast<RuleCoverCacheHeader const*>(file.data());
+    if (std::memcmp(header->magic, RULE_COVER_CACHE_MAGIC, 8) != 0 ||
+        header->version != RULE_COVER_CACHE_VERSION) {
+        throw std::runtime_error(ERR_INVALID_RULE_CACHE + filename);
+    }
+    return header;
+}
+
+std::map<Rule, OrderedCover> readRuleCovers(std::string const& filename)
+throw(std::runtime_error) {
+    MappedFile file(filename);
+    RuleCoverCacheHeader const* header = ruleCoverCacheHeader(file, filename);
+    // locate the sections
+    char const* p = file.data();
+    size_t pos = sizeof(RuleCoverCacheHeader);
+    uint64_t const* _stringOffsets = reinterpret_cast<uint64_t const*>(p + pos);
+    pos += (header->numStrings + 1) * sizeof(uint64_t);
+    char const* _stringData = p + pos;
+    pos += binaryAlign8(header->stringDataSize);
+    RuleCoverCacheRule const* _rules =
+        reinterpret_cast<RuleCoverCacheRule const*>(p + pos);
+    pos += (header->numRules + 1) * sizeof(RuleCoverCacheRule);
+    RuleCoverCacheDoc const* _docs =
+        reinterpret_cast<RuleCoverCacheDoc const*>(p + pos);
+    pos += (header->numDocs + 1) * sizeof(RuleCoverCacheDoc);
+    uint32_t const* _indices = reinterpret_cast<uint32_t const*>(p + pos);
+    pos += header->numIndices * sizeof(uint32_t);
+    if (pos > file.size()) {
+        throw std::runtime_error(ERR_INVALID_RULE_CACHE + filename);
+    }
+
+    StringVector _strings;
+    _strings.reserve(header->numStrings);
+    for (uint64_t i=0 ; i<header->numStrings ; ++i) {
+        _strings.push_back(std::string(_stringData + _stringOffsets[i],
+                                       _stringData + _stringOffsets[i+1]));
+    }
+    std::map<Rule, OrderedCover> _map;
+    LongVector _elems;
+    for (uint64_t i=0 ; i<header->numRules ; ++i) {
+        Rule rule(_rules[i].offset, _strings.at(_rules[i].attrId));
+        OrderedCover& cover = _map.insert(_map.end(),
+                std::make_pair(rule, OrderedCover()))->second;
+        for (uint64_t j=_rules[i].firstDoc ; j<_rules[i+1].firstDoc ; ++j) {
+            _elems.assign(_indices + _docs[j].firstIndex,
+                          _indices + _docs[j+1].firstIndex);
+            cover.addDocCover(_strings.at(_docs[j].nameId),
+                              OrderedDocCover(_docs[j].docSize, _elems));
+        }
+    }
+    return _map;
+}
+
+std::map<Rule, OrderedCover>
+cachedBasicRuleCovers(std::string const& corpusFilename, long const radius,
+                      std::string const& cacheFilename, long numThreads)
+throw(std::runtime_error) {
+    std::string _cacheFilename = cacheFilename;
+    if (_cacheFilename.size() == 0) {
+        std::stringstream ss;
+        ss << corpusFilename << ".r" << radius << ".rcache";
+        _cacheFilename = ss.str();
+    }
+    uint64_t corpusHash = hashFile(corpusFilename);
+    std::ifstream fin(_cacheFilename.c_str(), std::ios::in | std::ios::binary);
+    if (fin.good()) {
+        fin.close();
+        // a stale or broken cache is simply rebuilt
+        try {
+            MappedFile file(_cacheFilename);
+            RuleCoverCacheHeader const* header =
+                ruleCoverCacheHeader(file, _cacheFilename);
+            if (header->corpusHash == corpusHash && header->radius == radius) {
+                return readRuleCovers(_cacheFilename);
+            }
+        } catch (std::runtime_error const&) { }
+    }
+    std::map<Rule, OrderedCover> _covers = basicRuleCovers(
+            readCorpusFromFile(corpusFilename, numThreads), radius,
+            numThreads);
+    // write to a temporary file first, so concurrent runs never see a
+    // partially written cache
+    std::stringstream ss;
+    ss << _cacheFilename << ".tmp" << getpid();
+    std::string _tmpFilename = ss.str();
+    try {
+        writeRuleCovers(_tmpFilename, _covers, corpusHash, radius);
+        if (std::rename(_tmpFilename.c_str(), _cacheFilename.c_str()) != 0) {
+            std::remove(_tmpFilename.c_str());
+        }
+    } catch (std::runtime_error const&) {
+        // failing to write the cache only costs time on the next run
+        std::remove(_tmpFilename.c_str());
+    }
+    return _covers;
+}
+
+} // namespace pfe
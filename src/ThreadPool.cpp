@@ -0,0 +1,122 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <ThreadPool.hpp>
+
+#include <algorithm>
+
+namespace pfe {
+
+ThreadPool::ThreadPool(long numThreads)
+: _numThreads(std::max(numThreads, 1L)), _n(0), _chunkSize(1), _next(0),
+  _busy(0), _generation(0), _stop(false), _busyTime(_numThreads, 0.0) {
+    for (long t=0 ; t<_numThreads ; ++t) {
+        _threads.create_thread([this, t]() { worker(t); });
+    }
+}
+
+ThreadPool::~ThreadPool() {
+    {
+        boost::mutex::scoped_lock _lock(_mutex);
+        _stop = true;
+    }
+    _work.notify_all();
+    _threads.join_all();
+}
+
+long ThreadPool::size() const {
+    return _numThreads;
+}
+
+std::vector<double> ThreadPool::busyTimes() {
+    boost::mutex::scoped_lock _lock(_mutex);
+    return _busyTime;
+}
+
+void ThreadPool::resetBusyTimes() {
+    boost::mutex::scoped_lock _lock(_mutex);
+    std::fill(_busyTime.begin(), _busyTime.end(), 0.0);
+}
+
+void ThreadPool::worker(long id) {
+    unsigned long _seen = 0;
+    boost::mutex::scoped_lock _lock(_mutex);
+    while (true) {
+        while (!_stop && _generation == _seen) {
+            _work.wait(_lock);
+        }
+        if (_stop) {
+            return;
+        }
+        _seen = _generation;
+        ++_busy;
+        _lock.unlock();
+        double const _start = wallTime();
+        runChunks();
+        double const _time = wallTime() - _start;
+        _lock.lock();
+        _busyTime[id] += _time;
+        if (--_busy == 0 && _next >= _n) {
+            _done.notify_all();
+        }
+    }
+}
+
+void ThreadPool::runChunks() {
+    while (true) {
+        long first;
+        {
+            boost::mutex::scoped_lock _lock(_mutex);
+            if (_next >= _n) {
+                return;
+            }
+            first = _next;
+            _next = std::min(_n, _next + _chunkSize);
+        }
+        try {
+            _f(first, std::min(_n, first + _chunkSize));
+        } catch (std::exception const& e) {
+            boost::mutex::scoped_lock _lock(_mutex);
+            if (_error.empty()) {
+                _error = e.what();
+            }
+            _next = _n; // skip the remaining chunks
+        }
+    }
+}
+
+void ThreadPool::forEachChunk(long n, long chunkSize,
+                              boost::function<void (long, long)> const& f)
+throw(std::runtime_error) {
+    boost::mutex::scoped_lock _lock(_mutex);
+    _f = f;
+    _n = n;
+    _chunkSize = std::max(chunkSize, 1L);
+    _next = 0;
+    _error.clear();
+    ++_generation;
+    _work.notify_all();
+    while (_next < _n || _busy > 0) {
+        _done.wait(_lock);
+    }
+    _f.clear();
+    if (!_error.empty()) {
+        throw std::runtime_error(_error);
+    }
+}
+
+} // namespace pfe
@@ -0,0 +1,57 @@
+/*  Pattern based fact extraction library.
+    Copyright (C) 2013 University of Tartu
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#include <Vocabulary.hpp>
+
+namespace pfe {
+
+Vocabulary::Vocabulary(StringVector const& attributes) {
+    _attributes.reserve(attributes.size());
+    for (auto i=attributes.begin() ; i!=attributes.end() ; ++i) {
+        add(*i);
+    }
+}
+
+AttrId Vocabulary::add(std::string const& attribute) {
+    auto i = _ids.find(attribute);
+    if (i != _ids.end()) {
+        return i->second;
+    }
+    AttrId id = static_cast<AttrId>(_attributes.size());
+    _attributes.push_back(attribute);
+    _ids.insert({attribute, id});
+    return id;
+}
+
+AttrId Vocabulary::id(std::string const& attribute) const
+throw(std::range_error) {
+    auto i = _ids.find(attribute);
+    if (i == _ids.end()) {
+        throw std::range_error(ERR_ATTRIBUTE_NOT_FOUND);
+    }
+    return i->second;
+}
+
+std::string const& Vocabulary::attribute(AttrId const id) const
+throw(std::range_error) {
+    if (id >= _attributes.size()) {
+        throw std::range_error(ERR_ATTRIBUTE_NOT_FOUND);
+    }
+    return _attributes[id];
+}
+
+} // namespace pfe
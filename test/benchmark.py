@@ -1 +1,56 @@
 # Some benchmarks proving better efficiency of certain C++ library functions
+import sys
+import time
+import argparse
+from pypfe import *
+
+def timed(f, *args):
+    '''Return the result of f(*args) and the time taken in seconds.'''
+    start = time.time()
+    result = f(*args)
+    return result, time.time() - start
+
+def recall_kernel(cover, true_cover):
+    '''Recall from the single-pass metrics kernel.'''
+    return cover.metrics(true_cover).recall()
+
+def recall_temporaries(cover, true_cover):
+    '''Compute the recall the way the metrics were computed before, by
+       materialising the intersection and difference covers in C++.'''
+    tp = (cover & true_cover).size()
+    fn = (true_cover - cover).size()
+    return float(tp) / (tp + fn) if tp + fn > 0 else 0.0
+
+def hr_frequent(covers, true_cover, treshold, recall):
+    '''Filter the basic covers by recall, one library call per cover.'''
+    return [rule for rule in covers.keys()
+            if recall(covers[rule], true_cover) >= treshold]
+
+def benchmark_metrics(corpus, target, treshold, radius):
+    '''Compare the single-pass metrics kernel with temporary covers when
+       filtering the first Apriori candidates.'''
+    covers = basicRuleCovers(corpus, radius)
+    if Rule(0, target) not in covers:
+        sys.stderr.write('The corpus has no attribute {0}\n'.format(target))
+        sys.exit(1)
+    true_cover = covers[Rule(0, target)]
+    r1, t1 = timed(hr_frequent, covers, true_cover, treshold, recall_kernel)
+    r2, t2 = timed(hr_frequent, covers, true_cover, treshold,
+                   recall_temporaries)
+    assert [(r[0], r[1]) for r in r1] == [(r[0], r[1]) for r in r2]
+    print 'metrics kernel: {0:.3f}s, temporary covers: {1:.3f}s'.format(t1, t2)
+    conjunctions = [Conjunction([rule]) for rule in covers.keys()]
+    _, t3 = timed(hrApriori, conjunctions, covers, true_cover, treshold, 1, 1)
+    print 'hrApriori level 1: {0:.3f}s'.format(t3)
+    _, t4 = timed(hrApriori, conjunctions, covers, true_cover, treshold, 2, 1)
+    print 'hrApriori with 2 iterations: {0:.3f}s'.format(t4)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the cover metrics kernel.')
+    parser.add_argument('corp', type=str, help='Path of the corpus.')
+    parser.add_argument('--target', type=str, default='upper', help='Attribute of the true cover. (default upper)')
+    parser.add_argument('--treshold', type=float, default=0.02, help='Recall treshold. (default 0.02)')
+    parser.add_argument('--radius', type=int, default=2, help='Radius of the basic rules. (default 2)')
+    args = parser.parse_args()
+    benchmark_metrics(readCorpusFromFile(args.corp), args.target,
+                      args.treshold, args.radius)
@@ -1,6 +1,69 @@
 # PFE library tests based on Python interface.
+import itertools
+import math
+import os
+import shutil
+import tempfile
+import threading
 import unittest
 from pypfe import *
+from pypfe.apriori import Apriori
+
+# the CoverMetrics test case below shadows the library class
+_PfeCoverMetrics = CoverMetrics
+
+try:
+    from pypfe import background
+except ImportError:
+    background = None
+
+def _mining_corpus_str(numDocs=12):
+    '''Small corpus for the miners. Tokens carry a position attribute,
+       some of the attributes a-e and the target attribute T.'''
+    docs = []
+    for d in range(numDocs):
+        lines = []
+        for t in range(8):
+            attrs = ['p{0}'.format(t % 3)]
+            attrs += [c for k, c in enumerate('abcde')
+                      if (d * 3 + t * 5 + k * 7) % (k + 2) == 0]
+            if (d + t) % 3 == 0:
+                attrs.append('T')
+            lines.append('w{0}\t{1}'.format(t, '\t'.join(attrs)))
+        docs.append('doc{0}\n{1}\n'.format(d, '\n'.join(lines)))
+    return '\n'.join(docs)
+
+def _conjunction_set(conjunctions):
+    return set(tuple(sorted((r[0], r[1]) for r in c)) for c in conjunctions)
+
+# documents as item sets and the positive documents for Apriori.mine_top_k
+_TOP_DOCS = [frozenset(i for i in range(6) if (d + i * i) % (i + 2) != 0)
+             for d in range(20)]
+_TOP_TRUE = frozenset(d for d in range(20) if d % 3 != 1)
+
+def _top_metrics(items):
+    cover = set(d for d, doc in enumerate(_TOP_DOCS) if items <= doc)
+    tp = len(cover & _TOP_TRUE)
+    fp = len(cover) - tp
+    return _PfeCoverMetrics(tp, fp, len(_TOP_DOCS) - len(_TOP_TRUE) - fp,
+                            len(_TOP_TRUE) - tp)
+
+def _top_frequent(items, **kwargs):
+    return _top_metrics(items).tp() > 0
+
+def _top_join(a, b, **kwargs):
+    items = a | b
+    if len(items) == len(a) + 1 and len(items) <= 3:
+        return items
+    return None
+
+def _top_weight(items, metric, **kwargs):
+    return getattr(_top_metrics(items), metric)()
+
+def _top_bound(items, metric, **kwargs):
+    m = _top_metrics(items)
+    bound = _PfeCoverMetrics(m.tp(), 0, m.tn() + m.fp(), m.fn())
+    return getattr(bound, metric)()
 
 class OrderedDocCoverTest(unittest.TestCase):
     '''Test OrderedDocCover.'''
@@ -49,6 +112,15 @@ class OrderedDocCoverTest(unittest.TestCase):
         oc = OrderedDocCover(OrderedDocCover(OrderedDocCover(self.ordc2)))
         self.assertEqual(oc, self.ordc2)
 
+    def test_skewed(self):
+        '''Test operations of a small cover with a much larger one.'''
+        large = OrderedDocCover(1000, LongVector(range(0, 1000, 2)))
+        small = OrderedDocCover(1000, LongVector([3, 4, 500, 998]))
+        self.assertEqual(list((small & large).indices()), [4, 500, 998])
+        self.assertEqual(list((large & small).indices()), [4, 500, 998])
+        self.assertEqual(list((small - large).indices()), [3])
+        self.assertEqual((large - small).size(), 497)
+
 
 class BitsetDocCoverTest(unittest.TestCase):
     '''Test BitsetDocCover'''
@@ -100,6 +172,38 @@ class BitsetDocCoverTest(unittest.TestCase):
         bc = BitsetDocCover(BitsetDocCover(BitsetDocCover(self.bitc2)))
         self.assertEqual(bc, self.bitc2)
 
+class RoaringDocCoverTest(unittest.TestCase):
+    '''Test RoaringDocCover with sparse and dense containers.'''
+
+    def setUp(self):
+        self.size  = 3 * 65536
+        self.v1    = LongVector(range(0, self.size, 3))
+        self.v2    = LongVector([5, 6, 7, 70000, 140000, 140001])
+        self.ordc1 = OrderedDocCover(self.size, self.v1)
+        self.ordc2 = OrderedDocCover(self.size, self.v2)
+        self.roar1 = RoaringDocCover(self.ordc1)
+        self.roar2 = RoaringDocCover(self.size, self.v2)
+
+    def test_consistency(self):
+        self.assertEqual(list(self.roar1.indices()), list(self.v1))
+        self.assertEqual(list(self.roar2.indices()), list(self.v2))
+        self.assertEqual(self.roar1.size(), self.ordc1.size())
+
+    def test_operators(self):
+        pairs = [(self.roar1, self.roar2, self.ordc1, self.ordc2),
+                 (self.roar2, self.roar1, self.ordc2, self.ordc1)]
+        for op in ['__and__', '__or__', '__sub__', '__xor__']:
+            for a, b, A, B in pairs:
+                self.assertEqual(list(getattr(a, op)(b).indices()),
+                                 list(getattr(A, op)(B).indices()))
+
+    def test_metrics(self):
+        m1 = self.roar1.metrics(self.roar2)
+        m2 = self.ordc1.metrics(self.ordc2)
+        self.assertEqual((m1.tp(), m1.fp(), m1.tn(), m1.fn()),
+                         (m2.tp(), m2.fp(), m2.tn(), m2.fn()))
+
+
 class DocCoverTest(unittest.TestCase):
     '''Test interopability of OrderedDocCover and BitsetDocCover'''
 
@@ -268,6 +372,634 @@ class CoverTest(unittest.TestCase):
         self.assertEqual(ordc2 ^ ordc1, (ordc1 - ordc2) | (ordc2 - ordc1))
 
 
+class VocabularyTest(unittest.TestCase):
+    '''Test attribute interning.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr('doc1\nx\ta\tb\ny\tb\n\n'
+                                        'doc2\nz\tc\ta\n')
+
+    def test_ids(self):
+        v = Vocabulary()
+        self.assertEqual(v.add('a'), 0)
+        self.assertEqual(v.add('b'), 1)
+        self.assertEqual(v.add('a'), 0)
+        self.assertEqual(v.id('b'), 1)
+        self.assertEqual(v.attribute(1), 'b')
+        self.assertEqual(v.size(), 2)
+        self.assertRaises(Exception, v.id, 'c')
+
+    def test_roundtrip(self):
+        v = Vocabulary()
+        idcorpus = encodeCorpus(self.corpus, v)
+        self.assertEqual(v.size(), 3)
+        self.assertEqual(dict(decodeCorpus(idcorpus, v)), dict(self.corpus))
+
+    def test_rule_covers(self):
+        v = Vocabulary()
+        idcorpus = encodeCorpus(self.corpus, v)
+        covers = basicRuleCovers(self.corpus, 1)
+        idcovers = basicRuleCovers(idcorpus, 1)
+        self.assertEqual(len(covers), len(idcovers))
+        self.assertEqual(dict(covers), dict(decodeRuleCovers(idcovers, v)))
+
+
+class CorpusReaderTest(unittest.TestCase):
+    '''Test streaming corpus reader.'''
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, 'doc1\nx\ta\tb\ny\tb\n\ndoc2\nz\tc\ta\n')
+        os.close(fd)
+        self.corpus = readCorpusFromFile(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_iterate(self):
+        docs = dict((name, doc) for name, doc in CorpusReader(self.path))
+        self.assertEqual(docs, dict(self.corpus))
+
+    def test_rule_covers(self):
+        self.assertEqual(dict(basicRuleCovers(CorpusReader(self.path), 1)),
+                         dict(basicRuleCovers(self.corpus, 1)))
+        self.assertEqual(dict(corpusRuleCount(CorpusReader(self.path), 1)),
+                         dict(corpusRuleCount(self.corpus, 1)))
+
+    def test_parallel_read(self):
+        for numThreads in range(2, 6):
+            self.assertEqual(dict(readCorpusFromFile(self.path, numThreads)),
+                             dict(self.corpus))
+
+    def test_parallel_read_format(self):
+        '''The parallel reader parses like the stream reader.'''
+        texts = ['doc1\nx\ta\n\n\n\ndoc2\ny\tb\n\n\ndoc3\nz\tc\n',
+                 'doc1\nx\ta\ny\tb\n\ndoc2\nz\tc',
+                 'doc1\nx\ta\n\ndoc2\ny\tb\n\ndoc1\nz\tc\n\n',
+                 'doc1\nx\ta\n\ndoc1\ny\tb\n',
+                 '\n\ndoc1\nx\ta\n\ndoc2', '']
+        for text in texts:
+            with open(self.path, 'w') as f:
+                f.write(text)
+            for numThreads in range(2, 6):
+                self.assertEqual(
+                    dict(readCorpusFromFile(self.path, numThreads)),
+                    dict(readCorpusFromStr(text)))
+
+
+class CorpusIndexTest(unittest.TestCase):
+    '''Test document offset index of text corpora.'''
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, 'doc1\nx\ta\tb\ny\tb\n\ndoc2\nz\tc\ta\n\ndoc3\nw\td\n')
+        os.close(fd)
+        self.corpus = readCorpusFromFile(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+        if os.path.exists(self.path + '.idx'):
+            os.remove(self.path + '.idx')
+
+    def test_sample(self):
+        index = CorpusIndex(self.path)
+        self.assertEqual(list(index.names()), ['doc1', 'doc2', 'doc3'])
+        sample = corpusSample(index, StringVector(['doc3', 'doc1']))
+        self.assertEqual(dict(sample),
+                         dict(corpusSample(self.corpus,
+                                           StringVector(['doc1', 'doc3']))))
+        self.assertEqual(list(readDocFromFile(index, 'doc2')),
+                         list(self.corpus['doc2']))
+
+    def test_sidecar(self):
+        CorpusIndex(self.path).save()
+        self.assertTrue(os.path.exists(self.path + '.idx'))
+        index = CorpusIndex(self.path)
+        self.assertEqual(index.size(), 3)
+        self.assertEqual(dict(corpusSample(index, index.names())),
+                         dict(self.corpus))
+
+    def test_stale_sidecar(self):
+        '''A sidecar of an edited corpus of the same size is rebuilt.'''
+        CorpusIndex(self.path).save()
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, 'w') as f:
+            f.write('doc1\nx\ta\tb\ny\tb\n\ndocX\nz\tc\ta\n\ndoc3\nw\td\n')
+        os.utime(self.path, (mtime + 10, mtime + 10))
+        index = CorpusIndex(self.path)
+        self.assertEqual(list(index.names()), ['doc1', 'docX', 'doc3'])
+        self.assertEqual(list(readDocFromFile(index, 'docX')),
+                         list(self.corpus['doc2']))
+
+
+class CompressionTest(unittest.TestCase):
+    '''Test reading and writing compressed corpora.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr('doc1\nx\ta\tb\ny\tb\n\n'
+                                        'doc2\nz\tc\ta\n')
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for name in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, name))
+        os.rmdir(self.dir)
+
+    def test_roundtrip(self):
+        plain = os.path.join(self.dir, 'corpus.txt')
+        writeCorpusToFile(plain, self.corpus)
+        expected = dict(readCorpusFromFile(plain))
+        for ext, compression in [('.gz', COMPRESSION_GZIP),
+                                 ('.bz2', COMPRESSION_BZIP2),
+                                 ('.xz', COMPRESSION_XZ)]:
+            path = os.path.join(self.dir, 'corpus' + ext)
+            writeCorpusToFile(path, self.corpus)
+            self.assertEqual(detectCompression(path), compression)
+            self.assertEqual(dict(readCorpusFromFile(path)), expected)
+            self.assertEqual(dict(CorpusReader(path)), expected)
+
+    def test_explicit_compression(self):
+        path = os.path.join(self.dir, 'corpus')
+        writeCorpusToFile(path, self.corpus, COMPRESSION_GZIP)
+        self.assertEqual(detectCompression(path), COMPRESSION_GZIP)
+
+
+class RuleStatisticsTest(unittest.TestCase):
+    '''Test fused extraction of rule statistics.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr('doc1\nx\ta\tb\ny\tb\n\n'
+                                        'doc2\nz\tc\ta\nw\tb\n')
+
+    def test_all(self):
+        stats = extractRuleStatistics(self.corpus, 1)
+        self.assertEqual(dict(stats.covers),
+                         dict(basicRuleCovers(self.corpus, 1)))
+        self.assertEqual(dict(stats.counts),
+                         dict(corpusRuleCount(self.corpus, 1)))
+        self.assertEqual(list(stats.conjunctions),
+                         list(fullConjunctions(self.corpus, 1)))
+
+    def test_selection(self):
+        stats = extractRuleStatistics(self.corpus, 1, RULE_COUNTS, 2)
+        self.assertEqual(len(stats.covers), 0)
+        self.assertEqual(len(stats.conjunctions), 0)
+        self.assertEqual(dict(stats.counts),
+                         dict(corpusRuleCount(self.corpus, 1)))
+
+
+class PostingCoverTest(unittest.TestCase):
+    '''Test compressed posting list covers.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr('doc1\nx\ta\tb\ny\tb\n\n'
+                                        'doc2\nz\tc\ta\nw\tb\n')
+        self.documents = Vocabulary()
+        self.covers = basicPostingCovers(self.corpus, self.documents, 1)
+        self.ordered = basicRuleCovers(self.corpus, 1)
+
+    def test_covers(self):
+        self.assertEqual(len(self.covers), len(self.ordered))
+        for rule, cover in self.ordered.items():
+            self.assertEqual(decodeCover(self.covers[rule], self.documents),
+                             cover)
+
+    def test_operators(self):
+        rules = list(self.ordered.keys())
+        for r1 in rules:
+            for r2 in rules:
+                a, b = self.covers[r1], self.covers[r2]
+                A, B = self.ordered[r1], self.ordered[r2]
+                for op in ['__and__', '__or__', '__sub__', '__xor__']:
+                    self.assertEqual(
+                        decodeCover(getattr(a, op)(b), self.documents),
+                        getattr(A, op)(B))
+                self.assertEqual(a.metrics(b).tp(), A.metrics(B).tp())
+                self.assertEqual(a.metrics(b).tn(), A.metrics(B).tn())
+
+
+class FlatCoverTest(unittest.TestCase):
+    '''Test corpus-global flat covers.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr('doc1\nx\ta\tb\ny\tb\n\n'
+                                        'doc2\nz\tc\ta\nw\tb\n\n'
+                                        'doc3\nv\tc\n')
+        self.offsets = corpusOffsets(self.corpus)
+        self.ordered = basicRuleCovers(self.corpus, 1)
+        self.covers = asFlatRuleCovers(self.ordered, self.offsets)
+
+    def test_offsets(self):
+        self.assertEqual(self.offsets.size(), 3)
+        self.assertEqual(self.offsets.corpusSize(), 5)
+        self.assertEqual(self.offsets.offset(self.offsets.id('doc3')), 4)
+
+    def test_operators(self):
+        rules = list(self.ordered.keys())
+        for r1 in rules:
+            for r2 in rules:
+                a, b = self.covers[r1], self.covers[r2]
+                A, B = self.ordered[r1], self.ordered[r2]
+                self.assertEqual((a & b).orderedCover(), A & B)
+                self.assertEqual((a | b).orderedCover(), A | B)
+                self.assertEqual((a - b).orderedCover(), A - B)
+                self.assertEqual((a ^ b).orderedCover(), A ^ B)
+                m1, m2 = a.metrics(b), A.metrics(B)
+                self.assertEqual((m1.tp(), m1.fp(), m1.tn(), m1.fn()),
+                                 (m2.tp(), m2.fp(), m2.tn(), m2.fn()))
+                self.assertEqual(sorted(a.documentMetrics(b).keys()),
+                                 sorted(A.documentMetrics(B).keys()))
+
+
+class RuleCoverCacheTest(unittest.TestCase):
+    '''Test on-disk cache of basic rule covers.'''
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, 'doc1\nx\ta\tb\ny\tb\n\ndoc2\nz\tc\ta\n')
+        os.close(fd)
+        self.cache = self.path + '.r1.rcache'
+
+    def tearDown(self):
+        for path in [self.path, self.cache]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_cache(self):
+        covers = dict(basicRuleCovers(readCorpusFromFile(self.path), 1))
+        self.assertEqual(dict(cachedBasicRuleCovers(self.path, 1)), covers)
+        self.assertTrue(os.path.exists(self.cache))
+        self.assertEqual(dict(cachedBasicRuleCovers(self.path, 1)), covers)
+        self.assertEqual(dict(readRuleCovers(self.cache)), covers)
+
+    def test_invalidate(self):
+        cachedBasicRuleCovers(self.path, 1)
+        with open(self.path, 'a') as f:
+            f.write('\ndoc3\nw\td\n')
+        covers = dict(basicRuleCovers(readCorpusFromFile(self.path), 1))
+        self.assertEqual(dict(cachedBasicRuleCovers(self.path, 1)), covers)
+
+
+class BinaryCorpusTest(unittest.TestCase):
+    '''Test compiled binary corpora.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr('doc1\nx\ta\tb\ny\tb\n\n'
+                                        'doc2\nz\tc\ta\n')
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        writeBinaryCorpus(self.path, self.corpus)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_roundtrip(self):
+        bc = BinaryCorpus(self.path)
+        self.assertEqual(bc.size(), 2)
+        self.assertEqual(list(bc.names()), ['doc1', 'doc2'])
+        self.assertEqual(dict(bc.corpus()), dict(self.corpus))
+        self.assertEqual(dict(readCorpusFromFile(self.path)), dict(self.corpus))
+
+    def test_rule_covers(self):
+        bc = BinaryCorpus(self.path)
+        covers = basicRuleCovers(self.corpus, 1)
+        bincovers = basicRuleCovers(bc, 1)
+        self.assertEqual(dict(covers),
+                         dict(decodeRuleCovers(bincovers, bc.vocabulary())))
+
+    def test_threads(self):
+        bc = BinaryCorpus(self.path)
+        for numThreads in [2, 3]:
+            self.assertEqual(dict(basicRuleCovers(self.corpus, 1, numThreads)),
+                             dict(basicRuleCovers(self.corpus, 1)))
+            self.assertEqual(list(fullConjunctions(self.corpus, 1, numThreads)),
+                             list(fullConjunctions(self.corpus, 1)))
+            self.assertEqual(dict(corpusRuleCount(bc, 1, numThreads)),
+                             dict(corpusRuleCount(bc, 1)))
+
+    def test_min_support(self):
+        covers = basicRuleCovers(self.corpus, 1)
+        counts = corpusRuleCount(self.corpus, 1)
+        frequent = basicRuleCovers(self.corpus, 1, 1, 2)
+        self.assertEqual(sorted(frequent.keys()),
+                         sorted(r for r in covers.keys() if counts[r] >= 2))
+        common = basicRuleCovers(self.corpus, 1, 1, 0, 2)
+        self.assertEqual(sorted(common.keys()),
+                         sorted(r for r in covers.keys()
+                                if len(covers[r].names()) >= 2))
+
+
+class ConjunctionCoverTest(unittest.TestCase):
+    '''Test conjunction covers.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr('doc1\nx\ta\ny\tb\n')
+        self.covers = basicRuleCovers(self.corpus, 1)
+        self.conjunction = Conjunction([Rule(0, 'a'), Rule(0, 'b')])
+        self.truecover = self.covers[Rule(0, 'a')]
+
+    def test_empty_intersection(self):
+        '''Rules sharing a document without co-occurring keep the
+           document with an empty cover.'''
+        cover = conjunctionCover(self.conjunction, self.covers)
+        self.assertEqual(cover.size(), 0)
+        m = cover.metrics(self.truecover)
+        self.assertEqual((m.tp(), m.fp(), m.tn(), m.fn()), (0, 0, 1, 1))
+        self.assertEqual(m.fprate(), 0.0)
+        self.assertEqual(list(cover.documentMetrics(self.truecover).keys()),
+                         ['doc1'])
+
+    def test_min_size(self):
+        cover = conjunctionCover(self.conjunction, self.covers, 1)
+        self.assertEqual(cover.size(), 0)
+        self.assertEqual(cover.metrics(self.truecover).tn(), 0)
+
+
+class AprioriCheckpointTest(unittest.TestCase):
+    '''Test checkpoint and resume of the Apriori miners.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr(_mining_corpus_str())
+        self.covers = basicRuleCovers(self.corpus, 1)
+        self.truecover = self.covers[Rule(0, 'T')]
+        self.initial = ConjunctionVector([Conjunction([rule])
+                                          for rule in self.covers])
+        self.full = fullConjunctions(self.corpus, 1)
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def hr(self, treshold, limit, checkpoint='', covers=None):
+        if covers is None:
+            covers = self.covers
+        return _conjunction_set(hrApriori(self.initial, covers,
+                                          covers[Rule(0, 'T')], treshold,
+                                          limit, 1, APRIORI_CACHE_SIZE,
+                                          checkpoint))
+
+    def hp(self, treshold, limit, checkpoint=''):
+        return _conjunction_set(hpApriori(self.full, self.covers,
+                                          self.truecover, treshold, limit, 1,
+                                          checkpoint))
+
+    def test_resume(self):
+        for limit in [1, 2]:
+            checkpoint = os.path.join(self.dir, 'hr{0}'.format(limit))
+            self.assertEqual(self.hr(0.3, limit, checkpoint),
+                             self.hr(0.3, limit))
+            self.assertTrue(os.path.exists(os.path.join(checkpoint,
+                                                        'apriori.ckpt')))
+            self.assertEqual(self.hr(0.3, limit + 1, checkpoint),
+                             self.hr(0.3, limit + 1))
+            checkpoint = os.path.join(self.dir, 'hp{0}'.format(limit))
+            self.hp(0.1, limit, checkpoint)
+            self.assertEqual(self.hp(0.1, limit + 1, checkpoint),
+                             self.hp(0.1, limit + 1))
+
+    def test_fingerprint(self):
+        '''Checkpoints of other tresholds or covers are not resumed.'''
+        checkpoint = os.path.join(self.dir, 'hr')
+        self.hr(0.3, 2, checkpoint)
+        self.assertNotEqual(self.hr(0.3, 2), self.hr(0.4, 2))
+        self.assertEqual(self.hr(0.4, 3, checkpoint), self.hr(0.4, 3))
+        # the same rules, but attribute b removed from half of the documents
+        self.hr(0.3, 2, checkpoint)
+        text = _mining_corpus_str()
+        half = text.index('doc6')
+        corpus = readCorpusFromStr(text[:half].replace('\tb', '') +
+                                   text[half:])
+        covers = basicRuleCovers(corpus, 1)
+        self.assertEqual(set((r[0], r[1]) for r in covers.keys()),
+                         set((r[0], r[1]) for r in self.covers.keys()))
+        self.assertNotEqual(self.hr(0.3, 2, covers=covers), self.hr(0.3, 2))
+        self.assertEqual(self.hr(0.3, 3, checkpoint, covers),
+                         self.hr(0.3, 3, covers=covers))
+
+    def test_cooccurrence_fingerprint(self):
+        '''Checkpoints of covers with the same sizes but different
+           co-occurrence are not resumed.'''
+        first = readCorpusFromStr('d1\nw\tx\nw\ta\tq\nw\tb\nw\ta\tb\n'
+                                  'w\tz\nw\tx\n')
+        second = readCorpusFromStr('d1\nw\tx\nw\ta\tb\nw\ta\tb\nw\tz\n'
+                                   'w\tq\nw\tx\n')
+        def sizes(corpus):
+            covers = basicRuleCovers(corpus, 1)
+            return dict(((r[0], r[1]), covers[r].size()) for r in covers)
+        def mine(corpus, checkpoint=''):
+            covers = basicRuleCovers(corpus, 1)
+            initial = ConjunctionVector([Conjunction([rule])
+                                         for rule in covers])
+            return _conjunction_set(hrApriori(
+                initial, covers, fullOrderedCoverFromCorpus(corpus), 0.3, 2,
+                1, APRIORI_CACHE_SIZE, checkpoint))
+        self.assertEqual(sizes(first), sizes(second))
+        self.assertNotEqual(mine(first), mine(second))
+        checkpoint = os.path.join(self.dir, 'hr')
+        mine(first, checkpoint)
+        self.assertEqual(mine(second, checkpoint), mine(second))
+
+
+class MinerTest(unittest.TestCase):
+    '''Test the miners against each other.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr(_mining_corpus_str())
+        self.covers = basicRuleCovers(self.corpus, 1)
+        self.truecover = self.covers[Rule(0, 'T')]
+        self.initial = ConjunctionVector([Conjunction([rule])
+                                          for rule in self.covers])
+        self.full = fullConjunctions(self.corpus, 1)
+
+    def test_eclat(self):
+        for limit in [2, 3]:
+            expected = _conjunction_set(hrApriori(self.initial, self.covers,
+                                                  self.truecover, 0.3, limit))
+            for useDiffsets in [True, False]:
+                self.assertEqual(
+                    _conjunction_set(hrEclat(self.initial, self.covers,
+                                             self.truecover, 0.3, limit, 2,
+                                             useDiffsets)),
+                    expected)
+
+    def test_spilled_candidates(self):
+        '''Spilling every candidate batch to disk does not change the
+           result.'''
+        self.assertEqual(
+            _conjunction_set(hpApriori(self.full, self.covers, self.truecover,
+                                       0.1, 3, 2, '', None, 1)),
+            _conjunction_set(hpApriori(self.full, self.covers, self.truecover,
+                                       0.1, 3)))
+        self.assertEqual(
+            _conjunction_set(hrApriori(self.initial, self.covers,
+                                       self.truecover, 0.3, 3, 2,
+                                       APRIORI_CACHE_SIZE, '', None, 1)),
+            _conjunction_set(hrApriori(self.initial, self.covers,
+                                       self.truecover, 0.3, 3)))
+
+    def test_cover_cache(self):
+        '''Disabling the cover cache does not change the result.'''
+        for limit in [2, 3, 4]:
+            self.assertEqual(
+                _conjunction_set(hrApriori(self.initial, self.covers,
+                                           self.truecover, 0.3, limit, 2, 0)),
+                _conjunction_set(hrApriori(self.initial, self.covers,
+                                           self.truecover, 0.3, limit)))
+
+    def test_monitor(self):
+        '''The monitor gets the statistics of every level.'''
+        monitor = LevelRecorder()
+        result = hrApriori(self.initial, self.covers, self.truecover, 0.3, 3,
+                           2, APRIORI_CACHE_SIZE, '', monitor)
+        self.assertEqual(monitor.levels,
+                         [(1, 27, 12), (2, 66, 34), (3, 44, 44)])
+        self.assertEqual(sum(freq for _, _, freq in monitor.levels),
+                         len(result))
+        monitor = LevelRecorder()
+        hpApriori(self.full, self.covers, self.truecover, 0.1, 3, 2, '',
+                  monitor)
+        self.assertEqual(monitor.levels,
+                         [(1, 44, 26), (2, 131, 106), (3, 664, 556)])
+
+    def test_verbose(self):
+        verbose = miningVerbose()
+        stderr = os.dup(2)
+        try:
+            for flag in [True, False]:
+                setMiningVerbose(flag)
+                with tempfile.TemporaryFile() as f:
+                    os.dup2(f.fileno(), 2)
+                    hrApriori(self.initial, self.covers, self.truecover, 0.3,
+                              2)
+                    os.dup2(stderr, 2)
+                    f.seek(0)
+                    self.assertEqual(len(f.read()) > 0, flag)
+        finally:
+            os.dup2(stderr, 2)
+            os.close(stderr)
+            setMiningVerbose(verbose)
+
+    def exhaustive(self):
+        '''Return all conjunctions of up to three basic rules with their
+           metrics.'''
+        rules = list(self.covers.keys())
+        conjunctions = [Conjunction(list(c)) for length in [1, 2, 3]
+                        for c in itertools.combinations(rules, length)]
+        return [(c, conjunctionCover(c, self.covers).metrics(self.truecover))
+                for c in conjunctions]
+
+    def test_candidates(self):
+        '''Candidate pruning loses no frequent conjunction and no result is
+           longer than the limit.'''
+        conjunctions = self.exhaustive()
+        for limit in [1, 2, 3, 4]:
+            result = hrApriori(self.initial, self.covers, self.truecover, 0.3,
+                               limit)
+            self.assertTrue(max(len(c) for c in result) <= limit)
+            if limit <= 3:
+                self.assertEqual(
+                    _conjunction_set(result),
+                    _conjunction_set(c for c, m in conjunctions
+                                     if len(c) <= limit and
+                                     m.recall() >= 0.3))
+
+    def test_top_conjunctions(self):
+        '''Compare to all conjunctions of up to three basic rules.'''
+        conjunctions = self.exhaustive()
+        for metric in ['recall', 'f1score', 'matthews']:
+            for limit in [1, 2, 3]:
+                values = [getattr(m, metric)() for c, m in conjunctions
+                          if len(c) <= limit and m.tp() > 0]
+                values = sorted((v for v in values if not math.isnan(v)),
+                                reverse=True)
+                top = topConjunctions(self.initial, self.covers,
+                                      self.truecover, 10, metric, limit)
+                self.assertEqual(
+                    [getattr(conjunctionCover(c, self.covers).metrics(
+                        self.truecover), metric)() for c in top],
+                    values[:10])
+        self.assertRaises(Exception, topConjunctions, self.initial,
+                          self.covers, self.truecover, 10, 'precision')
+
+    def test_mine_top_k(self):
+        items = [frozenset([i]) for i in range(6)]
+        candidates = [frozenset(c) for length in [1, 2, 3]
+                      for c in itertools.combinations(range(6), length)]
+        for metric in ['recall', 'f1score', 'matthews']:
+            values = sorted((_top_weight(c, metric) for c in candidates
+                             if _top_frequent(c)), reverse=True)
+            for k in [1, 5, 10]:
+                top = Apriori.mine_top_k(items, _top_frequent, _top_join,
+                                         _top_weight, k, metric=metric,
+                                         bound_op=_top_bound)
+                self.assertEqual([_top_weight(c, metric) for c in top],
+                                 values[:k])
+
+
+class LevelRecorder(MiningMonitor):
+    '''Mining monitor that keeps the statistics of every level.'''
+
+    def __init__(self, callback=None):
+        MiningMonitor.__init__(self)
+        self.levels = []
+        self.callback = callback
+
+    def onLevel(self, stats):
+        self.levels.append((stats.level, stats.numCandidates,
+                            stats.numFrequent))
+        if self.callback is not None:
+            self.callback()
+
+
+@unittest.skipIf(background is None, 'futures is not installed')
+class BackgroundTest(unittest.TestCase):
+    '''Test mining in background threads.'''
+
+    def setUp(self):
+        self.corpus = readCorpusFromStr(_mining_corpus_str())
+        self.covers = basicRuleCovers(self.corpus, 1)
+        self.truecover = self.covers[Rule(0, 'T')]
+        self.full = fullConjunctions(self.corpus, 1)
+
+    def tearDown(self):
+        background.shutdown()
+
+    def test_concurrent_progress(self):
+        '''A Python thread keeps running while the miner runs, and the
+           monitor is called back from the worker thread.'''
+        ticks = [0]
+        done = threading.Event()
+        def count():
+            while not done.is_set():
+                ticks[0] += 1
+        seen = []
+        monitor = LevelRecorder(lambda: seen.append(ticks[0]))
+        counter = threading.Thread(target=count)
+        counter.start()
+        try:
+            future = background.hp_apriori(self.full, self.covers,
+                                            self.truecover, 0.1, 3, 2, '',
+                                            monitor)
+            result = future.result()
+        finally:
+            done.set()
+            counter.join()
+        self.assertEqual(_conjunction_set(result),
+                         _conjunction_set(hpApriori(self.full, self.covers,
+                                                    self.truecover, 0.1, 3)))
+        self.assertEqual([level for level, _, _ in monitor.levels], [1, 2, 3])
+        self.assertTrue(seen[-1] > 0)
+
+    def test_parallel_calls(self):
+        futures = [background.hr_apriori(
+                       ConjunctionVector([Conjunction([rule])
+                                          for rule in self.covers]),
+                       self.covers, self.truecover, treshold, 3, 1)
+                   for treshold in [0.2, 0.3, 0.4]]
+        sizes = [len(future.result()) for future in futures]
+        self.assertTrue(sizes[0] >= sizes[1] >= sizes[2])
+
+
 class CoverMetrics(unittest.TestCase):
     '''Test CoverMetrics calculations. '''
     pass